@@ -0,0 +1,38 @@
+"""
+离线批量分析脚本
+
+用法:
+  python analyze_recordings.py screenshots/ --output boards.jsonl
+  python analyze_recordings.py game.mp4 --output boards.jsonl --workers 4 --step 2
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加src目录到路径
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+
+def main():
+  from core.offline_analyzer import analyze_source  # type: ignore
+  
+  parser = argparse.ArgumentParser(description='离线分析截图目录或录像，输出每个棋盘状态和提示')
+  parser.add_argument('source', help='截图目录或视频文件')
+  parser.add_argument('--output', default='boards.jsonl')
+  parser.add_argument('--workers', type=int)
+  parser.add_argument('--step', type=int, default=1, help='每隔多少帧取一帧')
+  args = parser.parse_args()
+  
+  stats = analyze_source(args.source, args.output, args.workers, args.step)
+  print(
+    f"读取 {stats['read']} 帧，跳过未变化 {stats['skipped']} 帧，"
+    f"分析 {stats['analyzed']} 帧（未检测到棋盘 {stats['undetected']} 帧），"
+    f"写出 {stats['written']} 条 -> {args.output}"
+  )
+  print(f"耗时 {stats['elapsed']:.2f} 秒，{stats['frames_per_sec']:.1f} 帧/秒")
+
+
+if __name__ == '__main__':
+  main()
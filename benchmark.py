@@ -0,0 +1,150 @@
+"""
+扫雷辅助工具基准测试脚本
+
+用法:
+  python benchmark.py solver --rows 16 --cols 30 --mines 99
+  python benchmark.py generator --count 200 --workers 4
+  python benchmark.py no-guess --count 50
+  python benchmark.py recognition --cell-size 24
+  python benchmark.py accuracy --count 200 --scale 1.25 --noise 3 --calibrate 5 --output result.json
+  python benchmark.py accuracy --corpus screenshots/ --output result.json
+  python benchmark.py actions --games 20
+  python benchmark.py pipeline --count 200
+  python benchmark.py pipeline --source game.mp4
+  python benchmark.py selftest --games 5
+  python benchmark.py ai --count 16 --latency 0.2 --concurrency 4
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 添加src目录到路径
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+
+def main():
+  parser = argparse.ArgumentParser(description='扫雷辅助工具基准测试')
+  subparsers = parser.add_subparsers(dest='command', required=True)
+  
+  solver_parser = subparsers.add_parser('solver', help='求解器后端一致性与速度')
+  solver_parser.add_argument('--rows', type=int, default=16)
+  solver_parser.add_argument('--cols', type=int, default=30)
+  solver_parser.add_argument('--mines', type=int, default=99)
+  solver_parser.add_argument('--games', type=int, default=20)
+  solver_parser.add_argument('--seed', type=int, default=0)
+  
+  generator_parser = subparsers.add_parser('generator', help='按难度区间生成棋盘的速度与拒绝率')
+  generator_parser.add_argument('--rows', type=int, default=16)
+  generator_parser.add_argument('--cols', type=int, default=30)
+  generator_parser.add_argument('--mines', type=int, default=99)
+  generator_parser.add_argument('--count', type=int, default=200)
+  generator_parser.add_argument('--workers', type=int, default=None)
+  generator_parser.add_argument('--seed', type=int, default=0)
+  
+  no_guess_parser = subparsers.add_parser('no-guess', help='无猜新游戏的生成耗时分位数')
+  no_guess_parser.add_argument('--rows', type=int, default=16)
+  no_guess_parser.add_argument('--cols', type=int, default=30)
+  no_guess_parser.add_argument('--mines', type=int, default=99)
+  no_guess_parser.add_argument('--count', type=int, default=50)
+  
+  recognition_parser = subparsers.add_parser('recognition', help='逐格识别与整块识别的耗时对比')
+  recognition_parser.add_argument('--rows', type=int, default=16)
+  recognition_parser.add_argument('--cols', type=int, default=30)
+  recognition_parser.add_argument('--cell-size', type=int, default=24)
+  recognition_parser.add_argument('--seed', type=int, default=0)
+  
+  accuracy_parser = subparsers.add_parser('accuracy', help='识别准确率（混淆矩阵）与各阶段耗时')
+  accuracy_parser.add_argument('--corpus', default=None, help='语料目录（图片和同名JSON标注），默认合成')
+  accuracy_parser.add_argument('--count', type=int, default=200)
+  accuracy_parser.add_argument('--rows', type=int, default=16)
+  accuracy_parser.add_argument('--cols', type=int, default=30)
+  accuracy_parser.add_argument('--mines', type=int, default=99)
+  accuracy_parser.add_argument('--cell-size', type=int, default=24)
+  accuracy_parser.add_argument('--theme', default='contrast')
+  accuracy_parser.add_argument('--scale', type=float, default=1.0)
+  accuracy_parser.add_argument('--noise', type=float, default=0.0)
+  accuracy_parser.add_argument('--jpeg-quality', type=int, default=None)
+  accuracy_parser.add_argument('--seed', type=int, default=0)
+  accuracy_parser.add_argument('--calibrate', type=int, default=0, help='用前N帧拟合原型分类器')
+  accuracy_parser.add_argument('--output', default=None, help='保存JSON结果的路径')
+  
+  actions_parser = subparsers.add_parser('actions', help='模拟后端下的每秒操作数与确认延迟')
+  actions_parser.add_argument('--rows', type=int, default=16)
+  actions_parser.add_argument('--cols', type=int, default=30)
+  actions_parser.add_argument('--mines', type=int, default=99)
+  actions_parser.add_argument('--games', type=int, default=20)
+  actions_parser.add_argument('--seed', type=int, default=0)
+  
+  pipeline_parser = subparsers.add_parser('pipeline', help='用文件或合成截图驱动实时分析流水线')
+  pipeline_parser.add_argument('--source', default=None, help='图片、图片目录或视频文件，默认合成')
+  pipeline_parser.add_argument('--count', type=int, default=200)
+  pipeline_parser.add_argument('--rows', type=int, default=16)
+  pipeline_parser.add_argument('--cols', type=int, default=30)
+  pipeline_parser.add_argument('--mines', type=int, default=99)
+  pipeline_parser.add_argument('--cell-size', type=int, default=24)
+  pipeline_parser.add_argument('--seed', type=int, default=0)
+  pipeline_parser.add_argument('--fps', type=float, default=0, help='截图帧率，0表示不限速')
+  
+  selftest_parser = subparsers.add_parser('selftest', help='在离屏GameBoard上端到端自测识别与操作')
+  selftest_parser.add_argument('--rows', type=int, default=9)
+  selftest_parser.add_argument('--cols', type=int, default=9)
+  selftest_parser.add_argument('--mines', type=int, default=10)
+  selftest_parser.add_argument('--games', type=int, default=5)
+  selftest_parser.add_argument('--seed', type=int, default=0)
+  
+  ai_parser = subparsers.add_parser('ai', help='用本地桩服务测试AI解释的并发、连接复用与超时回退')
+  ai_parser.add_argument('--count', type=int, default=16, help='每轮解释的格子数')
+  ai_parser.add_argument('--latency', type=float, default=0.2, help='桩服务每个请求的延迟（秒）')
+  ai_parser.add_argument('--concurrency', type=int, default=4, help='并发请求数')
+  ai_parser.add_argument('--deadline', type=float, default=2.0, help='超时一轮的批量总时限（秒）')
+  ai_parser.add_argument('--failures', type=int, default=2, help='返回HTTP 500的格子数')
+  
+  args = parser.parse_args()
+  
+  if args.command == 'solver':
+    from benchmarks import solver_bench  # type: ignore
+    result = solver_bench.run(args.rows, args.cols, args.mines, args.games, args.seed)
+  elif args.command == 'generator':
+    from benchmarks import generator_bench  # type: ignore
+    result = generator_bench.run(
+      args.rows, args.cols, args.mines, args.count, args.workers, args.seed
+    )
+  elif args.command == 'no-guess':
+    from benchmarks import generator_bench  # type: ignore
+    result = generator_bench.run_no_guess(args.rows, args.cols, args.mines, args.count)
+  elif args.command == 'recognition':
+    from benchmarks import recognition_bench  # type: ignore
+    result = recognition_bench.run(args.rows, args.cols, args.cell_size, seed=args.seed)
+  elif args.command == 'accuracy':
+    from benchmarks import accuracy_bench  # type: ignore
+    result = accuracy_bench.run(
+      args.corpus, args.count, args.rows, args.cols, args.mines, args.cell_size,
+      args.theme, args.scale, args.noise, args.jpeg_quality, args.seed, args.calibrate,
+      args.output
+    )
+  elif args.command == 'actions':
+    from benchmarks import action_bench  # type: ignore
+    result = action_bench.run(args.rows, args.cols, args.mines, args.games, seed=args.seed)
+  elif args.command == 'pipeline':
+    from benchmarks import pipeline_bench  # type: ignore
+    result = pipeline_bench.run(
+      args.source, args.count, args.rows, args.cols, args.mines, args.cell_size, args.seed,
+      args.fps
+    )
+  elif args.command == 'selftest':
+    from benchmarks import selftest_bench  # type: ignore
+    result = selftest_bench.run(args.rows, args.cols, args.mines, args.games, args.seed)
+  elif args.command == 'ai':
+    from benchmarks import ai_bench  # type: ignore
+    result = ai_bench.run(
+      args.count, args.latency, args.concurrency, args.deadline, args.failures
+    )
+  
+  print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+  main()
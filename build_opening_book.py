@@ -0,0 +1,45 @@
+"""
+开局库生成脚本
+
+用法:
+  python build_opening_book.py                     # 生成三种标准难度
+  python build_opening_book.py --rows 16 --cols 30 --mines 99 --samples 500
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加src目录到路径
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+
+def main():
+  from core.opening_book import build_opening_entry, save_opening_entry  # type: ignore
+  from utils.constants import OpeningBookConfig, STANDARD_MINES  # type: ignore
+  
+  parser = argparse.ArgumentParser(description='离线生成开局库')
+  parser.add_argument('--rows', type=int)
+  parser.add_argument('--cols', type=int)
+  parser.add_argument('--mines', type=int)
+  parser.add_argument('--samples', type=int, default=OpeningBookConfig.SAMPLES_PER_CELL)
+  args = parser.parse_args()
+  
+  if args.rows and args.cols and args.mines:
+    configs = [(args.rows, args.cols, args.mines)]
+  else:
+    configs = [(rows, cols, mines) for (rows, cols), mines in STANDARD_MINES.items()]
+  
+  for rows, cols, mines in configs:
+    entry = build_opening_entry(rows, cols, mines, args.samples)
+    path = save_opening_entry(entry)
+    best = entry['first_clicks'][0]
+    print(
+      f"{rows}x{cols} ({mines}雷): 最佳首次点击 行{best['row']+1}列{best['col']+1}，"
+      f"平均翻开 {best['mean_revealed']:.1f} 格 -> {path}"
+    )
+
+
+if __name__ == '__main__':
+  main()
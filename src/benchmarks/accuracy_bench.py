@@ -0,0 +1,290 @@
+"""
+识别准确率与耗时基准测试
+在带标注的截图语料（磁盘上的图片或由游戏局面合成）上运行完整识别流程，
+统计各状态的混淆矩阵、整盘完全正确率，以及检测、提取、分类各阶段的耗时分位数
+"""
+
+import json
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.screenshot_renderer import ScreenshotRenderer, random_states
+from core.cell_classifier import PrototypeClassifier, board_features
+from core.grid_detector import detect_grid
+from core.image_processor import ImageProcessor
+from utils.constants import CellState, ImageConfig, RenderConfig
+from utils.image_utils import normalize_board
+from utils.perf import LatencyStats
+
+
+# 混淆矩阵的状态顺序
+STATES = list(range(CellState.MINE, 9))
+
+
+def embed_in_screen(board_image, margin=40, border=3, background=(90, 60, 40)):
+  """
+  把棋盘图像放到带边框的“屏幕”画布上，使检测阶段也参与测试
+  
+  Args:
+    board_image: 棋盘图像
+    margin: 棋盘四周的空白
+    border: 边框宽度
+    background: 画布背景色（BGR）
+    
+  Returns:
+    画布图像
+  """
+  h, w = board_image.shape[:2]
+  screen = np.empty((h + 2 * margin, w + 2 * margin, 3), dtype=np.uint8)
+  screen[:] = background
+  cv2.rectangle(screen, (margin - border, margin - border),
+                (margin + w + border - 1, margin + h + border - 1), (128, 128, 128), border)
+  screen[margin:margin + h, margin:margin + w] = board_image
+  return screen
+
+
+def generate_corpus(count, rows=16, cols=30, mines=99, cell_size=24,
+                    theme=RenderConfig.DEFAULT_THEME, scale=1.0, noise=0.0,
+                    jpeg_quality=None, seed=0):
+  """
+  由随机局面合成带标注的截图语料
+  
+  Yields:
+    (screen, labels) 截图和标注
+  """
+  renderer = ScreenshotRenderer(cell_size, theme, scale, noise, jpeg_quality, seed)
+  states = random_states(count, rows, cols, mines, np.random.default_rng(seed))
+  for images, labels in renderer.iter_batches(states):
+    for image, label in zip(images, labels):
+      yield embed_in_screen(image), label
+
+
+def save_corpus(directory, corpus):
+  """
+  把语料保存到磁盘（每帧一个PNG和同名的JSON标注）
+  
+  Args:
+    directory: 目标目录
+    corpus: (image, labels) 的可迭代对象
+    
+  Returns:
+    保存的帧数
+  """
+  directory = Path(directory)
+  directory.mkdir(parents=True, exist_ok=True)
+  count = 0
+  for count, (image, labels) in enumerate(corpus, 1):
+    cv2.imwrite(str(directory / f'{count:06d}.png'), image)
+    with open(directory / f'{count:06d}.json', 'w', encoding='utf-8') as f:
+      json.dump({'labels': np.asarray(labels).tolist()}, f)
+  return count
+
+
+def load_corpus(directory):
+  """
+  从磁盘读取语料（图片文件和同名的JSON标注）
+  
+  Yields:
+    (image, labels) 截图和标注
+  """
+  for label_path in sorted(Path(directory).glob('*.json')):
+    image_path = next(
+      (path for path in label_path.parent.glob(label_path.stem + '.*') if path.suffix != '.json'),
+      None
+    )
+    if image_path is None:
+      continue
+    image = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+    with open(label_path, encoding='utf-8') as f:
+      labels = np.array(json.load(f)['labels'])
+    if image is not None:
+      yield image, labels
+
+
+def fit_board(board_image, rows, cols):
+  """
+  按拟合的网格把棋盘一次缩放为每格CANONICAL_CELL_SIZE像素（与BoardAnalyzer一致），
+  未检测到网格时按行列数整除
+  
+  Returns:
+    (board_image, cell_size)
+  """
+  size = ImageConfig.CANONICAL_CELL_SIZE
+  geometry = detect_grid(board_image, rows, cols)
+  if geometry is None:
+    cell_size = min(board_image.shape[1] // cols, board_image.shape[0] // rows)
+    rect = (0, 0, cols * cell_size, rows * cell_size)
+  else:
+    rect = geometry.grid_rect()
+  return normalize_board(board_image, rows, cols, size, rect), size
+
+
+def recognize_frame(processor, screen, rows, cols, stats):
+  """
+  按检测、提取、分类三个阶段识别一帧并分别计时
+  
+  Args:
+    processor: ImageProcessor实例
+    screen: 截图
+    rows: 行数
+    cols: 列数
+    stats: {阶段名: LatencyStats}
+    
+  Returns:
+    识别结果，未检测到棋盘时返回None
+  """
+  stats['detect'].start()
+  region = processor.detect_board(screen)
+  stats['detect'].stop()
+  if region is None:
+    return None
+  
+  stats['extract'].start()
+  processor.screenshot = screen
+  board_image, cell_size = fit_board(processor.get_board_image(), rows, cols)
+  stats['extract'].stop()
+  
+  stats['classify'].start()
+  board = processor.recognize_board(board_image, rows, cols, cell_size)
+  stats['classify'].stop()
+  return board
+
+
+def calibrate_in_memory(processor, frames):
+  """
+  用若干帧带标注的截图拟合原型分类器（只放在内存中，不写入校准缓存）
+  
+  Args:
+    processor: ImageProcessor实例
+    frames: (screen, labels) 列表
+  """
+  features, labels, cell_size = [], [], None
+  for screen, frame_labels in frames:
+    rows, cols = frame_labels.shape
+    if processor.detect_board(screen) is None:
+      continue
+    processor.screenshot = screen
+    board_image, size = fit_board(processor.get_board_image(), rows, cols)
+    if cell_size is not None and size != cell_size:
+      continue
+    cell_size = size
+    features.append(board_features(board_image, rows, cols, size).reshape(rows * cols, -1))
+    labels.append(frame_labels.ravel())
+  
+  if features:
+    processor.classifier = PrototypeClassifier().fit(np.concatenate(features), np.concatenate(labels))
+    processor.classifier_cell_size = cell_size
+
+
+def evaluate(corpus, processor=None, calibration_frames=0):
+  """
+  在语料上运行识别并统计准确率和耗时
+  
+  Args:
+    corpus: (screen, labels) 的可迭代对象
+    processor: 可选的ImageProcessor实例，默认不使用识别缓存
+    calibration_frames: 先用语料的前几帧拟合原型分类器（这些帧不参与统计）
+    
+  Returns:
+    结果dict
+  """
+  processor = processor or ImageProcessor(use_cache=False)
+  corpus = iter(corpus)
+  if calibration_frames:
+    calibrate_in_memory(processor, [frame for _, frame in zip(range(calibration_frames), corpus)])
+  
+  stats = {name: LatencyStats(name) for name in ('detect', 'extract', 'classify')}
+  total = LatencyStats('total')
+  confusion = np.zeros((len(STATES), len(STATES)), dtype=np.int64)
+  frames = exact = undetected = 0
+  
+  for screen, labels in corpus:
+    rows, cols = labels.shape
+    frames += 1
+    start = time.perf_counter()
+    board = recognize_frame(processor, screen, rows, cols, stats)
+    total.record(time.perf_counter() - start)
+    
+    if board is None:
+      undetected += 1
+      continue
+    exact += bool(np.array_equal(board, labels))
+    truth = labels.ravel() - STATES[0]
+    predicted = board.ravel() - STATES[0]
+    # 超出状态范围的识别结果按未翻开统计
+    predicted[(predicted < 0) | (predicted >= len(STATES))] = CellState.UNKNOWN - STATES[0]
+    np.add.at(confusion, (truth, predicted), 1)
+  
+  return summarize(confusion, frames, exact, undetected, stats, total)
+
+
+def summarize(confusion, frames, exact, undetected, stats, total):
+  """
+  汇总混淆矩阵和耗时
+  
+  Returns:
+    结果dict
+  """
+  truth_counts = confusion.sum(axis=1)
+  predicted_counts = confusion.sum(axis=0)
+  correct = np.diag(confusion)
+  
+  per_state = {}
+  for i, state in enumerate(STATES):
+    if truth_counts[i] == 0 and predicted_counts[i] == 0:
+      continue
+    per_state[str(state)] = {
+      'count': int(truth_counts[i]),
+      'recall': float(correct[i] / truth_counts[i]) if truth_counts[i] else 0.0,
+      'precision': float(correct[i] / predicted_counts[i]) if predicted_counts[i] else 0.0
+    }
+  
+  cells = int(confusion.sum())
+  return {
+    'frames': frames,
+    'undetected': undetected,
+    'cells': cells,
+    'cell_accuracy': float(correct.sum() / cells) if cells else 0.0,
+    'exact_match_rate': exact / frames if frames else 0.0,
+    'per_state': per_state,
+    'confusion': {'states': STATES, 'matrix': confusion.tolist()},
+    'stages': {name: stat.summary() for name, stat in stats.items()},
+    'total': total.summary()
+  }
+
+
+def run(corpus_dir=None, count=200, rows=16, cols=30, mines=99, cell_size=24,
+        theme=RenderConfig.DEFAULT_THEME, scale=1.0, noise=0.0, jpeg_quality=None,
+        seed=0, calibration_frames=0, output=None):
+  """
+  运行识别准确率基准测试
+  
+  Args:
+    corpus_dir: 语料目录，为None时由随机局面合成count帧（另加calibration_frames帧）
+    calibration_frames: 用于拟合原型分类器的帧数，为0时使用颜色规则（或已有的校准缓存）
+    output: 可选的JSON结果文件路径，便于比较多次运行
+    
+  Returns:
+    结果dict
+  """
+  if corpus_dir:
+    corpus = load_corpus(corpus_dir)
+  else:
+    corpus = generate_corpus(count + calibration_frames, rows, cols, mines, cell_size, theme,
+                             scale, noise, jpeg_quality, seed)
+  
+  result = evaluate(corpus, calibration_frames=calibration_frames)
+  result['config'] = {
+    'corpus': str(corpus_dir) if corpus_dir else 'synthetic',
+    'count': count, 'rows': rows, 'cols': cols, 'mines': mines, 'cell_size': cell_size,
+    'theme': theme, 'scale': scale, 'noise': noise, 'jpeg_quality': jpeg_quality, 'seed': seed,
+    'calibration_frames': calibration_frames
+  }
+  
+  if output:
+    with open(output, 'w', encoding='utf-8') as f:
+      json.dump(result, f, ensure_ascii=False, indent=2)
+  return result
@@ -0,0 +1,74 @@
+"""
+操作执行基准测试
+用模拟后端驱动MinesweeperGame自动对局，统计每秒操作数和确认延迟
+"""
+
+import random
+
+from benchmarks.common import StateAnalyzer
+from core.action_executor import ActionExecutor, MockGameBackend
+from core.minesweeper_game import MinesweeperGame
+from core.solver import MinesweeperSolver
+
+
+def play_game(executor, backend, rng):
+  """
+  用执行器完成一局（无确定结论时借助真实布局翻开一个非雷格子）
+  
+  Returns:
+    是否获胜
+  """
+  game = backend.game
+  region, cell_size = backend.region, backend.cell_size
+  executor.execute([(rng.randrange(game.rows), rng.randrange(game.cols))], [], region, cell_size)
+  
+  board = backend.observe()
+  while not game.game_over:
+    safe_cells, mine_cells = MinesweeperSolver(StateAnalyzer(board)).solve()
+    if not safe_cells:
+      candidates = [
+        (r, c) for r in range(game.rows) for c in range(game.cols)
+        if not game.board[r][c].is_revealed and not game.board[r][c].is_mine
+      ]
+      if not candidates:
+        break
+      safe_cells = [rng.choice(candidates)]
+    result = executor.execute(
+      safe_cells, mine_cells, region, cell_size, board=board, observe=backend.observe
+    )
+    board = result['board'] if result['board'] is not None else backend.observe()
+  
+  return game.game_won
+
+
+def run(rows=16, cols=30, mines=99, games=20, cell_size=24, seed=0):
+  """
+  运行操作执行基准测试
+  
+  Returns:
+    结果dict
+  """
+  rng = random.Random(seed)
+  random.seed(seed)
+  region = (100, 100, cols * cell_size, rows * cell_size)
+  # 模拟后端没有真实的输入延迟，不需要点击间隔
+  executor = ActionExecutor(None, click_delay=0)
+  
+  won = 0
+  for _ in range(games):
+    backend = MockGameBackend(MinesweeperGame(rows, cols, mines), region, cell_size)
+    executor.backend = backend
+    won += play_game(executor, backend, rng)
+  
+  stats = executor.get_stats()
+  return {
+    'rows': rows,
+    'cols': cols,
+    'mines': mines,
+    'games': games,
+    'won': won,
+    'actions': stats['actions'],
+    'unconfirmed': stats['unconfirmed'],
+    'actions_per_sec': stats['actions_per_sec'],
+    'verify_ms': {k: v for k, v in stats['verify'].items() if k != 'per_sec'}
+  }
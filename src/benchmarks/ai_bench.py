@@ -0,0 +1,229 @@
+"""
+AI解释服务基准测试
+用本地http.server桩服务（人为延迟）代替真实API，比较串行与并发请求的耗时、
+连接复用情况，以及出错和超时时的回退行为，不需要网络和API密钥
+"""
+
+import contextlib
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.ai_service import AIService
+from utils.constants import AIConfig, ReasonTemplates
+
+
+# 提示词中的目标格子位置
+CELL_PATTERN = re.compile(r'格子位置：行(\d+)，列(\d+)')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+  """模拟对话接口：按目标格子决定延迟和状态码"""
+  
+  protocol_version = 'HTTP/1.1'
+  # 回复头和正文分两次写出，不关闭Nagle算法时每个请求会多等一个延迟确认
+  disable_nagle_algorithm = True
+  
+  def do_POST(self):
+    server = self.server
+    body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+    match = CELL_PATTERN.search(body['messages'][0]['content'])
+    cell = (int(match.group(1)), int(match.group(2))) if match else None
+    
+    server.enter(self.client_address)
+    try:
+      time.sleep(server.slow_latency if cell in server.slow_cells else server.latency)
+    finally:
+      server.leave()
+    
+    if cell in server.fail_cells:
+      status, payload = 500, {'error': 'stub failure'}
+    else:
+      content = f'行{cell[0]}，列{cell[1]}周围的数字已经满足。' if cell else '已满足。'
+      status, payload = 200, {'choices': [{'message': {'content': content}}]}
+    
+    data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    self.send_response(status)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(data)))
+    if self.headers.get('Connection', '').lower() == 'close':
+      self.send_header('Connection', 'close')
+    self.end_headers()
+    self.wfile.write(data)
+  
+  def log_message(self, format, *args):
+    pass
+
+
+class StubServer(ThreadingHTTPServer):
+  """带人为延迟的桩服务，记录请求数、客户端连接数和最大并发数"""
+  
+  daemon_threads = True
+  
+  def __init__(self, latency, slow_latency):
+    """
+    初始化桩服务（监听127.0.0.1的随机端口）
+    
+    Args:
+      latency: 每个请求的延迟（秒）
+      slow_latency: slow_cells中格子的延迟（秒）
+    """
+    super().__init__(('127.0.0.1', 0), StubHandler)
+    self.latency = latency
+    self.slow_latency = slow_latency
+    self.slow_cells = set()
+    self.fail_cells = set()
+    self._lock = threading.Lock()
+    self.reset()
+  
+  @property
+  def url(self):
+    """对话接口地址"""
+    return f'http://127.0.0.1:{self.server_port}/v1/chat/completions'
+  
+  def reset(self, slow_cells=(), fail_cells=()):
+    """清空统计并设置本轮的慢格子和失败格子"""
+    with self._lock:
+      self.slow_cells = set(slow_cells)
+      self.fail_cells = set(fail_cells)
+      self.requests = 0
+      self.clients = set()
+      self.in_flight = 0
+      self.max_in_flight = 0
+  
+  def enter(self, client_address):
+    """请求开始"""
+    with self._lock:
+      self.requests += 1
+      self.clients.add(client_address)
+      self.in_flight += 1
+      self.max_in_flight = max(self.max_in_flight, self.in_flight)
+  
+  def leave(self):
+    """请求结束"""
+    with self._lock:
+      self.in_flight -= 1
+  
+  def handle_error(self, request, client_address):
+    # 客户端超时后断开的连接写回复会失败，属于预期情况
+    pass
+
+
+def make_cells(count, cols=30):
+  """
+  生成待解释的格子（每个格子的推理依据各不相同）
+  
+  Returns:
+    格子信息列表，行列从1开始
+  """
+  cells = []
+  for i in range(count):
+    row, col = i // cols + 1, i % cols + 1
+    reason = ReasonTemplates.SAFE.format(row=row, col=col, number=1, flagged=1, unknown=2)
+    cells.append({'row': row, 'col': col, 'reason': reason})
+  return cells
+
+
+def measure(server, cells, explain, slow_cells=(), fail_cells=()):
+  """
+  运行一轮请求并统计
+  
+  Args:
+    explain: 接收格子列表、返回 {(row, col): explanation} 的函数
+    
+  Returns:
+    结果dict
+  """
+  server.reset(slow_cells, fail_cells)
+  start = time.perf_counter()
+  results = explain(cells)
+  elapsed = time.perf_counter() - start
+  fallbacks = sum(results[(cell['row'], cell['col'])] == cell['reason'] for cell in cells)
+  return {
+    'elapsed': elapsed,
+    'requests': server.requests,
+    'connections': len(server.clients),
+    'max_in_flight': server.max_in_flight,
+    'fallbacks': fallbacks
+  }
+
+
+def serial(service):
+  """逐个请求解释"""
+  return lambda cells: {
+    (cell['row'], cell['col']): service.generate_explanation(cell) for cell in cells
+  }
+
+
+def open_service(server, max_concurrency, **headers):
+  """
+  创建连接到桩服务的AIService（不使用解释缓存）
+  
+  Args:
+    headers: 额外的请求头
+  """
+  service = AIService('benchmark', max_concurrency=max_concurrency, cache_path=None)
+  service.api_url = server.url
+  service.session.headers.update(headers)
+  return service
+
+
+def run(count=16, latency=0.2, max_concurrency=AIConfig.MAX_CONCURRENCY, deadline=2.0,
+        failures=2):
+  """
+  运行AI解释服务基准测试
+  
+  Args:
+    count: 每轮解释的格子数
+    latency: 桩服务每个请求的延迟（秒）
+    max_concurrency: AIService的并发请求数
+    deadline: 超时一轮的批量总时限（秒），其中一个格子的延迟是它的3倍，
+      应足够其余格子完成
+    failures: 出错一轮中返回HTTP 500的格子数
+    
+  Returns:
+    结果dict
+  """
+  server = StubServer(latency, slow_latency=deadline * 3)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  cells = make_cells(count)
+  positions = [(cell['row'], cell['col']) for cell in cells]
+  result = {
+    'cells': count,
+    'latency': latency,
+    'max_concurrency': max_concurrency
+  }
+  
+  # 出错和超时时服务打印的提示转到stderr，stdout只输出JSON结果
+  with contextlib.redirect_stdout(sys.stderr):
+    try:
+      # 每个请求新建连接（相当于不复用会话）
+      service = open_service(server, max_concurrency, Connection='close')
+      result['serial_new_connections'] = measure(server, cells, serial(service))
+      service.close()
+      
+      service = open_service(server, max_concurrency)
+      result['serial'] = measure(server, cells, serial(service))
+      result['concurrent'] = measure(server, cells, service.batch_generate_explanations)
+      result['errors'] = measure(
+        server, cells, service.batch_generate_explanations, fail_cells=positions[:failures]
+      )
+      result['errors']['failed_cells'] = failures
+      result['deadline'] = measure(
+        server, cells, lambda cells: service.batch_generate_explanations(cells, deadline),
+        slow_cells=positions[:1]
+      )
+      result['deadline']['deadline'] = deadline
+      result['deadline']['slow_cells'] = 1
+      # 等超时的请求结束，避免它的提示在结果之后输出
+      service.close(wait=True)
+    finally:
+      server.shutdown()
+      server.server_close()
+  
+  concurrent = result['concurrent']['elapsed']
+  result['speedup'] = result['serial']['elapsed'] / concurrent if concurrent > 0 else 0.0
+  return result
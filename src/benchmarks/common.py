@@ -0,0 +1,70 @@
+"""
+基准测试公共工具
+"""
+
+import random
+
+from core.minesweeper_game import MinesweeperGame
+from core.solver import MinesweeperSolver
+
+
+class StateAnalyzer:
+  """直接包装棋盘状态数组的分析器（供求解器使用）"""
+  
+  def __init__(self, board):
+    self.board = board
+  
+  def get_board_state(self):
+    """获取棋盘状态"""
+    return self.board
+
+
+def play_random_states(rows, cols, mines, games, seed=None):
+  """
+  自动对局并产出对局过程中的棋盘状态
+  
+  求解器给出的安全格子会被翻开、地雷会被标记；
+  无确定结论时借助真实布局翻开一个非雷格子，保证对局能继续
+  
+  Args:
+    rows: 行数
+    cols: 列数
+    mines: 地雷数量
+    games: 对局数
+    seed: 随机种子
+    
+  Yields:
+    (game, board_state) 元组
+  """
+  rng = random.Random(seed)
+  if seed is not None:
+    random.seed(seed)
+  
+  for _ in range(games):
+    game = MinesweeperGame(rows, cols, mines)
+    game.reveal(rng.randrange(rows), rng.randrange(cols))
+    
+    while not game.game_over:
+      state = game.get_board_state()
+      yield game, state
+      
+      solver = MinesweeperSolver(StateAnalyzer(state))
+      safe_cells, mine_cells = solver.solve()
+      
+      for row, col in mine_cells:
+        if not game.board[row][col].is_flagged:
+          game.toggle_flag(row, col)
+      
+      if safe_cells:
+        for row, col in safe_cells:
+          game.reveal(row, col)
+      else:
+        candidates = [
+          (r, c) for r in range(rows) for c in range(cols)
+          if not game.board[r][c].is_revealed
+          and not game.board[r][c].is_flagged
+          and not game.board[r][c].is_mine
+        ]
+        if not candidates:
+          break
+        game.reveal(*rng.choice(candidates))
@@ -0,0 +1,55 @@
+"""
+棋盘生成基准测试
+统计各难度区间的生成速度与拒绝率
+"""
+
+from core.board_generator import generate_boards
+from core.board_metrics import solve_without_guessing
+from core.minesweeper_game import MinesweeperGame
+from core.no_guess_generator import generation_stats
+
+
+# 高级棋盘（16x30, 99雷，中心首次点击）的示例难度区间
+EXPERT_BANDS = {
+  'easy': {'max_3bv': 150},
+  'medium': {'min_3bv': 160, 'max_3bv': 180},
+  'hard': {'min_3bv': 190, 'max_openings': 10},
+  'no_guess': {'no_guess': True},
+}
+
+
+def run(rows=16, cols=30, mines=99, count=200, workers=None, seed=0, bands=None):
+  """
+  运行棋盘生成基准测试
+  
+  Returns:
+    {band_name: stats} 字典
+  """
+  bands = bands or EXPERT_BANDS
+  result = {}
+  for name, band in bands.items():
+    _, stats = generate_boards(rows, cols, mines, band, count, workers=workers, seed=seed)
+    result[name] = stats
+  return result
+
+
+def run_no_guess(rows=16, cols=30, mines=99, count=50):
+  """
+  统计交互式无猜新游戏的生成耗时（每局在中心首次点击）
+  
+  Returns:
+    生成耗时统计摘要dict，另含unsolvable（校验未通过的局数）
+  """
+  generation_stats.reset()
+  first_row, first_col = rows // 2, cols // 2
+  unsolvable = 0
+  
+  for _ in range(count):
+    game = MinesweeperGame(rows, cols, mines, no_guess=True)
+    game.reveal(first_row, first_col)
+    if not solve_without_guessing(game.get_mine_layout(), first_row, first_col)[0]:
+      unsolvable += 1
+  
+  result = generation_stats.summary()
+  result['unsolvable'] = unsolvable
+  return result
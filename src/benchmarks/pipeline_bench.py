@@ -0,0 +1,95 @@
+"""
+流水线基准测试
+用图片、视频或合成截图代替屏幕驱动完整的实时分析流水线，可在无显示环境下运行
+"""
+
+import time
+from pathlib import Path
+
+from benchmarks.accuracy_bench import generate_corpus
+from core.board_tracker import BoardTracker
+from core.capture_source import GeneratorSource, ImageFileSource, VideoFileSource
+from core.image_processor import ImageProcessor
+from core.live_pipeline import LivePipeline
+from utils.constants import OfflineConfig
+from utils.perf import LatencyStats
+
+
+def open_source(source=None, count=200, rows=16, cols=30, mines=99, cell_size=24, seed=0):
+  """
+  创建截图来源
+  
+  Args:
+    source: 图片文件、图片目录或视频文件路径；为None时使用合成截图
+    
+  Returns:
+    CaptureSource实例
+  """
+  if source is None:
+    # 先生成全部截图，避免把合成耗时计入截图阶段
+    screens = [screen for screen, _ in generate_corpus(count, rows, cols, mines, cell_size, seed=seed)]
+    return GeneratorSource(screens)
+  path = Path(source)
+  if path.is_dir() or path.suffix.lower() in OfflineConfig.IMAGE_SUFFIXES:
+    return ImageFileSource(path)
+  return VideoFileSource(path)
+
+
+def run(source=None, count=200, rows=16, cols=30, mines=99, cell_size=24, seed=0,
+        target_fps=0):
+  """
+  运行流水线基准测试（来源的帧读完即停止）
+  
+  Args:
+    target_fps: 截图帧率，0表示不限速
+    
+  Returns:
+    结果dict
+  """
+  capture_source = open_source(source, count, rows, cols, mines, cell_size, seed)
+  processor = ImageProcessor(capture_source=capture_source)
+  tracker = BoardTracker(processor)
+  capture_stats = LatencyStats('capture')
+  
+  def capture():
+    # 来源读完后不再计入截图耗时
+    if capture_source.exhausted:
+      return None
+    started = time.perf_counter()
+    board_image = tracker.capture()
+    if not capture_source.exhausted:
+      capture_stats.record(time.perf_counter() - started)
+    return board_image
+  
+  pipeline = LivePipeline(processor, capture=capture, target_fps=target_fps)
+  
+  start = time.perf_counter()
+  pipeline.start()
+  while not capture_source.exhausted:
+    time.sleep(0.01)
+  # 等最后一帧流过识别和求解阶段
+  while not (pipeline.frames.empty() and pipeline.boards.empty()):
+    time.sleep(0.01)
+  time.sleep(0.05)
+  pipeline.stop()
+  elapsed = time.perf_counter() - start
+  capture_source.close()
+  
+  stats = pipeline.get_stats()
+  analyzed = stats['processed'] + stats['unchanged']
+  return {
+    'frames': capture_source.frames,
+    'elapsed': elapsed,
+    'frames_per_sec': capture_source.frames / elapsed if elapsed > 0 else 0.0,
+    'analyzed_per_sec': analyzed / elapsed if elapsed > 0 else 0.0,
+    'buffer_allocations': capture_source.get_stats()['allocations'],
+    'captured': stats['captured'],
+    'dropped': stats['dropped'],
+    'processed': stats['processed'],
+    'unchanged': stats['unchanged'],
+    'errors': stats['errors'],
+    'capture_ms': capture_stats.summary(),
+    'analyze_ms': stats['analyze'],
+    'solve_ms': stats['solve'],
+    'latency_ms': stats['latency']
+  }
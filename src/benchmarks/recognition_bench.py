@@ -0,0 +1,95 @@
+"""
+识别基准测试
+比较逐格识别、整块向量化识别和带缓存识别的结果与单帧耗时
+"""
+
+import time
+
+import numpy as np
+
+from core.image_processor import ImageProcessor
+from utils.image_utils import get_cell_image
+
+
+def random_board_image(rows, cols, cell_size, seed=None):
+  """
+  生成随机的棋盘图像（未翻开、空白和带彩色数字的格子）
+  
+  Returns:
+    BGR图像
+  """
+  rng = np.random.default_rng(seed)
+  image = np.zeros((rows * cell_size, cols * cell_size, 3), dtype=np.uint8)
+  digit_colors = [(255, 0, 0), (0, 128, 0), (0, 0, 255)]
+  margin = cell_size // 4
+  
+  for i in range(rows):
+    for j in range(cols):
+      cell = image[i * cell_size:(i + 1) * cell_size, j * cell_size:(j + 1) * cell_size]
+      kind = rng.integers(3)
+      if kind == 0:
+        cell[:] = 230
+      elif kind == 1:
+        cell[:] = 60
+      else:
+        cell[:] = 150
+        cell[margin:-margin, margin:-margin] = digit_colors[rng.integers(3)]
+      noise = rng.integers(-8, 9, cell.shape)
+      cell[:] = np.clip(cell.astype(int) + noise, 0, 255)
+  
+  return image
+
+
+def recognize_per_cell(processor, board_image, rows, cols, cell_size):
+  """逐格识别（原BoardAnalyzer.analyze的做法）"""
+  board = np.zeros((rows, cols), dtype=int)
+  for i in range(rows):
+    for j in range(cols):
+      cell = get_cell_image(board_image, i, j, cell_size)
+      board[i, j] = processor.recognize_cell(cell)
+  return board
+
+
+def _best_time(func, repeat):
+  """取多轮中最快的一轮耗时（秒）"""
+  best = float('inf')
+  for _ in range(repeat):
+    start = time.perf_counter()
+    func()
+    best = min(best, time.perf_counter() - start)
+  return best
+
+
+def run(rows=16, cols=30, cell_size=24, repeat=10, seed=0):
+  """
+  运行识别基准测试
+  
+  Returns:
+    dict包含结果是否一致、各方式的单帧耗时（毫秒）、加速比和缓存命中率
+  """
+  processor = ImageProcessor(use_cache=False)
+  cached_processor = ImageProcessor()
+  image = random_board_image(rows, cols, cell_size, seed)
+  
+  per_cell = recognize_per_cell(processor, image, rows, cols, cell_size)
+  whole = processor.recognize_board(image, rows, cols, cell_size)
+  cached = cached_processor.recognize_board(image, rows, cols, cell_size)
+  
+  per_cell_time = _best_time(
+    lambda: recognize_per_cell(processor, image, rows, cols, cell_size), repeat
+  )
+  whole_time = _best_time(
+    lambda: processor.recognize_board(image, rows, cols, cell_size), repeat
+  )
+  cached_time = _best_time(
+    lambda: cached_processor.recognize_board(image, rows, cols, cell_size), repeat
+  )
+  
+  return {
+    'identical': bool(np.array_equal(per_cell, whole) and np.array_equal(per_cell, cached)),
+    'per_cell_ms': per_cell_time * 1000,
+    'whole_board_ms': whole_time * 1000,
+    'cached_ms': cached_time * 1000,
+    'speedup': per_cell_time / whole_time if whole_time > 0 else 0.0,
+    'cache_hit_rate': cached_processor.cell_cache.hit_rate()
+  }
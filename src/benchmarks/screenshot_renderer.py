@@ -0,0 +1,217 @@
+"""
+合成截图渲染
+把游戏状态渲染成类似真实游戏画面的棋盘图像，用于在没有屏幕的环境下测试识别速度和准确率；
+每种主题和格子大小的格子贴图只绘制一次，批量渲染时一次索引即可拼出整批棋盘
+"""
+
+import cv2
+import numpy as np
+
+from core.board_metrics import adjacent_counts, random_layouts
+from utils.constants import CellState, RenderConfig
+
+
+# 格子状态的取值范围（CellState.MINE 到 8）
+STATE_OFFSET = -CellState.MINE
+STATE_COUNT = 8 + STATE_OFFSET + 1
+
+
+def _draw_unknown(tile, colors, bevel):
+  """绘制未翻开格子（带凸起边缘）"""
+  tile[:] = colors['unknown']
+  tile[:bevel, :] = colors['unknown_light']
+  tile[:, :bevel] = colors['unknown_light']
+  tile[-bevel:, :] = colors['unknown_dark']
+  tile[:, -bevel:] = colors['unknown_dark']
+
+
+def _draw_revealed(tile, colors):
+  """绘制已翻开格子（左上为网格线）"""
+  tile[:] = colors['revealed']
+  tile[0, :] = colors['grid']
+  tile[:, 0] = colors['grid']
+
+
+def make_tiles(cell_size, theme=RenderConfig.DEFAULT_THEME):
+  """
+  绘制每种格子状态的贴图
+  
+  Args:
+    cell_size: 格子大小
+    theme: 主题名（RenderConfig.THEMES的键）
+    
+  Returns:
+    uint8数组，形状为 (STATE_COUNT, cell_size, cell_size, 3)，第state+STATE_OFFSET个为该状态的贴图
+  """
+  colors = RenderConfig.THEMES[theme]
+  tiles = np.zeros((STATE_COUNT, cell_size, cell_size, 3), dtype=np.uint8)
+  bevel = max(cell_size // 12, 1)
+  thickness = max(cell_size // 12, 1)
+  center = cell_size // 2
+  
+  _draw_unknown(tiles[CellState.UNKNOWN + STATE_OFFSET], colors, bevel)
+  
+  flag = tiles[CellState.FLAGGED + STATE_OFFSET]
+  _draw_unknown(flag, colors, bevel)
+  pole_x = center + cell_size // 8
+  cv2.line(flag, (pole_x, cell_size // 5), (pole_x, cell_size * 4 // 5), (0, 0, 0), thickness)
+  triangle = np.array([
+    [pole_x, cell_size // 5], [pole_x, cell_size // 2], [cell_size // 5, cell_size * 7 // 20]
+  ], dtype=np.int32)
+  cv2.fillPoly(flag, [triangle], (0, 0, 255))
+  
+  _draw_revealed(tiles[CellState.EMPTY + STATE_OFFSET], colors)
+  
+  mine = tiles[CellState.MINE + STATE_OFFSET]
+  _draw_revealed(mine, colors)
+  cv2.circle(mine, (center, center), max(cell_size // 4, 1), (0, 0, 0), -1)
+  
+  font_scale = cell_size / 32
+  for number, color in RenderConfig.DIGIT_COLORS.items():
+    tile = tiles[number + STATE_OFFSET]
+    _draw_revealed(tile, colors)
+    text = str(number)
+    (width, height), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness + 1)
+    origin = (center - width // 2, center + height // 2)
+    cv2.putText(tile, text, origin, cv2.FONT_HERSHEY_SIMPLEX, font_scale, color,
+                thickness + 1, cv2.LINE_AA)
+  
+  return tiles
+
+
+def random_states(count, rows, cols, mines, rng=None):
+  """
+  向量化地生成一批带标注的随机局面（随机翻开部分非雷格子、标记部分地雷）
+  
+  Args:
+    count: 局面数量
+    rows: 行数
+    cols: 列数
+    mines: 地雷数量
+    rng: 可选的numpy随机数生成器
+    
+  Returns:
+    int数组，形状为 (count, rows, cols)，取值同MinesweeperGame.get_board_state
+  """
+  rng = rng or np.random.default_rng()
+  layouts = random_layouts(count, rows, cols, mines, rows // 2, cols // 2, rng)
+  counts = adjacent_counts(layouts).astype(int)
+  
+  progress = rng.random((count, 1, 1))
+  revealed = ~layouts & (rng.random(layouts.shape) < progress)
+  flagged = layouts & (rng.random(layouts.shape) < progress)
+  
+  states = np.full(layouts.shape, CellState.UNKNOWN, dtype=int)
+  states[revealed] = counts[revealed]
+  states[flagged] = CellState.FLAGGED
+  return states
+
+
+class ScreenshotRenderer:
+  """合成截图渲染器类"""
+  
+  def __init__(self, cell_size=24, theme=RenderConfig.DEFAULT_THEME, scale=1.0,
+               noise=0.0, jpeg_quality=None, seed=None):
+    """
+    初始化渲染器
+    
+    Args:
+      cell_size: 格子大小（缩放前）
+      theme: 主题名
+      scale: 缩放比例（可为非整数倍）
+      noise: 高斯噪声的标准差（像素值）
+      jpeg_quality: 可选的JPEG压缩质量（1-100），为None时不压缩
+      seed: 随机种子
+    """
+    self.cell_size = cell_size
+    self.theme = theme
+    self.scale = scale
+    self.noise = noise
+    self.jpeg_quality = jpeg_quality
+    self.rng = np.random.default_rng(seed)
+    self.tiles = make_tiles(cell_size, theme)
+    self._noise_pool = None
+  
+  def render_states(self, states):
+    """
+    批量渲染局面
+    
+    Args:
+      states: int数组，形状为 (n, rows, cols) 或 (rows, cols)
+      
+    Returns:
+      uint8数组，形状为 (n, H, W, 3) 或 (H, W, 3)（BGR格式）
+    """
+    states = np.asarray(states)
+    single = states.ndim == 2
+    if single:
+      states = states[None]
+    
+    n, rows, cols = states.shape
+    size = self.cell_size
+    # 一次索引拼出整批棋盘：(n, rows, cols, h, w, 3) -> (n, rows*h, cols*w, 3)
+    cells = self.tiles[states + STATE_OFFSET]
+    images = cells.transpose(0, 1, 3, 2, 4, 5).reshape(n, rows * size, cols * size, 3)
+    images = self._postprocess(images)
+    return images[0] if single else images
+  
+  def render_game(self, game):
+    """
+    渲染一局游戏的当前画面
+    
+    Args:
+      game: MinesweeperGame实例
+      
+    Returns:
+      (image, labels) 棋盘图像和对应的get_board_state标注
+    """
+    labels = game.get_board_state()
+    return self.render_states(labels), labels
+  
+  def iter_batches(self, states, batch_size=RenderConfig.BATCH_SIZE):
+    """
+    分批渲染大量局面（避免一次占用过多内存）
+    
+    Args:
+      states: int数组，形状为 (n, rows, cols)
+      batch_size: 每批的帧数
+      
+    Yields:
+      (images, labels) 每批的图像和标注
+    """
+    for start in range(0, len(states), batch_size):
+      labels = states[start:start + batch_size]
+      yield self.render_states(labels), labels
+  
+  def _postprocess(self, images):
+    """依次做缩放、噪声和JPEG压缩"""
+    if self.scale != 1.0:
+      n, h, w = images.shape[:3]
+      size = (int(round(w * self.scale)), int(round(h * self.scale)))
+      interpolation = cv2.INTER_AREA if self.scale < 1 else cv2.INTER_LINEAR
+      images = np.stack([cv2.resize(image, size, interpolation=interpolation) for image in images])
+    
+    if self.noise > 0:
+      images = np.stack([self._add_noise(image) for image in images])
+    
+    if self.jpeg_quality is not None:
+      params = [cv2.IMWRITE_JPEG_QUALITY, int(self.jpeg_quality)]
+      images = np.stack([
+        cv2.imdecode(cv2.imencode('.jpg', image, params)[1], cv2.IMREAD_COLOR) for image in images
+      ])
+    
+    return images
+  
+  def _add_noise(self, image):
+    """
+    加高斯噪声
+    
+    噪声池只生成一次（比一帧略长），每帧从随机偏移处取一段，避免每帧重新生成随机数
+    """
+    size = image.size
+    if self._noise_pool is None or len(self._noise_pool) < 2 * size:
+      pool = self.rng.normal(0, self.noise, 2 * size)
+      self._noise_pool = np.rint(pool).astype(np.int16)
+    offset = self.rng.integers(0, len(self._noise_pool) - size + 1)
+    noise = self._noise_pool[offset:offset + size].reshape(image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8)
@@ -0,0 +1,256 @@
+"""
+端到端自测
+在离屏渲染的GameBoard上完成截图、识别、求解和点击的完整循环，
+用游戏的真实状态校验识别结果，统计每步的端到端耗时和识别错误
+"""
+
+import ctypes
+import os
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.accuracy_bench import fit_board
+from benchmarks.common import StateAnalyzer
+from core.action_executor import ActionExecutor
+from core.board_analyzer import BoardAnalyzer
+from core.capture_source import CaptureSource, crop_region
+from core.cell_classifier import PrototypeClassifier, board_features
+from core.image_processor import ImageProcessor
+from core.minesweeper_game import Cell
+from core.solver import MinesweeperSolver
+from gui.game_board import CellButton, GameBoard
+from utils.constants import CaptureConfig, CellState
+from utils.image_utils import qimage_to_numpy
+from utils.perf import LatencyStats
+
+
+class SingletonRefGuard:
+  """
+  补足None、True、False的引用计数
+  
+  部分PySide6 abi3版本在Python 3.12以下运行时，无返回值的方法和emit返回时
+  少计一次None或True的引用，引用计数随调用次数递减，归零后解释器中止。
+  定期把缺少的引用补回到初始值（补上的引用永不释放，解释器退出时也不会再减到零）；
+  Python 3.12起这些对象不参与引用计数，补足不会发生
+  """
+  
+  def __init__(self):
+    self.baseline = {id(obj): sys.getrefcount(obj) for obj in (None, True, False)}
+  
+  def top_up(self):
+    """把引用计数补回到初始值"""
+    for obj in (None, True, False):
+      for _ in range(self.baseline[id(obj)] - sys.getrefcount(obj)):
+        ctypes.pythonapi.Py_IncRef(ctypes.py_object(obj))
+
+
+class GameBoardSource(CaptureSource):
+  """用QWidget.grab截取GameBoard的截图来源"""
+  
+  def __init__(self, board, guard, ring_size=CaptureConfig.RING_SIZE):
+    """
+    初始化来源
+    
+    Args:
+      board: GameBoard实例
+      guard: SingletonRefGuard实例，每次截图后补足引用计数
+      ring_size: 帧缓冲区个数
+    """
+    super().__init__(ring_size)
+    self.board = board
+    self.guard = guard
+  
+  def _read(self, region):
+    """处理挂起的重绘后截取组件，直接转换颜色到缓冲区"""
+    QApplication.processEvents()
+    image, qimage = qimage_to_numpy(self.board.grab().toImage())
+    image = crop_region(image, region)
+    buffer = self.ring.next(image.shape[:2] + (3,))
+    cv2.cvtColor(image, cv2.COLOR_BGRA2BGR, dst=buffer)
+    self.guard.top_up()
+    return buffer
+
+
+class GameBoardBackend:
+  """把点击换算为GameBoard上对应格子按钮的点击信号的输入后端"""
+  
+  def __init__(self, board):
+    self.board = board
+  
+  def click(self, x, y, button='left'):
+    """在组件坐标处点击（发出与mousePressEvent相同的信号）"""
+    widget = self.board.childAt(x, y)
+    if isinstance(widget, CellButton):
+      signal = widget.left_clicked if button == 'left' else widget.right_clicked
+      signal.emit(widget.row, widget.col)
+
+
+def next_moves(game, board, rng):
+  """
+  求解当前棋盘，无确定结论时借助真实布局翻开一个非雷格子
+  
+  Returns:
+    (safe_cells, mine_cells)
+  """
+  safe_cells, mine_cells = MinesweeperSolver(StateAnalyzer(board)).solve()
+  if not safe_cells:
+    candidates = [
+      (r, c) for r in range(game.rows) for c in range(game.cols)
+      if not game.board[r][c].is_revealed and not game.board[r][c].is_mine
+    ]
+    if candidates:
+      safe_cells = [rng.choice(candidates)]
+  return safe_cells, mine_cells
+
+
+def make_cell(state):
+  """
+  构造显示指定状态的格子数据
+  
+  Returns:
+    Cell实例
+  """
+  cell = Cell()
+  if state == CellState.FLAGGED:
+    cell.is_flagged = True
+  elif state >= 0:
+    cell.is_revealed = True
+    cell.adjacent_mines = state
+  return cell
+
+
+def calibrate(board, source, rows, cols, frames=2):
+  """
+  让每个格子轮流显示所有状态并截图，拟合原型分类器（只放在内存中）
+  
+  真实对局中7、8等数字很少出现，因此直接设置按钮的显示状态来覆盖全部状态
+  
+  Returns:
+    (classifier, cell_size)
+  """
+  states = np.array([CellState.UNKNOWN, CellState.FLAGGED] + list(range(9)))
+  features, labels, cell_size = [], [], None
+  
+  for shift in range(frames):
+    truth = states[(np.arange(rows * cols) + shift) % len(states)].reshape(rows, cols)
+    for row in range(rows):
+      for col in range(cols):
+        board.buttons[row][col].update_display(make_cell(truth[row, col]))
+    frame = source.grab()
+    board_image, cell_size = fit_board(frame, rows, cols)
+    features.append(board_features(board_image, rows, cols, cell_size).reshape(rows * cols, -1))
+    labels.append(truth.ravel())
+  
+  classifier = PrototypeClassifier().fit(np.concatenate(features), np.concatenate(labels))
+  return classifier, cell_size
+
+
+def run(rows=9, cols=9, mines=10, games=5, seed=0):
+  """
+  运行端到端自测
+  
+  Returns:
+    结果dict
+  """
+  # 自测不需要显示器，没有指定平台时使用离屏渲染
+  os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+  app = QApplication.instance() or QApplication([])
+  guard = SingletonRefGuard()
+  rng = random.Random(seed)
+  random.seed(seed)
+  
+  board = GameBoard()
+  board.init_game(rows, cols, mines)
+  board.show()
+  source = GameBoardSource(board, guard)
+  
+  processor = ImageProcessor(capture_source=source)
+  processor.classifier, processor.classifier_cell_size = calibrate(board, source, rows, cols)
+  
+  stages = {name: LatencyStats(name) for name in ('capture', 'recognize', 'solve', 'act')}
+  move_stats = LatencyStats('move')
+  moves = won = lost = frames = cell_errors = error_frames = unconfirmed = 0
+  
+  for _ in range(games):
+    board.init_game(rows, cols, mines)
+    app.processEvents()
+    game = board.get_game()
+    analyzer = BoardAnalyzer(processor)
+    analyzer.set_board_size(rows, cols)
+    executor = ActionExecutor(GameBoardBackend(board), click_delay=0)
+    
+    def observe():
+      # 对局结束后游戏不再接受标记，无需继续等待确认
+      if game.game_over:
+        return None
+      return analyzer.analyze(source.grab())
+    
+    first = True
+    while not game.game_over:
+      start = time.perf_counter()
+      frame = source.grab()
+      stages['capture'].record(time.perf_counter() - start)
+      
+      stages['recognize'].start()
+      recognized = analyzer.analyze(frame)
+      stages['recognize'].stop()
+      if recognized is None:
+        break
+      frames += 1
+      errors = int((recognized != game.get_board_state()).sum())
+      cell_errors += errors
+      error_frames += errors > 0
+      
+      stages['solve'].start()
+      if first:
+        safe_cells, mine_cells = [(rng.randrange(rows), rng.randrange(cols))], []
+        first = False
+      else:
+        safe_cells, mine_cells = next_moves(game, recognized, rng)
+      stages['solve'].stop()
+      if not safe_cells and not mine_cells:
+        break
+      
+      stages['act'].start()
+      h, w = frame.shape[:2]
+      result = executor.execute(
+        safe_cells, mine_cells, (0, 0, w, h), analyzer.get_cell_size(),
+        analyzer.get_geometry(), board=recognized, observe=observe
+      )
+      stages['act'].stop()
+      move_stats.record(time.perf_counter() - start)
+      moves += 1
+      if not game.game_over:
+        unconfirmed += len(result['pending'])
+    
+    won += game.game_won
+    lost += game.game_over and not game.game_won
+  
+  # 返回前销毁Qt对象，不留到解释器退出时析构
+  board.close()
+  board.deleteLater()
+  del board, source, processor
+  app.processEvents()
+  guard.top_up()
+  cells = frames * rows * cols
+  return {
+    'rows': rows,
+    'cols': cols,
+    'mines': mines,
+    'games': games,
+    'won': won,
+    'lost': lost,
+    'moves': moves,
+    'frames': frames,
+    'cell_errors': cell_errors,
+    'error_frames': error_frames,
+    'cell_accuracy': 1 - cell_errors / cells if cells else 0.0,
+    'unconfirmed_actions': unconfirmed,
+    'move_ms': move_stats.summary(),
+    'stage_ms': {name: stats.summary() for name, stats in stages.items()}
+  }
@@ -0,0 +1,135 @@
+"""
+求解器基准测试
+校验位棋盘后端与参考求解器的一致性并统计每秒求解次数
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.common import StateAnalyzer, play_random_states
+from core.batch_solver import solve_batch
+from core.solver import MinesweeperSolver
+
+
+def collect_states(rows, cols, mines, games, seed=None):
+  """
+  收集对局过程中的棋盘状态
+  
+  Returns:
+    棋盘状态列表
+  """
+  return [state.copy() for _, state in play_random_states(rows, cols, mines, games, seed)]
+
+
+def check_backends(states, backend='bitboard'):
+  """
+  校验指定后端与参考求解器的结果一致
+  
+  Args:
+    states: 棋盘状态列表
+    backend: 待校验的后端
+    
+  Returns:
+    不一致的状态下标列表
+  """
+  mismatches = []
+  for i, state in enumerate(states):
+    reference = MinesweeperSolver(StateAnalyzer(state))
+    candidate = MinesweeperSolver(StateAnalyzer(state), backend=backend)
+    reference.solve()
+    candidate.solve()
+    if (reference.get_results() != candidate.get_results()
+        or reference.get_reasons() != candidate.get_reasons()):
+      mismatches.append(i)
+  return mismatches
+
+
+def check_batch(states):
+  """
+  校验批量求解的确定性规则结果与参考求解器一致
+  
+  Args:
+    states: 棋盘状态列表（形状相同）
+    
+  Returns:
+    不一致的状态下标列表
+  """
+  safe, mines = solve_batch(np.stack(states), deep=False)
+  mismatches = []
+  for i, state in enumerate(states):
+    reference = MinesweeperSolver(StateAnalyzer(state))
+    safe_cells, mine_cells = reference.solve()
+    if (set(safe_cells) != set(zip(*np.nonzero(safe[i])))
+        or set(mine_cells) != set(zip(*np.nonzero(mines[i])))):
+      mismatches.append(i)
+  return mismatches
+
+
+def measure_batch_per_sec(states, deep=False, repeat=3):
+  """
+  统计批量求解每秒处理的棋盘数
+  
+  Args:
+    states: 棋盘状态列表（形状相同）
+    deep: 是否对无结论的棋盘做子集推理
+    repeat: 重复轮数（取最快的一轮）
+    
+  Returns:
+    每秒求解的棋盘数
+  """
+  stacked = np.stack(states)
+  best = float('inf')
+  
+  for _ in range(repeat):
+    start = time.perf_counter()
+    solve_batch(stacked, deep=deep)
+    best = min(best, time.perf_counter() - start)
+  
+  return len(states) / best if best > 0 else 0.0
+
+
+def measure_solves_per_sec(states, backend, repeat=3):
+  """
+  统计每秒求解次数
+  
+  Args:
+    states: 棋盘状态列表
+    backend: 求解后端
+    repeat: 重复轮数（取最快的一轮）
+    
+  Returns:
+    每秒求解次数
+  """
+  analyzer = StateAnalyzer(None)
+  solver = MinesweeperSolver(analyzer, backend=backend)
+  best = float('inf')
+  
+  for _ in range(repeat):
+    start = time.perf_counter()
+    for state in states:
+      analyzer.board = state
+      solver.solve()
+    best = min(best, time.perf_counter() - start)
+  
+  return len(states) / best if best > 0 else 0.0
+
+
+def run(rows=16, cols=30, mines=99, games=20, seed=0):
+  """
+  运行求解器基准测试
+  
+  Returns:
+    dict包含状态数、不一致数、各后端及批量求解的每秒求解次数
+  """
+  states = collect_states(rows, cols, mines, games, seed)
+  result = {
+    'states': len(states),
+    'mismatches': len(check_backends(states)),
+    'batch_mismatches': len(check_batch(states)),
+  }
+  for backend in MinesweeperSolver.BACKENDS:
+    result[f'{backend}_solves_per_sec'] = measure_solves_per_sec(states, backend)
+  result['batch_boards_per_sec'] = measure_batch_per_sec(states)
+  result['batch_deep_boards_per_sec'] = measure_batch_per_sec(states, deep=True)
+  return result
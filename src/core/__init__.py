@@ -4,4 +4,4 @@ from core.board_analyzer import BoardAnalyzer
 from core.image_processor import ImageProcessor
 from core.solver import MinesweeperSolver
 from core.minesweeper_game import MinesweeperGame, Cell
-
+from core.opening_book import OpeningBook
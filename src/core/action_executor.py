@@ -0,0 +1,255 @@
+"""
+操作执行器
+把求解得到的安全格子和地雷按棋盘几何换算为屏幕坐标，通过可替换的输入后端
+批量点击/标记，并用下一帧截图确认操作结果
+"""
+
+import time
+
+import numpy as np
+
+from utils.constants import ActionConfig, CellState
+from utils.perf import LatencyStats
+
+
+REVEAL = 'reveal'
+FLAG = 'flag'
+
+# 操作对应的鼠标按键
+BUTTONS = {REVEAL: 'left', FLAG: 'right'}
+
+
+def cell_center(region, row, col, cell_size=None, geometry=None):
+  """
+  计算格子中心的屏幕坐标
+  
+  Args:
+    region: 棋盘在屏幕上的区域 (x, y, w, h)
+    row: 行
+    col: 列
+    cell_size: 格子大小（未提供geometry时使用）
+    geometry: 可选的GridGeometry，按拟合的网格计算
+    
+  Returns:
+    (x, y) 整数坐标
+  """
+  if geometry is not None:
+    x, y, w, h = geometry.cell_rect(row, col)
+  else:
+    x, y, w, h = col * cell_size, row * cell_size, cell_size, cell_size
+  return int(region[0] + x + w / 2), int(region[1] + y + h / 2)
+
+
+def plan_actions(safe_cells, mine_cells, board=None):
+  """
+  生成操作序列：先翻开再标记，每组按蛇形顺序排列以缩短鼠标移动距离
+  
+  Args:
+    safe_cells: 安全格子列表 [(row, col), ...]
+    mine_cells: 地雷格子列表 [(row, col), ...]
+    board: 可选的当前棋盘状态，用于跳过已翻开或已标记的格子
+    
+  Returns:
+    [(action, row, col), ...]
+  """
+  def snake(cells):
+    return sorted(cells, key=lambda cell: (cell[0], cell[1] if cell[0] % 2 == 0 else -cell[1]))
+  
+  if board is not None:
+    safe_cells = [(r, c) for r, c in safe_cells if board[r, c] == CellState.UNKNOWN]
+    mine_cells = [(r, c) for r, c in mine_cells if board[r, c] == CellState.UNKNOWN]
+  
+  return ([(REVEAL, r, c) for r, c in snake(set(safe_cells))]
+          + [(FLAG, r, c) for r, c in snake(set(mine_cells))])
+
+
+def is_confirmed(board, action, row, col):
+  """
+  判断截图中的棋盘是否已反映操作结果
+  
+  Returns:
+    是否已确认
+  """
+  state = board[row, col]
+  if action == FLAG:
+    return state == CellState.FLAGGED
+  return state != CellState.UNKNOWN and state != CellState.FLAGGED
+
+
+class PyAutoGUIBackend:
+  """通过pyautogui发送真实鼠标点击的输入后端"""
+  
+  def __init__(self):
+    # 延迟导入，使模拟后端在无显示环境下也可使用
+    import pyautogui
+    self.pyautogui = pyautogui
+  
+  def click(self, x, y, button='left'):
+    """
+    在屏幕坐标处点击
+    
+    Args:
+      x: 横坐标
+      y: 纵坐标
+      button: 'left' 或 'right'
+    """
+    # 跳过pyautogui每次调用后的全局停顿，间隔由执行器控制
+    self.pyautogui.click(x, y, button=button, _pause=False)
+
+
+class MockGameBackend:
+  """把点击作用到MinesweeperGame上并记录操作的模拟后端（用于测试和基准）"""
+  
+  def __init__(self, game, region, cell_size):
+    """
+    初始化模拟后端
+    
+    Args:
+      game: MinesweeperGame实例
+      region: 模拟的棋盘屏幕区域 (x, y, w, h)
+      cell_size: 格子大小
+    """
+    self.game = game
+    self.region = region
+    self.cell_size = cell_size
+    self.clicks = []
+  
+  def click(self, x, y, button='left'):
+    """把屏幕坐标换算为格子并执行对应的游戏操作"""
+    row = (y - self.region[1]) // self.cell_size
+    col = (x - self.region[0]) // self.cell_size
+    self.clicks.append((button, row, col))
+    if not (0 <= row < self.game.rows and 0 <= col < self.game.cols):
+      return
+    if button == 'left':
+      self.game.reveal(row, col)
+    else:
+      self.game.toggle_flag(row, col)
+  
+  def observe(self):
+    """
+    获取当前棋盘状态（相当于重新截图识别）
+    
+    Returns:
+      numpy数组，翻开的地雷为CellState.MINE；获胜后剩余地雷显示为已标记（与真实游戏一致）
+    """
+    state = self.game.get_board_state()
+    for row, col in zip(*np.nonzero(state == CellState.UNKNOWN)):
+      cell = self.game.board[row][col]
+      if cell.is_mine and cell.is_revealed:
+        state[row, col] = CellState.MINE
+      elif cell.is_mine and self.game.game_won:
+        state[row, col] = CellState.FLAGGED
+    return state
+
+
+class ActionExecutor:
+  """操作执行器类"""
+  
+  def __init__(self, backend, click_delay=ActionConfig.CLICK_DELAY,
+               verify_timeout=ActionConfig.VERIFY_TIMEOUT):
+    """
+    初始化执行器
+    
+    Args:
+      backend: 输入后端，需提供click(x, y, button)
+      click_delay: 相邻两次点击之间的最小间隔（秒）
+      verify_timeout: 等待截图确认操作结果的最长时间（秒）
+    """
+    self.backend = backend
+    self.click_delay = click_delay
+    self.verify_timeout = verify_timeout
+    self.batch_stats = LatencyStats('batch')
+    self.verify_stats = LatencyStats('verify')
+    self.actions = 0
+    self.unconfirmed = 0
+  
+  def execute(self, safe_cells, mine_cells, region, cell_size=None, geometry=None,
+              board=None, observe=None):
+    """
+    批量执行翻开和标记操作，提供observe时截图确认结果
+    
+    Args:
+      safe_cells: 安全格子列表
+      mine_cells: 地雷格子列表
+      region: 棋盘在屏幕上的区域 (x, y, w, h)
+      cell_size: 格子大小
+      geometry: 可选的GridGeometry
+      board: 可选的当前棋盘状态，用于跳过已完成的格子
+      observe: 可选的回调，截取并识别下一帧，返回棋盘状态；返回None时停止确认（如棋盘已消失）
+      
+    Returns:
+      dict包含actions、confirmed、pending、board、batch_ms、verify_ms、frames
+    """
+    actions = plan_actions(safe_cells, mine_cells, board)
+    
+    start = time.perf_counter()
+    for i, (action, row, col) in enumerate(actions):
+      if i and self.click_delay:
+        time.sleep(self.click_delay)
+      x, y = cell_center(region, row, col, cell_size, geometry)
+      self.backend.click(x, y, BUTTONS[action])
+    batch_time = time.perf_counter() - start
+    if actions:
+      self.batch_stats.record(batch_time)
+    self.actions += len(actions)
+    
+    result = {
+      'actions': actions,
+      'confirmed': None,
+      'pending': [],
+      'board': None,
+      'batch_ms': batch_time * 1000,
+      'verify_ms': 0.0,
+      'frames': 0
+    }
+    if observe is not None and actions:
+      self._verify(actions, observe, result)
+    return result
+  
+  def _verify(self, actions, observe, result):
+    """
+    反复截图直到所有操作都已反映在棋盘上、超时或observe返回None（原地填写result）
+    """
+    start = time.perf_counter()
+    deadline = start + self.verify_timeout
+    pending = actions
+    
+    while True:
+      frame_start = time.perf_counter()
+      board = observe()
+      if board is None:
+        break
+      result['frames'] += 1
+      result['board'] = board
+      pending = [a for a in pending if not is_confirmed(board, *a)]
+      now = time.perf_counter()
+      if not pending or now >= deadline:
+        break
+      # 截图本身很快时限制轮询频率，避免空转占满CPU
+      remaining = ActionConfig.VERIFY_INTERVAL - (now - frame_start)
+      if remaining > 0:
+        time.sleep(remaining)
+    
+    elapsed = time.perf_counter() - start
+    self.verify_stats.record(elapsed)
+    self.unconfirmed += len(pending)
+    result['confirmed'] = not pending
+    result['pending'] = pending
+    result['verify_ms'] = elapsed * 1000
+  
+  def get_stats(self):
+    """
+    获取统计信息
+    
+    Returns:
+      dict包含actions、unconfirmed、actions_per_sec、batch、verify
+    """
+    batch_seconds = sum(self.batch_stats.samples)
+    return {
+      'actions': self.actions,
+      'unconfirmed': self.unconfirmed,
+      'actions_per_sec': self.actions / batch_seconds if batch_seconds > 0 else 0.0,
+      'batch': self.batch_stats.summary(),
+      'verify': self.verify_stats.summary()
+    }
@@ -0,0 +1,131 @@
+"""
+批量求解器
+对形状为 (N, rows, cols) 的一叠棋盘状态一次性向量化地应用确定性规则
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core.bitboard_solver import mask_to_board, solve_subsets
+from utils.constants import CellState
+
+
+def neighbor_count(mask):
+  """
+  统计每个格子8邻域内为True的个数
+  
+  Args:
+    mask: 布尔数组，形状为 (N, rows, cols)
+    
+  Returns:
+    int数组，形状同mask
+  """
+  padded = np.pad(mask.astype(np.int8), ((0, 0), (1, 1), (1, 1)))
+  rows, cols = mask.shape[1:]
+  total = np.zeros(mask.shape, dtype=np.int8)
+  for dr in (0, 1, 2):
+    for dc in (0, 1, 2):
+      if dr == 1 and dc == 1:
+        continue
+      total += padded[:, dr:dr + rows, dc:dc + cols]
+  return total
+
+
+def spread(mask):
+  """
+  将每个为True的格子扩散到其8邻域
+  
+  Args:
+    mask: 布尔数组，形状为 (N, rows, cols)
+    
+  Returns:
+    布尔数组，形状同mask
+  """
+  padded = np.pad(mask, ((0, 0), (1, 1), (1, 1)))
+  rows, cols = mask.shape[1:]
+  result = np.zeros(mask.shape, dtype=bool)
+  for dr in (0, 1, 2):
+    for dc in (0, 1, 2):
+      if dr == 1 and dc == 1:
+        continue
+      result |= padded[:, dr:dr + rows, dc:dc + cols]
+  return result
+
+
+def apply_rules(states):
+  """
+  向量化地应用两条确定性规则（与MinesweeperSolver.solve的结论集合一致）
+  
+  Args:
+    states: 棋盘状态数组，形状为 (N, rows, cols)
+    
+  Returns:
+    (safe, mines, frontier) 三个布尔数组，frontier为与未知格子相邻的数字格子
+  """
+  states = np.asarray(states)
+  unknown = states == CellState.UNKNOWN
+  flagged = states == CellState.FLAGGED
+  numbers = states > 0
+  
+  unknown_count = neighbor_count(unknown)
+  flagged_count = neighbor_count(flagged)
+  remaining = states - flagged_count
+  frontier = numbers & (unknown_count > 0)
+  
+  # 规则1: 未知格子数 = 剩余雷数
+  mine_sources = frontier & (remaining > 0) & (unknown_count == remaining)
+  # 规则2: 已标记雷数 = 数字
+  safe_sources = frontier & (remaining == 0)
+  
+  safe = spread(safe_sources) & unknown
+  mines = spread(mine_sources) & unknown
+  return safe, mines, frontier
+
+
+def _deep_solve(state):
+  """在工作进程中对单个棋盘做子集推理"""
+  rows, cols = state.shape
+  safe_mask, mine_mask = solve_subsets(state)
+  return mask_to_board(safe_mask, rows, cols), mask_to_board(mine_mask, rows, cols)
+
+
+def solve_batch(states, deep=True, workers=None, executor=None):
+  """
+  批量求解棋盘状态
+  
+  确定性规则对整叠棋盘一次向量化完成；规则无结论但仍有前沿的棋盘
+  交给进程池做子集推理
+  
+  Args:
+    states: 棋盘状态数组，形状为 (N, rows, cols)
+    deep: 是否对无结论的棋盘做子集推理
+    workers: 进程池大小（None表示CPU核数）
+    executor: 可选的已有Executor，传入时不再新建进程池
+    
+  Returns:
+    (safe, mines) 两个布尔数组，形状为 (N, rows, cols)
+  """
+  states = np.asarray(states)
+  safe, mines, frontier = apply_rules(states)
+  
+  if not deep:
+    return safe, mines
+  
+  stuck = frontier.any(axis=(1, 2)) & ~(safe | mines).any(axis=(1, 2))
+  stuck_indices = np.flatnonzero(stuck)
+  if len(stuck_indices) == 0:
+    return safe, mines
+  
+  stuck_states = [states[i] for i in stuck_indices]
+  if executor is not None:
+    results = executor.map(_deep_solve, stuck_states, chunksize=16)
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      results = list(pool.map(_deep_solve, stuck_states, chunksize=16))
+  
+  for i, (deep_safe, deep_mines) in zip(stuck_indices, results):
+    safe[i] = deep_safe
+    mines[i] = deep_mines
+  
+  return safe, mines
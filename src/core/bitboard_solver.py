@@ -0,0 +1,244 @@
+"""
+位棋盘求解器
+用Python整数位集表示棋盘（第 row*cols+col 位对应格子(row, col)），
+适用于高级（480格）及以下的标准棋盘
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from utils.constants import CellState, ReasonTemplates
+
+
+if hasattr(int, 'bit_count'):
+  def popcount(mask):
+    """统计位集中置位的个数"""
+    return mask.bit_count()
+else:
+  def popcount(mask):
+    """统计位集中置位的个数"""
+    return bin(mask).count('1')
+
+
+def board_to_mask(condition):
+  """
+  将布尔矩阵打包为位集
+  
+  Args:
+    condition: 布尔矩阵，形状为 (rows, cols)
+    
+  Returns:
+    Python整数，第 row*cols+col 位表示condition[row, col]
+  """
+  bits = np.packbits(np.ravel(condition).astype(bool), bitorder='little')
+  return int.from_bytes(bits.tobytes(), 'little')
+
+
+def iter_bits(mask):
+  """
+  按从低到高的顺序遍历置位的下标
+  
+  Args:
+    mask: 位集
+    
+  Yields:
+    置位的下标（即 row*cols+col）
+  """
+  while mask:
+    low = mask & -mask
+    yield low.bit_length() - 1
+    mask ^= low
+
+
+@lru_cache(maxsize=16)
+def get_edge_masks(rows, cols):
+  """
+  获取平移时使用的边界掩码
+  
+  Args:
+    rows: 行数
+    cols: 列数
+    
+  Returns:
+    (full, not_first_col, not_last_col) 三个位集
+  """
+  full = (1 << (rows * cols)) - 1
+  first_col = 0
+  for r in range(rows):
+    first_col |= 1 << (r * cols)
+  last_col = first_col << (cols - 1)
+  return full, full & ~first_col, full & ~last_col
+
+
+def dilate(mask, rows, cols):
+  """
+  将位集向8个方向各扩展一格（包含自身）
+  
+  Args:
+    mask: 位集
+    rows: 行数
+    cols: 列数
+    
+  Returns:
+    扩展后的位集
+  """
+  full, not_first_col, not_last_col = get_edge_masks(rows, cols)
+  horizontal = mask | ((mask & not_last_col) << 1) | ((mask & not_first_col) >> 1)
+  return (horizontal | (horizontal << cols) | (horizontal >> cols)) & full
+
+
+@lru_cache(maxsize=16)
+def get_neighbor_masks(rows, cols):
+  """
+  预计算每个格子的邻居位集
+  
+  Args:
+    rows: 行数
+    cols: 列数
+    
+  Returns:
+    长度为 rows*cols 的元组，第i项为格子i的8邻域位集
+  """
+  return tuple(
+    dilate(1 << idx, rows, cols) & ~(1 << idx)
+    for idx in range(rows * cols)
+  )
+
+
+def solve_bitboard(board):
+  """
+  用位棋盘求解当前棋盘，结果与参考求解器逐项一致
+  
+  Args:
+    board: 棋盘状态（numpy数组）
+    
+  Returns:
+    (safe_cells, mine_cells, safe_reasons, mine_reasons)
+  """
+  rows, cols = board.shape
+  flat = board.ravel()
+  
+  unknown = board_to_mask(flat == CellState.UNKNOWN)
+  flagged = board_to_mask(flat == CellState.FLAGGED)
+  numbers = board_to_mask(flat > 0)
+  neighbors = get_neighbor_masks(rows, cols)
+  
+  safe_cells, mine_cells = [], []
+  safe_reasons, mine_reasons = {}, {}
+  safe_mask = 0
+  mine_mask = 0
+  
+  # 只有与未知格子相邻的数字格子才可能给出结论
+  for idx in iter_bits(numbers & dilate(unknown, rows, cols)):
+    around = neighbors[idx]
+    unknown_around = around & unknown
+    number = int(flat[idx])
+    flagged_count = popcount(around & flagged)
+    unknown_count = popcount(unknown_around)
+    remaining = number - flagged_count
+    row, col = divmod(idx, cols)
+    
+    # 规则1: 未知格子数 = 剩余雷数
+    if unknown_count == remaining and remaining > 0:
+      new_mines = unknown_around & ~mine_mask
+      if new_mines:
+        reason = ReasonTemplates.MINE.format(
+          row=row + 1, col=col + 1, number=number,
+          flagged=flagged_count, unknown=unknown_count, remaining=remaining
+        )
+        for cell in iter_bits(new_mines):
+          pos = divmod(cell, cols)
+          mine_cells.append(pos)
+          mine_reasons[pos] = reason
+        mine_mask |= new_mines
+    
+    # 规则2: 已标记雷数 = 数字（子集判断 a & ~b == 0 时无新结论）
+    if flagged_count == number:
+      new_safe = unknown_around & ~safe_mask
+      if new_safe:
+        reason = ReasonTemplates.SAFE.format(
+          row=row + 1, col=col + 1, number=number,
+          flagged=flagged_count, unknown=unknown_count
+        )
+        for cell in iter_bits(new_safe):
+          pos = divmod(cell, cols)
+          safe_cells.append(pos)
+          safe_reasons[pos] = reason
+        safe_mask |= new_safe
+  
+  return safe_cells, mine_cells, safe_reasons, mine_reasons
+
+
+def solve_subsets(board):
+  """
+  成对子集推理：若数字A的未知邻居是数字B未知邻居的子集，
+  则差集中的雷数为两者剩余雷数之差，可据此判定安全格子或地雷
+  
+  Args:
+    board: 棋盘状态（numpy数组）
+  
+  Returns:
+    (safe_mask, mine_mask) 两个位集
+  """
+  rows, cols = board.shape
+  flat = board.ravel()
+  
+  unknown = board_to_mask(flat == CellState.UNKNOWN)
+  flagged = board_to_mask(flat == CellState.FLAGGED)
+  numbers = board_to_mask(flat > 0)
+  neighbors = get_neighbor_masks(rows, cols)
+  
+  # 每个前沿数字格子对应一条约束: cells中恰有remaining个雷
+  constraints = []
+  by_cell = {}
+  for idx in iter_bits(numbers & dilate(unknown, rows, cols)):
+    around = neighbors[idx]
+    cells = around & unknown
+    remaining = int(flat[idx]) - popcount(around & flagged)
+    for cell in iter_bits(cells):
+      by_cell.setdefault(cell, []).append(len(constraints))
+    constraints.append((cells, remaining))
+  
+  safe_mask = 0
+  mine_mask = 0
+  
+  for cells, remaining in constraints:
+    if remaining == 0:
+      safe_mask |= cells
+    elif remaining == popcount(cells):
+      mine_mask |= cells
+  
+  for cells_a, remaining_a in constraints:
+    # 包含A的约束必然包含A的最低位格子
+    lowest = (cells_a & -cells_a).bit_length() - 1
+    for j in by_cell[lowest]:
+      cells_b, remaining_b = constraints[j]
+      if cells_b == cells_a or cells_a & ~cells_b:
+        continue
+      diff = cells_b & ~cells_a
+      diff_mines = remaining_b - remaining_a
+      if diff_mines == 0:
+        safe_mask |= diff
+      elif diff_mines == popcount(diff):
+        mine_mask |= diff
+  
+  return safe_mask, mine_mask
+
+
+def mask_to_board(mask, rows, cols):
+  """
+  将位集展开为布尔矩阵
+  
+  Args:
+    mask: 位集
+    rows: 行数
+    cols: 列数
+  
+  Returns:
+    形状为 (rows, cols) 的布尔矩阵
+  """
+  size = rows * cols
+  raw = np.frombuffer(mask.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+  bits = np.unpackbits(raw, count=size, bitorder='little')
+  return bits.astype(bool).reshape(rows, cols)
@@ -5,24 +5,35 @@
 
 import numpy as np
 
-from utils.image_utils import get_cell_image
+from core.frame_diff import FrameDiffer
+from core.grid_detector import GridDetector
+from utils.constants import ImageConfig
+from utils.image_utils import normalize_board
 
 
 class BoardAnalyzer:
   """棋盘分析器类"""
   
-  def __init__(self, image_processor):
+  def __init__(self, image_processor, auto_grid=True):
     """
     初始化分析器
     
     Args:
       image_processor: ImageProcessor实例
+      auto_grid: 是否由图像自动检测网格几何（格子间距、原点和行列数）
     """
     self.image_processor = image_processor
     self.board = None
     self.rows = 9
     self.cols = 9
     self.cell_size = 0
+    self.auto_grid = auto_grid
+    self.size_fixed = False   # 是否已通过set_board_size指定行列数
+    self.grid_detector = GridDetector()
+    self.geometry = None      # 最近一次使用的网格几何
+    self.frame_differ = FrameDiffer()
+    self.dirty = None     # 最近一帧发生变化的格子掩码
+    self.changed = True   # 最近一帧是否有格子变化
   
   def set_board_size(self, rows, cols):
     """
@@ -34,30 +45,62 @@ class BoardAnalyzer:
     """
     self.rows = rows
     self.cols = cols
+    self.size_fixed = True
   
-  def analyze(self):
+  def analyze(self, board_image=None):
     """
     分析棋盘状态
     
+    启用自动网格检测时按拟合的网格（每个棋盘只检测一次）确定网格区域，
+    检测失败时退回按行列数整除；网格区域一次缩放为每格CANONICAL_CELL_SIZE像素，
+    随后与上一帧逐格比较，只重新识别发生变化的格子，没有格子变化时直接返回上次结果
+    
+    Args:
+      board_image: 可选的棋盘图像，为None时从image_processor获取
+      
     Returns:
       numpy数组，表示棋盘状态
     """
-    board_image = self.image_processor.get_board_image()
+    if board_image is None:
+      board_image = self.image_processor.get_board_image()
     
     if board_image is None:
       return None
     
-    h, w = board_image.shape[:2]
-    self.cell_size = min(w // self.cols, h // self.rows)
+    self.geometry = None
+    if self.auto_grid:
+      known = (self.rows, self.cols) if self.size_fixed else (None, None)
+      self.geometry = self.grid_detector.detect(
+        board_image, *known, key=self.image_processor.board_region
+      )
+    
+    if self.geometry is not None:
+      self.rows, self.cols = self.geometry.rows, self.geometry.cols
+      self.cell_size = self.geometry.cell_size
+      rect = self.geometry.grid_rect()
+    else:
+      h, w = board_image.shape[:2]
+      self.cell_size = min(w // self.cols, h // self.rows)
+      rect = (0, 0, self.cols * self.cell_size, self.rows * self.cell_size)
+    
+    # 一次缩放到固定的格子大小，之后的帧差和识别耗时与屏幕缩放比例无关
+    size = ImageConfig.CANONICAL_CELL_SIZE
+    board_image = normalize_board(board_image, self.rows, self.cols, size, rect)
+    
+    previous = self.board
+    if previous is not None and previous.shape != (self.rows, self.cols):
+      previous = None
     
-    # 创建棋盘矩阵
-    self.board = np.zeros((self.rows, self.cols), dtype=int)
+    self.dirty = self.frame_differ.update(board_image, self.rows, self.cols, size)
+    self.changed = previous is None or bool(self.dirty.any())
+    if not self.changed:
+      return self.board
     
-    # 识别每个格子
-    for i in range(self.rows):
-      for j in range(self.cols):
-        cell = get_cell_image(board_image, i, j, self.cell_size)
-        self.board[i, j] = self.image_processor.recognize_cell(cell)
+    # 整块识别变化的格子
+    self.board = self.image_processor.recognize_board(
+      board_image, self.rows, self.cols, size,
+      dirty=self.dirty, previous=previous
+    )
     
     return self.board
   
@@ -70,9 +113,38 @@ class BoardAnalyzer:
     """
     return self.board
   
+  def get_dirty_cells(self):
+    """
+    获取最近一帧发生变化的格子
+    
+    Returns:
+      (row, col) 列表
+    """
+    if self.dirty is None:
+      return []
+    return [tuple(cell) for cell in np.argwhere(self.dirty).tolist()]
+  
+  def get_confidence(self):
+    """
+    获取最近一次识别每个格子的置信度
+    
+    Returns:
+      numpy数组（0-1），未使用校准原型时返回None
+    """
+    return self.image_processor.confidence
+  
+  def get_geometry(self):
+    """
+    获取最近一次使用的网格几何
+    
+    Returns:
+      GridGeometry实例，未检测到网格时返回None
+    """
+    return self.geometry
+  
   def get_cell_size(self):
     """
-    获取格子大小
+    获取格子在截图中的大小（识别前会统一缩放，见ImageConfig.CANONICAL_CELL_SIZE）
     
     Returns:
       格子大小（像素）
@@ -0,0 +1,131 @@
+"""
+按难度区间批量生成棋盘
+候选布局在进程池中成批生成并按3BV、空白区数量、是否可无猜完成过滤
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from core.board_metrics import compute_metrics, random_layouts, solve_without_guessing
+from utils.constants import GeneratorConfig
+
+
+def in_band(metrics, band):
+  """
+  判断指标是否落在难度区间内
+  
+  Args:
+    metrics: compute_metrics返回的指标dict
+    band: 难度区间dict，可包含min_3bv、max_3bv、min_openings、max_openings
+    
+  Returns:
+    布尔数组
+  """
+  keep = np.ones(len(metrics['3bv']), dtype=bool)
+  if 'min_3bv' in band:
+    keep &= metrics['3bv'] >= band['min_3bv']
+  if 'max_3bv' in band:
+    keep &= metrics['3bv'] <= band['max_3bv']
+  if 'min_openings' in band:
+    keep &= metrics['openings'] >= band['min_openings']
+  if 'max_openings' in band:
+    keep &= metrics['openings'] <= band['max_openings']
+  return keep
+
+
+def generate_chunk(rows, cols, mines, first_click, band, size, seed=None):
+  """
+  生成一批候选布局并过滤（可在工作进程中执行）
+  
+  先用向量化指标做廉价过滤，只对通过的布局做无猜求解校验
+  
+  Args:
+    rows: 行数
+    cols: 列数
+    mines: 地雷数量
+    first_click: 首次点击位置 (row, col)
+    band: 难度区间dict，no_guess为True时要求可无猜完成
+    size: 候选布局数量
+    seed: 随机种子
+    
+  Returns:
+    (accepted, size) 通过的布局数组和候选数量
+  """
+  rng = np.random.default_rng(seed)
+  layouts = random_layouts(size, rows, cols, mines, first_click[0], first_click[1], rng)
+  keep = in_band(compute_metrics(layouts), band)
+  
+  if band.get('no_guess'):
+    for i in np.flatnonzero(keep):
+      keep[i] = solve_without_guessing(layouts[i], *first_click)[0]
+  
+  return layouts[keep], size
+
+
+def generate_boards(rows, cols, mines, band, count, first_click=None, workers=None,
+                    chunk_size=GeneratorConfig.CHUNK_SIZE, seed=None):
+  """
+  用进程池生成count个落在难度区间内的棋盘
+  
+  Args:
+    rows: 行数
+    cols: 列数
+    mines: 地雷数量
+    band: 难度区间dict
+    count: 需要的棋盘数量
+    first_click: 首次点击位置，默认为棋盘中心
+    workers: 进程池大小（None表示CPU核数）
+    chunk_size: 每个任务的候选布局数量
+    seed: 随机种子
+    
+  Returns:
+    (layouts, stats) layouts形状为 (count, rows, cols)；
+    stats包含generated、accepted、rejection_rate、boards_per_sec、elapsed
+  """
+  if first_click is None:
+    first_click = (rows // 2, cols // 2)
+  
+  workers = workers or os.cpu_count() or 1
+  seeds = np.random.SeedSequence(seed)
+  accepted = []
+  accepted_count = 0
+  generated = 0
+  start = time.perf_counter()
+  
+  with ProcessPoolExecutor(max_workers=workers) as pool:
+    in_flight = set()
+    max_in_flight = 2 * workers
+    
+    while accepted_count < count:
+      while (len(in_flight) < max_in_flight
+             and generated + len(in_flight) * chunk_size < GeneratorConfig.MAX_CANDIDATES):
+        in_flight.add(pool.submit(
+          generate_chunk, rows, cols, mines, first_click, band, chunk_size,
+          seeds.spawn(1)[0]
+        ))
+      if not in_flight:
+        break
+      
+      done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+      for future in done:
+        layouts, size = future.result()
+        generated += size
+        accepted.append(layouts)
+        accepted_count += len(layouts)
+    
+    for future in in_flight:
+      future.cancel()
+  
+  elapsed = time.perf_counter() - start
+  layouts = np.concatenate(accepted)[:count] if accepted else np.zeros((0, rows, cols), dtype=bool)
+  stats = {
+    'generated': generated,
+    'accepted': accepted_count,
+    'rejection_rate': 1 - accepted_count / generated if generated else 0.0,
+    'boards_per_sec': len(layouts) / elapsed if elapsed > 0 else 0.0,
+    'elapsed': elapsed
+  }
+  return layouts, stats
@@ -0,0 +1,186 @@
+"""
+棋盘难度指标
+对一叠地雷布局 (N, rows, cols) 向量化计算3BV、空白区数量，并判断能否无猜完成
+"""
+
+import cv2
+import numpy as np
+
+from core.batch_solver import neighbor_count, spread
+from core.bitboard_solver import mask_to_board, solve_subsets
+from utils.constants import CellState
+
+
+def adjacent_counts(layouts):
+  """
+  计算每个格子周围的地雷数
+  
+  Args:
+    layouts: 布尔数组，形状为 (N, rows, cols)，True表示地雷
+    
+  Returns:
+    int8数组，形状同layouts
+  """
+  return neighbor_count(layouts)
+
+
+def label_openings(zero):
+  """
+  对一叠棋盘的空白格子做8连通标记（各棋盘横向拼接后只调用一次connectedComponents）
+  
+  Args:
+    zero: 布尔数组，形状为 (N, rows, cols)，True表示周围无雷的非雷格子
+    
+  Returns:
+    (labels, openings) labels形状同zero，各棋盘的标签互不重复，0表示非空白；
+    openings为每个棋盘的空白区数量
+  """
+  n, rows, cols = zero.shape
+  # 每个棋盘右侧留一列间隔，保证连通域不会跨棋盘
+  strip = np.zeros((rows, n, cols + 1), dtype=np.uint8)
+  strip[:, :, :cols] = zero.transpose(1, 0, 2)
+  count, labels = cv2.connectedComponents(strip.reshape(rows, -1), connectivity=8)
+  
+  labels = labels.reshape(rows, n, cols + 1)[:, :, :cols].transpose(1, 0, 2)
+  label_board = np.zeros(count, dtype=np.int64)
+  label_board[labels] = np.arange(n)[:, None, None]
+  openings = np.bincount(label_board[1:], minlength=n)
+  return np.ascontiguousarray(labels), openings
+
+
+def compute_metrics(layouts):
+  """
+  计算一叠地雷布局的难度指标
+  
+  3BV = 空白区数量 + 不与任何空白格子相邻的数字格子数
+  
+  Args:
+    layouts: 布尔数组，形状为 (N, rows, cols)
+    
+  Returns:
+    dict包含每个棋盘的'3bv'、'openings'、'isolated'数组
+  """
+  layouts = np.asarray(layouts, dtype=bool)
+  counts = adjacent_counts(layouts)
+  zero = ~layouts & (counts == 0)
+  _, openings = label_openings(zero)
+  isolated = ~layouts & ~zero & ~spread(zero)
+  isolated_count = isolated.sum(axis=(1, 2))
+  return {
+    '3bv': openings + isolated_count,
+    'openings': openings,
+    'isolated': isolated_count
+  }
+
+
+def prepare_layout(layout):
+  """
+  预计算单个布局的数字和空白区标记
+  
+  Args:
+    layout: 布尔数组，形状为 (rows, cols)
+    
+  Returns:
+    (counts, zero, labels) 周围雷数、空白格子掩码、空白区标签
+  """
+  counts = adjacent_counts(layout[None])[0]
+  zero = ~layout & (counts == 0)
+  labels = label_openings(zero[None])[0][0]
+  return counts, zero, labels
+
+
+def reveal_cells(cells, revealed, zero, labels):
+  """
+  翻开格子，点到空白格子时翻开整个空白区及其边界（原地修改revealed）
+  
+  Args:
+    cells: 要翻开的格子掩码
+    revealed: 已翻开的格子掩码
+    zero: 空白格子掩码
+    labels: 空白区标签
+  """
+  revealed |= cells
+  opened = np.unique(labels[cells & zero])
+  if len(opened):
+    region = np.isin(labels, opened)
+    revealed |= spread(region[None])[0] | region
+
+
+def sweep(counts, zero, labels, revealed, flagged):
+  """
+  从当前局面出发反复应用逻辑推理，直到无新结论（原地修改revealed和flagged）
+  
+  Args:
+    counts: 周围雷数
+    zero: 空白格子掩码
+    labels: 空白区标签
+    revealed: 已翻开的格子掩码
+    flagged: 已标记的格子掩码
+  """
+  rows, cols = counts.shape
+  while True:
+    state = np.where(revealed, counts, CellState.UNKNOWN)
+    state[flagged] = CellState.FLAGGED
+    safe_mask, mine_mask = solve_subsets(state)
+    safe = mask_to_board(safe_mask, rows, cols) & ~revealed
+    mines = mask_to_board(mine_mask, rows, cols) & ~flagged
+    if not safe.any() and not mines.any():
+      return
+    flagged |= mines
+    if safe.any():
+      reveal_cells(safe, revealed, zero, labels)
+
+
+def solve_without_guessing(layout, first_row, first_col):
+  """
+  从首次点击开始只用逻辑推理（单格规则和子集规则）求解棋盘
+  
+  Args:
+    layout: 布尔数组，形状为 (rows, cols)
+    first_row: 首次点击的行
+    first_col: 首次点击的列
+    
+  Returns:
+    (solved, revealed) solved表示能否无猜完成，revealed为最终翻开的格子
+  """
+  layout = np.asarray(layout, dtype=bool)
+  counts, zero, labels = prepare_layout(layout)
+  
+  revealed = np.zeros(layout.shape, dtype=bool)
+  flagged = np.zeros(layout.shape, dtype=bool)
+  start = np.zeros(layout.shape, dtype=bool)
+  start[first_row, first_col] = True
+  reveal_cells(start, revealed, zero, labels)
+  sweep(counts, zero, labels, revealed, flagged)
+  
+  solved = bool((revealed | layout).all())
+  return solved, revealed
+
+
+def random_layouts(n, rows, cols, mines, first_row, first_col, rng=None):
+  """
+  向量化地生成一叠随机地雷布局，首次点击及其周围8格无雷（与MinesweeperGame一致）
+  
+  Args:
+    n: 布局数量
+    rows: 行数
+    cols: 列数
+    mines: 地雷数量
+    first_row: 首次点击的行
+    first_col: 首次点击的列
+    rng: 可选的numpy随机数生成器
+    
+  Returns:
+    布尔数组，形状为 (n, rows, cols)
+  """
+  rng = rng or np.random.default_rng()
+  allowed = np.ones((rows, cols), dtype=bool)
+  allowed[max(first_row - 1, 0):first_row + 2, max(first_col - 1, 0):first_col + 2] = False
+  candidates = np.flatnonzero(allowed)
+  
+  # 每行取随机键最小的mines个位置，即无放回均匀抽样
+  keys = rng.random((n, len(candidates)))
+  chosen = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+  layouts = np.zeros((n, rows * cols), dtype=bool)
+  np.put_along_axis(layouts, candidates[chosen], True, axis=1)
+  return layouts.reshape(n, rows, cols)
@@ -0,0 +1,120 @@
+"""
+棋盘区域跟踪
+首次全屏检测棋盘后只截取棋盘区域，每帧用外圈签名廉价校验，
+签名不符（窗口移动或被遮挡）时才重新全屏检测
+"""
+
+import numpy as np
+
+from utils.constants import ImageConfig, TrackerConfig
+from utils.image_utils import border_signature, detect_board_region_scaled
+
+
+class BoardTracker:
+  """棋盘区域跟踪器类"""
+  
+  def __init__(self, image_processor, screen_offset=(0, 0)):
+    """
+    初始化跟踪器
+    
+    Args:
+      image_processor: ImageProcessor实例
+      screen_offset: 全屏截图左上角在屏幕上的坐标
+    """
+    self.image_processor = image_processor
+    self.screen_offset = screen_offset
+    self.region = None      # 棋盘在屏幕上的区域 (x, y, w, h)
+    self.signature = None   # 棋盘外圈签名
+    self.frames = 0
+    self.detections = 0
+    self.captured_bytes = 0
+    self.detected_bytes = 0
+  
+  def capture(self):
+    """
+    截取当前棋盘图像
+    
+    已有缓存区域时只截取该区域并校验签名，签名不符时重新全屏检测；
+    结果同时写入image_processor，供BoardAnalyzer.analyze使用
+    
+    Returns:
+      棋盘图像，未检测到棋盘时返回None
+    """
+    self.frames += 1
+    
+    if self.region is not None:
+      board_image = self.image_processor.capture_screenshot(region=self.region)
+      if board_image is None:
+        return None
+      self.captured_bytes += board_image.nbytes
+      if self._matches(board_image):
+        self.image_processor.board_region = None
+        return board_image
+    
+    return self._redetect()
+  
+  def _matches(self, board_image):
+    """
+    校验截取的图像是否仍是缓存的棋盘
+    
+    Returns:
+      是否匹配
+    """
+    if board_image.shape[:2] != (self.region[3], self.region[2]):
+      return False
+    signature = border_signature(
+      board_image, TrackerConfig.BORDER_WIDTH, TrackerConfig.SIGNATURE_LENGTH
+    )
+    difference = np.abs(signature - self.signature).mean()
+    return difference <= TrackerConfig.SIGNATURE_THRESHOLD
+  
+  def _redetect(self):
+    """
+    全屏截图并在缩小的图像上重新检测棋盘
+    
+    Returns:
+      棋盘图像，未检测到棋盘时返回None
+    """
+    self.detections += 1
+    screenshot = self.image_processor.capture_screenshot()
+    if screenshot is None:
+      return None
+    self.captured_bytes += screenshot.nbytes
+    self.detected_bytes += screenshot.nbytes
+    
+    local = detect_board_region_scaled(
+      screenshot, ImageConfig.MIN_BOARD_SIZE,
+      TrackerConfig.DETECT_SCALE, TrackerConfig.REFINE_PADDING
+    )
+    self.image_processor.board_region = local
+    if local is None:
+      self.reset()
+      return None
+    
+    x, y, w, h = local
+    board_image = screenshot[y:y + h, x:x + w]
+    self.region = (x + self.screen_offset[0], y + self.screen_offset[1], w, h)
+    self.signature = border_signature(
+      board_image, TrackerConfig.BORDER_WIDTH, TrackerConfig.SIGNATURE_LENGTH
+    )
+    return board_image
+  
+  def reset(self):
+    """清除缓存区域，下一帧重新检测"""
+    self.region = None
+    self.signature = None
+  
+  def get_stats(self):
+    """
+    获取统计信息
+    
+    Returns:
+      dict包含frames、detections、每帧平均截取和检测的字节数
+    """
+    frames = max(self.frames, 1)
+    return {
+      'frames': self.frames,
+      'detections': self.detections,
+      'captured_bytes_per_frame': self.captured_bytes / frames,
+      'detected_bytes_per_frame': self.detected_bytes / frames
+    }
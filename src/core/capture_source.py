@@ -0,0 +1,316 @@
+"""
+截图来源
+屏幕、图片文件、视频文件和内存帧生成器统一为同一接口，
+每一帧写入预分配的环形缓冲区，稳定运行时不再为每帧分配新数组；
+需要跨线程传递的帧可以先持有缓冲区，释放前不会被覆盖
+"""
+
+import abc
+import itertools
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from utils.constants import CaptureConfig, OfflineConfig
+
+
+class FrameRing:
+  """预分配的帧缓冲区环"""
+  
+  def __init__(self, size=CaptureConfig.RING_SIZE):
+    """
+    初始化缓冲区环
+    
+    Args:
+      size: 缓冲区个数；未被持有的缓冲区轮流使用，
+        返回的帧在之后(未被持有的缓冲区数-1)次获取内不会被覆盖
+    """
+    self.size = size
+    self.buffers = []
+    self.index = 0
+    self.allocations = 0
+    self.held = set()   # 被持有的缓冲区id，释放前不会被next返回
+    self._lock = threading.Lock()
+  
+  def next(self, shape, dtype=np.uint8):
+    """
+    取下一个未被持有的缓冲区
+    
+    形状变化时重新分配整个环；所有缓冲区都被持有时追加一个新缓冲区
+    
+    Args:
+      shape: 帧形状
+      dtype: 数据类型
+      
+    Returns:
+      numpy数组（内容未初始化）
+    """
+    shape = tuple(shape)
+    with self._lock:
+      if not self.buffers or self.buffers[0].shape != shape or self.buffers[0].dtype != dtype:
+        # 旧缓冲区已不在环中，被持有的帧不会再被覆盖
+        self.buffers = [np.empty(shape, dtype=dtype) for _ in range(self.size)]
+        self.allocations += 1
+        self.index = 0
+        self.held.clear()
+      
+      for _ in range(len(self.buffers)):
+        buffer = self.buffers[self.index]
+        self.index = (self.index + 1) % len(self.buffers)
+        if id(buffer) not in self.held:
+          return buffer
+      
+      buffer = np.empty(shape, dtype=dtype)
+      self.buffers.append(buffer)
+      self.allocations += 1
+      return buffer
+  
+  def owner(self, frame):
+    """
+    查找帧（或其视图）所在的缓冲区
+    
+    Returns:
+      缓冲区数组，不属于本环时返回None
+    """
+    buffers = {id(buffer): buffer for buffer in self.buffers}
+    while isinstance(frame, np.ndarray):
+      if id(frame) in buffers:
+        return frame
+      frame = frame.base
+    return None
+  
+  def hold(self, frame):
+    """
+    持有帧所在的缓冲区，release之前不会被覆盖
+    
+    Args:
+      frame: grab返回的帧或其视图
+      
+    Returns:
+      是否属于本环（不属于时无需释放）
+    """
+    with self._lock:
+      buffer = self.owner(frame)
+      if buffer is None:
+        return False
+      self.held.add(id(buffer))
+      return True
+  
+  def release(self, frame):
+    """释放hold持有的缓冲区"""
+    with self._lock:
+      buffer = self.owner(frame)
+      if buffer is not None:
+        self.held.discard(id(buffer))
+
+
+def crop_region(frame, region):
+  """
+  按区域裁剪帧（返回视图，不复制）
+  
+  Args:
+    frame: 帧图像
+    region: 可选的区域 (x, y, w, h)
+    
+  Returns:
+    帧图像或其视图
+  """
+  if region is None:
+    return frame
+  x, y, w, h = region
+  return frame[y:y + h, x:x + w]
+
+
+class CaptureSource(abc.ABC):
+  """截图来源基类（子类必须实现_read）"""
+  
+  def __init__(self, ring_size=CaptureConfig.RING_SIZE):
+    """
+    初始化截图来源
+    
+    Args:
+      ring_size: 帧缓冲区个数
+    """
+    self.ring = FrameRing(ring_size)
+    self.frames = 0
+    self.exhausted = False   # 文件或生成器已没有更多帧
+  
+  def grab(self, region=None):
+    """
+    获取下一帧
+    
+    返回的数组属于缓冲区环，很快会被之后的帧覆盖；
+    需要在其他线程中使用时先hold，用完后release，需要长期保存时请复制
+    
+    Args:
+      region: 可选的区域 (x, y, w, h)
+      
+    Returns:
+      numpy数组图像（BGR格式），没有更多帧时返回None
+    """
+    frame = self._read(region)
+    if frame is None:
+      self.exhausted = True
+    else:
+      self.frames += 1
+    return frame
+  
+  @abc.abstractmethod
+  def _read(self, region):
+    """
+    读取一帧到缓冲区
+    
+    Returns:
+      numpy数组图像（BGR格式），没有更多帧时返回None
+    """
+  
+  def hold(self, frame):
+    """
+    持有帧所在的缓冲区（见FrameRing.hold）
+    
+    Returns:
+      是否属于本来源的缓冲区
+    """
+    return self.ring.hold(frame)
+  
+  def release(self, frame):
+    """释放hold持有的缓冲区"""
+    self.ring.release(frame)
+  
+  def close(self):
+    """释放资源"""
+  
+  def get_stats(self):
+    """
+    获取统计信息
+    
+    Returns:
+      dict包含frames、allocations
+    """
+    return {'frames': self.frames, 'allocations': self.ring.allocations}
+
+
+class ScreenSource(CaptureSource):
+  """屏幕截图来源"""
+  
+  def __init__(self, ring_size=CaptureConfig.RING_SIZE):
+    super().__init__(ring_size)
+    # 延迟导入，使文件和内存来源在无显示环境下也可使用
+    import pyautogui
+    self.pyautogui = pyautogui
+  
+  def _read(self, region):
+    """截取屏幕并直接转换颜色到缓冲区"""
+    screenshot = self.pyautogui.screenshot(region=region)
+    # pyautogui只能返回PIL图像，asarray仍会产生一份RGB数据，颜色转换则直接写入缓冲区
+    rgb = np.asarray(screenshot)
+    buffer = self.ring.next(rgb.shape)
+    cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=buffer)
+    return buffer
+
+
+class FrameSource(CaptureSource):
+  """逐帧复制到缓冲区的来源（图片文件和内存生成器）"""
+  
+  def __init__(self, frames, ring_size=CaptureConfig.RING_SIZE):
+    """
+    初始化来源
+    
+    Args:
+      frames: BGR帧的迭代器
+      ring_size: 帧缓冲区个数
+    """
+    super().__init__(ring_size)
+    self.iterator = iter(frames)
+  
+  def _read(self, region):
+    frame = next(self.iterator, None)
+    if frame is None:
+      return None
+    frame = crop_region(frame, region)
+    buffer = self.ring.next(frame.shape, frame.dtype)
+    np.copyto(buffer, frame)
+    return buffer
+
+
+class ImageFileSource(FrameSource):
+  """图片文件来源（单个文件或目录）"""
+  
+  def __init__(self, path, loop=False, ring_size=CaptureConfig.RING_SIZE):
+    """
+    初始化来源
+    
+    单个文件只解码一次，之后每帧从解码结果复制；目录按文件名顺序逐个解码
+    
+    Args:
+      path: 图片文件或目录
+      loop: 是否循环播放
+      ring_size: 帧缓冲区个数
+    """
+    path = Path(path)
+    if path.is_dir():
+      paths = sorted(p for p in path.iterdir() if p.suffix.lower() in OfflineConfig.IMAGE_SUFFIXES)
+    else:
+      paths = [path]
+    
+    if len(paths) == 1:
+      image = cv2.imread(str(paths[0]), cv2.IMREAD_COLOR)
+      if image is None:
+        raise ValueError(f"无法读取图片: {paths[0]}")
+      frames = itertools.repeat(image) if loop else iter([image])
+    else:
+      frames = self._decode(itertools.cycle(paths) if loop else paths)
+    super().__init__(frames, ring_size)
+  
+  @staticmethod
+  def _decode(paths):
+    for path in paths:
+      image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+      if image is not None:
+        yield image
+
+
+class GeneratorSource(FrameSource):
+  """内存帧来源（如ScreenshotRenderer产生的合成截图）"""
+
+
+class VideoFileSource(CaptureSource):
+  """视频文件来源"""
+  
+  def __init__(self, path, loop=False, ring_size=CaptureConfig.RING_SIZE):
+    """
+    初始化来源
+    
+    Args:
+      path: 视频文件路径
+      loop: 播放到结尾后是否从头开始
+      ring_size: 帧缓冲区个数
+    """
+    super().__init__(ring_size)
+    self.path = str(path)
+    self.loop = loop
+    self.capture = cv2.VideoCapture(self.path)
+    if not self.capture.isOpened():
+      raise ValueError(f"无法打开视频: {path}")
+    width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    self.shape = (height, width, 3)
+  
+  def _read(self, region):
+    """解码下一帧，直接写入缓冲区"""
+    buffer = self.ring.next(self.shape)
+    ok, frame = self.capture.read(buffer)
+    if not ok and self.loop:
+      self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+      ok, frame = self.capture.read(buffer)
+    if not ok:
+      return None
+    if frame.shape != self.shape:
+      # 解码器没有使用传入的缓冲区（帧尺寸与元数据不符）
+      self.shape = frame.shape
+    return crop_region(frame, region)
+  
+  def close(self):
+    self.capture.release()
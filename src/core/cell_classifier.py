@@ -0,0 +1,153 @@
+"""
+格子原型分类器
+从标注好的样本格子学习每种状态的原型（数字1-8、旗帜、地雷、未翻开、空白），
+按缩小后的特征向量到原型的最近距离分类，并给出置信度
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from utils.constants import ClassifierConfig
+from utils.image_utils import downsample_cells
+
+
+# 默认校准缓存目录（项目根目录下）
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ClassifierConfig.CACHE_DIR
+
+
+def cell_features(small_cells):
+  """
+  将缩小后的格子转换为特征向量
+  
+  Args:
+    small_cells: uint8数组，形状为 (..., size, size, 3)
+    
+  Returns:
+    float32数组，形状为 (..., size*size*3)
+  """
+  shape = small_cells.shape[:-3]
+  return small_cells.reshape(shape + (-1,)).astype(np.float32) / 255
+
+
+def board_features(board_image, rows, cols, cell_size, feature_size=ClassifierConfig.FEATURE_SIZE):
+  """
+  计算整张棋盘每个格子的特征向量（整张图只做一次区域插值缩放）
+  
+  Args:
+    board_image: 棋盘图像（BGR）
+    rows: 行数
+    cols: 列数
+    cell_size: 格子大小
+    feature_size: 每个格子缩小后的边长
+    
+  Returns:
+    float32数组，形状为 (rows, cols, feature_size*feature_size*3)
+  """
+  return cell_features(downsample_cells(board_image, rows, cols, cell_size, feature_size))
+
+
+def cache_path(theme, cell_size, directory=DEFAULT_CACHE_DIR):
+  """
+  获取指定主题和格子大小的校准缓存文件路径
+  
+  Returns:
+    Path对象
+  """
+  return Path(directory) / f'{theme}_{cell_size}.npz'
+
+
+class PrototypeClassifier:
+  """最近原型分类器"""
+  
+  def __init__(self, labels=None, prototypes=None, feature_size=ClassifierConfig.FEATURE_SIZE):
+    """
+    初始化分类器
+    
+    Args:
+      labels: 原型对应的格子状态数组
+      prototypes: 原型特征矩阵，形状为 (k, d)
+      feature_size: 每个格子缩小后的边长
+    """
+    self.labels = labels
+    self.prototypes = prototypes
+    self.feature_size = feature_size
+  
+  @property
+  def fingerprint(self):
+    """原型的摘要（校准变化时随之变化）"""
+    if self.prototypes is None:
+      return None
+    return hashlib.sha1(self.prototypes.tobytes()).hexdigest()[:16]
+  
+  def fit(self, features, labels):
+    """
+    用标注样本学习原型（每种状态取特征均值）
+    
+    Args:
+      features: 特征数组，形状为 (n, d)
+      labels: 状态数组，形状为 (n,)
+      
+    Returns:
+      self
+    """
+    features = np.asarray(features, dtype=np.float32).reshape(len(labels), -1)
+    labels = np.asarray(labels)
+    self.labels = np.unique(labels)
+    self.prototypes = np.stack([features[labels == label].mean(axis=0) for label in self.labels])
+    return self
+  
+  def classify(self, features):
+    """
+    批量分类
+    
+    置信度 = 1 - 最近距离/次近距离，落在0到1之间，越大越可靠
+    
+    Args:
+      features: 特征数组，形状为 (..., d)
+      
+    Returns:
+      (labels, confidence) 形状均为 features.shape[:-1]
+    """
+    shape = features.shape[:-1]
+    flat = features.reshape(-1, features.shape[-1])
+    
+    # |x-p|^2 = |x|^2 - 2x·p + |p|^2
+    distances = (
+      (flat * flat).sum(axis=1)[:, None]
+      - 2 * flat @ self.prototypes.T
+      + (self.prototypes * self.prototypes).sum(axis=1)[None, :]
+    )
+    distances = np.sqrt(np.maximum(distances, 0))
+    
+    if len(self.labels) == 1:
+      return np.full(shape, self.labels[0]), np.ones(shape, dtype=np.float32)
+    
+    order = np.argsort(distances, axis=1)[:, :2]
+    d = np.take_along_axis(distances, order, axis=1)
+    best = order[:, 0]
+    confidence = np.where(d[:, 1] > 0, 1 - d[:, 0] / np.maximum(d[:, 1], 1e-12), 0.0)
+    
+    return self.labels[best].reshape(shape), confidence.astype(np.float32).reshape(shape)
+  
+  def save(self, path):
+    """保存原型到磁盘"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, labels=self.labels, prototypes=self.prototypes,
+             feature_size=self.feature_size)
+  
+  @classmethod
+  def load(cls, path):
+    """
+    从磁盘加载原型
+    
+    Returns:
+      PrototypeClassifier实例，文件不存在或损坏时返回None
+    """
+    try:
+      with np.load(path) as data:
+        return cls(data['labels'], data['prototypes'], int(data['feature_size']))
+    except (OSError, KeyError, ValueError):
+      return None
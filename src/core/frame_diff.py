@@ -0,0 +1,75 @@
+"""
+帧差检测
+逐格比较相邻两帧棋盘图像，找出发生变化的格子，未变化的格子无需重新识别和求解
+"""
+
+import numpy as np
+
+from utils.constants import CacheConfig
+from utils.image_utils import cell_differences
+
+
+class FrameDiffer:
+  """帧差检测器类"""
+  
+  def __init__(self, threshold=CacheConfig.DIFF_THRESHOLD):
+    """
+    初始化检测器
+    
+    Args:
+      threshold: 格子内像素最大差值超过该值视为变化
+    """
+    self.threshold = threshold
+    self.previous = None   # 上一帧棋盘图像
+    self.layout = None     # 上一帧的 (rows, cols, cell_size)
+    self.frames = 0
+    self.unchanged_frames = 0
+  
+  def update(self, board_image, rows, cols, cell_size):
+    """
+    与上一帧比较并记录当前帧
+    
+    首帧或棋盘尺寸、格子大小变化时所有格子都视为变化
+    
+    Args:
+      board_image: 当前棋盘图像
+      rows: 行数
+      cols: 列数
+      cell_size: 格子大小
+      
+    Returns:
+      布尔数组，形状为 (rows, cols)，True表示格子发生变化
+    """
+    layout = (rows, cols, cell_size)
+    self.frames += 1
+    
+    if (self.previous is None or layout != self.layout
+        or self.previous.shape != board_image.shape):
+      dirty = np.ones((rows, cols), dtype=bool)
+    else:
+      diff = cell_differences(self.previous, board_image, rows, cols, cell_size)
+      dirty = diff > self.threshold
+      if not dirty.any():
+        self.unchanged_frames += 1
+        return dirty
+    
+    self.previous = board_image.copy()
+    self.layout = layout
+    return dirty
+  
+  def reset(self):
+    """清除上一帧，下一帧视为全部变化"""
+    self.previous = None
+    self.layout = None
+  
+  def get_stats(self):
+    """
+    获取统计信息
+    
+    Returns:
+      dict包含frames、unchanged_frames
+    """
+    return {
+      'frames': self.frames,
+      'unchanged_frames': self.unchanged_frames
+    }
@@ -0,0 +1,246 @@
+"""
+网格几何检测
+由棋盘图像的投影轮廓估计格子间距（亚像素）、网格原点偏移和行列数
+"""
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from utils.constants import GridConfig, TrackerConfig
+from utils.image_utils import border_signature
+
+
+def edge_profiles(gray):
+  """
+  计算横向和纵向的边缘投影轮廓
+  
+  Args:
+    gray: 灰度棋盘图像
+    
+  Returns:
+    (profile_x, profile_y) 每列/每行相邻像素差的绝对值之和，
+    第i个值对应像素i与i+1之间的边界
+  """
+  gray = gray.astype(np.int16)
+  profile_x = np.abs(np.diff(gray, axis=1)).sum(axis=0, dtype=np.float64)
+  profile_y = np.abs(np.diff(gray, axis=0)).sum(axis=1, dtype=np.float64)
+  return profile_x, profile_y
+
+
+def fit_period(profile, min_pitch=GridConfig.MIN_PITCH, max_pitch=GridConfig.MAX_PITCH,
+               step=GridConfig.PITCH_STEP):
+  """
+  拟合投影轮廓的周期和相位
+  
+  先用自相关找整数周期，再在其附近按傅里叶系数幅值做亚像素搜索，
+  相位由该系数的辐角得到
+  
+  Args:
+    profile: 边缘投影轮廓
+    min_pitch: 最小周期
+    max_pitch: 最大周期
+    step: 亚像素搜索步长
+    
+  Returns:
+    (pitch, offset, strength) 周期、第一条网格线的位置和周期性强度（0-1），
+    轮廓过短时返回None
+  """
+  signal = profile - profile.mean()
+  n = len(signal)
+  max_pitch = min(max_pitch, n // 2)
+  if max_pitch <= min_pitch or not signal.any():
+    return None
+  
+  # 有偏自相关随滞后线性衰减，接近最高峰的最小滞后即整数周期（避免选中周期的整数倍）
+  spectrum = np.fft.rfft(signal, 2 * n)
+  autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+  # 非整数周期的峰会分散到相邻两个滞后上，先做三点平滑再比较
+  smoothed = np.convolve(autocorr, np.ones(3), mode='same')
+  lags = np.arange(min_pitch, max_pitch + 1)
+  coarse = lags[np.argmax(smoothed[lags] >= 0.8 * smoothed[lags].max())]
+  
+  # 在整数周期附近由粗到细搜索使傅里叶系数幅值最大的亚像素周期
+  x = np.arange(n)
+  pitch, width = float(coarse), 1.0
+  for search_step in (step * 10, step):
+    pitches = np.arange(pitch - width, pitch + width + search_step / 2, search_step)
+    coefficients = np.exp(-2j * np.pi * x[None, :] / pitches[:, None]) @ signal
+    best = np.argmax(np.abs(coefficients))
+    pitch, coefficient = pitches[best], coefficients[best]
+    width = search_step
+  
+  # 取整后整张棋盘的累计偏差不超过SNAP_DRIFT时视为未缩放的棋盘，取整后重新计算系数
+  if abs(pitch - round(pitch)) * n / pitch <= GridConfig.SNAP_DRIFT:
+    pitch = float(round(pitch))
+    coefficient = np.exp(-2j * np.pi * x / pitch) @ signal
+  
+  # 轮廓第i个值对应像素i与i+1之间的边界，即网格线位于i+1
+  angle = np.angle(coefficient)
+  offset = (-angle / (2 * np.pi) * pitch + 1) % pitch
+  strength = np.abs(coefficient) / (np.abs(signal).sum() + 1e-12)
+  return pitch, offset, strength
+
+
+class GridGeometry:
+  """格子网格几何"""
+  
+  def __init__(self, rows, cols, pitch_x, pitch_y, offset_x, offset_y):
+    """
+    初始化网格几何
+    
+    Args:
+      rows: 行数
+      cols: 列数
+      pitch_x: 横向格子间距（像素，可为小数）
+      pitch_y: 纵向格子间距
+      offset_x: 第一列格子左边界的横坐标
+      offset_y: 第一行格子上边界的纵坐标
+    """
+    self.rows = rows
+    self.cols = cols
+    self.pitch_x = pitch_x
+    self.pitch_y = pitch_y
+    self.offset_x = offset_x
+    self.offset_y = offset_y
+  
+  @property
+  def cell_size(self):
+    """取整后的格子大小"""
+    return max(int(round(max(self.pitch_x, self.pitch_y))), 1)
+  
+  def cell_rect(self, row, col):
+    """
+    获取格子在原图中的区域
+    
+    Returns:
+      (x, y, w, h) 浮点坐标
+    """
+    return (self.offset_x + col * self.pitch_x, self.offset_y + row * self.pitch_y,
+            self.pitch_x, self.pitch_y)
+  
+  def grid_rect(self):
+    """
+    获取整个网格在原图中的区域
+    
+    Returns:
+      (x, y, w, h) 浮点坐标
+    """
+    return (self.offset_x, self.offset_y, self.cols * self.pitch_x, self.rows * self.pitch_y)
+  
+  def to_dict(self):
+    """
+    转换为dict
+    
+    Returns:
+      dict包含rows、cols、pitch_x、pitch_y、offset_x、offset_y
+    """
+    return {
+      'rows': self.rows,
+      'cols': self.cols,
+      'pitch_x': float(self.pitch_x),
+      'pitch_y': float(self.pitch_y),
+      'offset_x': float(self.offset_x),
+      'offset_y': float(self.offset_y)
+    }
+
+
+def _count_cells(extent, pitch, offset):
+  """
+  由图像长度、间距和网格原点推断格子数
+  
+  原点超过半个格子时视为前面还有一个被截断的边框，从0算起
+  """
+  if offset > pitch / 2:
+    offset -= pitch
+  return max(int(round((extent - max(offset, 0)) / pitch)), 1), max(offset, 0)
+
+
+def detect_grid(board_image, rows=None, cols=None):
+  """
+  检测棋盘图像的网格几何
+  
+  Args:
+    board_image: 棋盘图像（BGR或灰度）
+    rows: 可选的已知行数（给出时不再推断）
+    cols: 可选的已知列数
+    
+  Returns:
+    GridGeometry实例，未检测到明显的周期网格时返回None
+  """
+  gray = board_image
+  if board_image.ndim == 3:
+    gray = cv2.cvtColor(board_image, cv2.COLOR_BGR2GRAY)
+  h, w = gray.shape
+  
+  profile_x, profile_y = edge_profiles(gray)
+  fit_x = fit_period(profile_x)
+  fit_y = fit_period(profile_y)
+  if fit_x is None or fit_y is None:
+    return None
+  if min(fit_x[2], fit_y[2]) < GridConfig.MIN_STRENGTH:
+    return None
+  
+  pitch_x, offset_x, _ = fit_x
+  pitch_y, offset_y, _ = fit_y
+  inferred_cols, offset_x = _count_cells(w, pitch_x, offset_x)
+  inferred_rows, offset_y = _count_cells(h, pitch_y, offset_y)
+  
+  return GridGeometry(
+    rows or inferred_rows, cols or inferred_cols,
+    pitch_x, pitch_y, offset_x, offset_y
+  )
+
+
+class GridDetector:
+  """网格检测器类（按棋盘缓存检测结果）"""
+  
+  def __init__(self, max_size=GridConfig.CACHE_SIZE):
+    """
+    初始化检测器
+    
+    Args:
+      max_size: 最多缓存的棋盘数
+    """
+    self.max_size = max_size
+    self._cache = OrderedDict()   # 键 -> (外圈签名, GridGeometry)
+  
+  def detect(self, board_image, rows=None, cols=None, key=None):
+    """
+    检测网格几何，同一棋盘只检测一次
+    
+    缓存按 (键, 图像尺寸, 行列数) 查找，并保存棋盘外圈签名；
+    签名与当前图像不符时（同一位置或同样大小换成了另一个棋盘）重新检测
+    
+    Args:
+      board_image: 棋盘图像
+      rows: 可选的已知行数
+      cols: 可选的已知列数
+      key: 标识棋盘的键（如屏幕区域），为None时只按图像尺寸和签名区分
+      
+    Returns:
+      GridGeometry实例或None
+    """
+    cache_key = (key, board_image.shape[:2], rows, cols)
+    signature = border_signature(
+      board_image, TrackerConfig.BORDER_WIDTH, TrackerConfig.SIGNATURE_LENGTH
+    )
+    
+    entry = self._cache.get(cache_key)
+    if entry is not None:
+      difference = np.abs(signature - entry[0]).mean()
+      if difference <= TrackerConfig.SIGNATURE_THRESHOLD:
+        self._cache.move_to_end(cache_key)
+        return entry[1]
+    
+    geometry = detect_grid(board_image, rows, cols)
+    self._cache[cache_key] = (signature, geometry)
+    self._cache.move_to_end(cache_key)
+    while len(self._cache) > self.max_size:
+      self._cache.popitem(last=False)
+    return geometry
+  
+  def reset(self):
+    """清空缓存"""
+    self._cache.clear()
@@ -5,19 +5,40 @@
 
 import cv2
 import numpy as np
-import pyautogui
-from PIL import Image, ImageDraw
+from PIL import Image
 
-from utils.constants import Colors, ImageConfig
-from utils.image_utils import detect_board_region, extract_board_region
+from core.capture_source import ScreenSource
+from core.cell_classifier import PrototypeClassifier, board_features, cache_path, cell_features
+from core.overlay_renderer import HintOverlayRenderer
+from core.recognition_cache import CellRecognitionCache
+from utils.constants import ClassifierConfig, ImageConfig
+from utils.image_utils import (
+  detect_board_region, downsample_cells, extract_board_region, split_cells
+)
 
 
 class ImageProcessor:
   """图像处理器类"""
   
-  def __init__(self):
+  def __init__(self, theme=ClassifierConfig.DEFAULT_THEME, use_cache=True, capture_source=None):
+    """
+    初始化图像处理器
+    
+    Args:
+      theme: 游戏主题名，用于区分校准原型缓存
+      use_cache: 是否启用格子识别缓存
+      capture_source: 可选的CaptureSource（图片、视频或内存帧），默认首次截图时创建ScreenSource
+    """
+    self.capture_source = capture_source
     self.screenshot = None
+    self.screenshot_id = 0         # 截图序号，每次成功截图加一
     self.board_region = None
+    self.theme = theme
+    self.classifier = None         # 已校准的原型分类器
+    self.classifier_cell_size = None
+    self.confidence = None         # 最近一次识别的置信度
+    self.cell_cache = CellRecognitionCache() if use_cache else None
+    self.overlay_renderer = HintOverlayRenderer()
   
   def capture_screenshot(self, region=None):
     """
@@ -27,10 +48,14 @@ class ImageProcessor:
       region: 可选的截图区域 (x, y, width, height)
       
     Returns:
-      numpy数组图像（BGR格式）
+      numpy数组图像（BGR格式），来源没有更多帧时返回None；
+      图像位于来源的帧缓冲区中，需要长期保存时请复制
     """
-    screenshot = pyautogui.screenshot(region=region)
-    self.screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+    if self.capture_source is None:
+      self.capture_source = ScreenSource()
+    self.screenshot = self.capture_source.grab(region)
+    if self.screenshot is not None:
+      self.screenshot_id += 1
     return self.screenshot
   
   def detect_board(self, image=None):
@@ -114,97 +139,199 @@ class ImageProcessor:
     
     return 0
   
-  def create_hint_overlay(self, image, safe_cells, mine_cells, board_region, cell_size):
+  def calibrate(self, board_image, labels, cell_size):
     """
-    创建提示覆盖层
+    用一张已知状态的棋盘图像学习各状态原型，并按主题和格子大小缓存到磁盘
     
     Args:
-      image: 原始图像（numpy数组）
-      safe_cells: 安全格子列表 [(row, col), ...]
-      mine_cells: 地雷格子列表 [(row, col), ...]
-      board_region: 棋盘区域 (x, y, w, h)
+      board_image: 棋盘图像
+      labels: 每个格子的真实状态，形状为 (rows, cols)
       cell_size: 格子大小
       
     Returns:
-      带提示的PIL Image对象
+      PrototypeClassifier实例
     """
-    # 转换为PIL图像
-    img = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-    overlay = Image.new('RGBA', img.size, (255, 255, 255, 0))
-    draw = ImageDraw.Draw(overlay)
+    labels = np.asarray(labels)
+    rows, cols = labels.shape
+    features = board_features(board_image, rows, cols, cell_size)
+    self.classifier = PrototypeClassifier().fit(
+      features.reshape(rows * cols, -1), labels.ravel()
+    )
+    self.classifier_cell_size = cell_size
+    self.classifier.save(cache_path(self.theme, cell_size))
+    return self.classifier
+  
+  def _ensure_classifier(self, cell_size):
+    """
+    格子大小变化时从缓存加载对应的校准原型
     
-    if not board_region:
-      return img
+    Returns:
+      是否有可用的分类器
+    """
+    if self.classifier_cell_size != cell_size:
+      self.classifier = PrototypeClassifier.load(cache_path(self.theme, cell_size))
+      self.classifier_cell_size = cell_size
+    return self.classifier is not None
+  
+  def recognize_board(self, board_image, rows, cols, cell_size, dirty=None, previous=None):
+    """
+    一次性识别整个棋盘
     
-    x_offset, y_offset = board_region[0], board_region[1]
+    先按格子像素的哈希查询识别缓存，只识别未命中的格子；
+    有校准原型时按最近原型分类并记录置信度，缓存键取自分类所用的缩小像素；
+    否则按颜色规则识别（与逐格调用recognize_cell一致），颜色规则看的是
+    原分辨率的饱和度和色调，缓存键也取自原分辨率像素
     
-    # 绘制安全格子
-    for row, col in safe_cells:
-      self._draw_safe_cell(draw, row, col, x_offset, y_offset, cell_size)
+    Args:
+      board_image: 棋盘图像
+      rows: 行数
+      cols: 列数
+      cell_size: 格子大小
+      dirty: 可选的变化格子掩码，与previous同时给出时只识别变化的格子
+      previous: 上一帧的识别结果
+      
+    Returns:
+      numpy数组，形状为 (rows, cols)
+    """
+    board_image = board_image[:rows * cell_size, :cols * cell_size]
+    classified = self._ensure_classifier(cell_size)
+    incremental = dirty is not None and previous is not None
     
-    # 绘制地雷格子
-    for row, col in mine_cells:
-      self._draw_mine_cell(draw, row, col, x_offset, y_offset, cell_size)
+    labels = np.zeros((rows, cols), dtype=int)
+    confidence = np.ones((rows, cols), dtype=np.float32) if classified else None
+    pending = np.ones((rows, cols), dtype=bool)
+    if incremental:
+      labels[:] = previous
+      pending = dirty.copy()
+      if classified and self.confidence is not None and self.confidence.shape == (rows, cols):
+        confidence[:] = self.confidence
     
-    # 合并图像
-    img = img.convert('RGBA')
-    result = Image.alpha_composite(img, overlay)
+    cells = split_cells(board_image, rows, cols, cell_size)
+    small = None
+    if classified:
+      small = downsample_cells(board_image, rows, cols, cell_size, ClassifierConfig.FEATURE_SIZE)
     
-    return result
+    if self.cell_cache is not None:
+      fingerprint = self.classifier.fingerprint if classified else None
+      self.cell_cache.set_context((self.theme, cell_size, fingerprint))
+      keys = self.cell_cache.hash_cells(small if classified else cells)
+      pending = self.cell_cache.lookup(keys, labels, confidence, pending)
+    
+    if pending.any():
+      scores = None
+      if classified:
+        found, scores = self.classifier.classify(cell_features(small[pending]))
+        confidence[pending] = scores
+      else:
+        found = self._recognize_cells(cells[pending])
+      labels[pending] = found
+      
+      if self.cell_cache is not None:
+        self.cell_cache.store(keys[pending], found, scores)
+    
+    self.confidence = confidence
+    return labels
   
-  def _draw_safe_cell(self, draw, row, col, x_offset, y_offset, cell_size):
-    """绘制安全格子标记"""
-    x = x_offset + col * cell_size
-    y = y_offset + row * cell_size
-    
-    # 绘制绿色边框
-    draw.rectangle(
-      [x, y, x + cell_size, y + cell_size],
-      outline=Colors.SAFE_COLOR,
-      width=4
-    )
+  def _recognize_cells(self, cells):
+    """
+    按颜色规则批量识别格子（与recognize_cell一致）
     
-    # 绘制勾号
-    center_x = x + cell_size // 2
-    center_y = y + cell_size // 2
-    size = cell_size // 4
+    所有格子横向拼成一张图，只做一次灰度和HSV转换
+    （cvtColor处理又高又窄的图像很慢，因此不竖向拼接）
     
-    draw.line(
-      [(center_x - size, center_y), (center_x, center_y + size)],
-      fill=Colors.SAFE_COLOR,
-      width=3
-    )
-    draw.line(
-      [(center_x, center_y + size), (center_x + size, center_y - size)],
-      fill=Colors.SAFE_COLOR,
-      width=3
+    Args:
+      cells: 格子数组，形状为 (n, h, w, 3)
+      
+    Returns:
+      状态数组，形状为 (n,)
+    """
+    n, h, w = cells.shape[:3]
+    strip = np.ascontiguousarray(cells.transpose(1, 0, 2, 3)).reshape(h, n * w, 3)
+    gray = cv2.cvtColor(strip, cv2.COLOR_BGR2GRAY).reshape(h, n, w)
+    brightness = gray.sum(axis=(0, 2), dtype=np.int64) / (h * w)
+    
+    labels = np.zeros(n, dtype=int)
+    labels[brightness > ImageConfig.BRIGHT_THRESHOLD] = -1
+    
+    candidates = (
+      (brightness >= ImageConfig.DARK_THRESHOLD)
+      & (brightness <= ImageConfig.BRIGHT_THRESHOLD)
     )
+    if candidates.any():
+      hsv = cv2.cvtColor(strip, cv2.COLOR_BGR2HSV).reshape(h, n, w, 3).transpose(1, 0, 2, 3)
+      labels[candidates] = self._detect_numbers(hsv[candidates])
+    
+    return labels
   
-  def _draw_mine_cell(self, draw, row, col, x_offset, y_offset, cell_size):
-    """绘制地雷格子标记"""
-    x = x_offset + col * cell_size
-    y = y_offset + row * cell_size
-    
-    # 绘制红色边框
-    draw.rectangle(
-      [x, y, x + cell_size, y + cell_size],
-      outline=Colors.MINE_COLOR,
-      width=4
-    )
+  def _detect_numbers(self, hsv_cells):
+    """
+    批量检测格子中的数字（与_detect_number规则一致）
     
-    # 绘制X号
-    center_x = x + cell_size // 2
-    center_y = y + cell_size // 2
-    size = cell_size // 4
+    Args:
+      hsv_cells: HSV格子数组，形状为 (n, h, w, 3)
+      
+    Returns:
+      数字数组，形状为 (n,)
+    """
+    n = len(hsv_cells)
+    saturation = hsv_cells[..., 1].reshape(n, -1).max(axis=1)
     
-    draw.line(
-      [(center_x - size, center_y - size), (center_x + size, center_y + size)],
-      fill=Colors.MINE_COLOR,
-      width=3
+    # 非零色调的中位数：按格子统计色调直方图，在累计计数上取中间的两个秩
+    hue = hsv_cells[..., 0].reshape(n, -1)
+    offsets = np.arange(n)[:, None] * 256
+    histogram = np.bincount((hue + offsets).ravel(), minlength=n * 256).reshape(n, 256)
+    histogram[:, 0] = 0
+    valid = histogram.sum(axis=1)
+    cumulative = histogram.cumsum(axis=1)
+    lower = np.argmax(cumulative > ((valid - 1) // 2)[:, None], axis=1)
+    upper = np.argmax(cumulative > (valid // 2)[:, None], axis=1)
+    dominant_hue = np.where(valid > 0, (lower + upper) / 2, np.nan)
+    
+    numbers = np.zeros(n, dtype=int)
+    numbers[(100 < dominant_hue) & (dominant_hue < 130)] = 1
+    numbers[(40 < dominant_hue) & (dominant_hue < 80)] = 2
+    numbers[(dominant_hue > 160) | (dominant_hue < 10)] = 3
+    numbers[saturation < ImageConfig.COLOR_SATURATION] = 0
+    return numbers
+  
+  def render_hint_overlay(self, image, safe_cells, mine_cells, board_region, cell_size,
+                          frame_id=None):
+    """
+    渲染提示覆盖层（不复制）
+    
+    同一帧重复调用时复用已转换的底图，只重绘提示格子；
+    image为None时使用最近一次截图及其序号
+    
+    Args:
+      image: 原始图像（numpy数组），为None时使用self.screenshot
+      safe_cells: 安全格子列表 [(row, col), ...]
+      mine_cells: 地雷格子列表 [(row, col), ...]
+      board_region: 棋盘区域 (x, y, w, h)
+      cell_size: 格子大小
+      frame_id: 可选的帧序号（如screenshot_id），不给出时每次重新转换底图
+      
+    Returns:
+      RGBA numpy数组（渲染器内部缓冲区，下次调用时会被修改，需要保留时自行复制）
+    """
+    if image is None:
+      image, frame_id = self.screenshot, self.screenshot_id
+    return self.overlay_renderer.render(
+      image, safe_cells, mine_cells, board_region, cell_size, frame_id
     )
-    draw.line(
-      [(center_x - size, center_y + size), (center_x + size, center_y - size)],
-      fill=Colors.MINE_COLOR,
-      width=3
+  
+  def create_hint_overlay(self, image, safe_cells, mine_cells, board_region, cell_size,
+                          frame_id=None):
+    """
+    创建提示覆盖层
+    
+    参数同render_hint_overlay
+    
+    Returns:
+      带提示的PIL Image对象（独立的副本；没有棋盘区域时为RGB原图）
+    """
+    canvas = self.render_hint_overlay(
+      image, safe_cells, mine_cells, board_region, cell_size, frame_id
     )
-
+    height, width = canvas.shape[:2]
+    result = Image.frombuffer('RGBA', (width, height), canvas, 'raw', 'RGBA', 0, 1)
+    return result.copy() if board_region else result.convert('RGB')
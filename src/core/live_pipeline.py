@@ -0,0 +1,303 @@
+"""
+实时分析流水线
+截图、识别、求解分别运行在独立的工作线程中（OpenCV运算期间会释放GIL），
+阶段之间用容量有限的队列连接，队列满时丢弃最旧的帧，保证始终处理最新画面；
+截图来源的帧缓冲区在识别完成（或帧被丢弃）之前保持持有，不会被后续截图覆盖
+"""
+
+import queue
+import threading
+import time
+
+from core.board_analyzer import BoardAnalyzer
+from core.board_tracker import BoardTracker
+from core.solver import MinesweeperSolver
+from utils.constants import PipelineConfig
+from utils.perf import LatencyStats
+
+
+class _SnapshotAnalyzer:
+  """包装某一帧识别结果的分析器（供求解线程使用，避免与识别线程共享状态）"""
+  
+  def __init__(self):
+    self.board = None
+    self.info = {}
+  
+  def get_board_state(self):
+    """获取棋盘状态"""
+    return self.board
+  
+  def get_board_info(self):
+    """获取棋盘信息"""
+    return self.info
+
+
+def put_latest(target, item, on_drop=None):
+  """
+  放入队列，队列已满时先丢弃最旧的元素
+  
+  Args:
+    target: queue.Queue实例
+    item: 要放入的元素
+    on_drop: 可选的回调，接收被丢弃的元素
+    
+  Returns:
+    被丢弃的元素数量
+  """
+  dropped = 0
+  while True:
+    try:
+      target.put_nowait(item)
+      return dropped
+    except queue.Full:
+      try:
+        old = target.get_nowait()
+      except queue.Empty:
+        continue
+      dropped += 1
+      if on_drop is not None:
+        on_drop(old)
+
+
+class LivePipeline:
+  """实时分析流水线类"""
+  
+  def __init__(self, image_processor, board_analyzer=None, capture=None,
+               target_fps=PipelineConfig.TARGET_FPS, solver_options=None):
+    """
+    初始化流水线
+    
+    Args:
+      image_processor: ImageProcessor实例
+      board_analyzer: 可选的BoardAnalyzer实例，默认新建一个
+      capture: 可选的截图函数，返回棋盘图像或None；默认用BoardTracker只截取棋盘区域
+      target_fps: 目标截图帧率
+      solver_options: 传给MinesweeperSolver的额外参数（如backend、opening_book）
+    """
+    self.image_processor = image_processor
+    self.board_analyzer = board_analyzer or BoardAnalyzer(image_processor)
+    self.capture = capture or BoardTracker(image_processor).capture
+    self.target_fps = target_fps
+    
+    self.snapshot = _SnapshotAnalyzer()
+    self.solver = MinesweeperSolver(self.snapshot, **(solver_options or {}))
+    
+    self.frames = queue.Queue(maxsize=PipelineConfig.QUEUE_SIZE)
+    self.boards = queue.Queue(maxsize=PipelineConfig.QUEUE_SIZE)
+    self.subscribers = []
+    self.latest = None        # 最近发布的提示
+    
+    self.captured = 0
+    self.dropped = 0
+    self.processed = 0
+    self.unchanged = 0
+    self.errors = 0
+    self.capture_stats = LatencyStats('capture', PipelineConfig.LATENCY_SAMPLES)
+    self.analyze_stats = LatencyStats('analyze', PipelineConfig.LATENCY_SAMPLES)
+    self.solve_stats = LatencyStats('solve', PipelineConfig.LATENCY_SAMPLES)
+    self.latency_stats = LatencyStats('latency', PipelineConfig.LATENCY_SAMPLES)
+    
+    self._lock = threading.Lock()
+    self._stop = threading.Event()
+    self._threads = []
+    self._started_at = None
+  
+  def subscribe(self, callback):
+    """
+    订阅提示结果
+    
+    回调在求解线程中调用，GUI订阅者需自行转发到界面线程
+    
+    Args:
+      callback: 接收结果dict的函数
+    """
+    with self._lock:
+      self.subscribers.append(callback)
+  
+  def unsubscribe(self, callback):
+    """取消订阅"""
+    with self._lock:
+      if callback in self.subscribers:
+        self.subscribers.remove(callback)
+  
+  def start(self):
+    """启动各阶段线程"""
+    if self.is_running():
+      return
+    self._stop.clear()
+    self._started_at = time.perf_counter()
+    self._threads = [
+      threading.Thread(target=self._capture_loop, name='pipeline-capture', daemon=True),
+      threading.Thread(target=self._analyze_loop, name='pipeline-analyze', daemon=True),
+      threading.Thread(target=self._solve_loop, name='pipeline-solve', daemon=True)
+    ]
+    for thread in self._threads:
+      thread.start()
+  
+  def stop(self):
+    """停止各阶段线程并等待退出"""
+    self._stop.set()
+    for thread in self._threads:
+      thread.join(PipelineConfig.STOP_TIMEOUT)
+    self._threads = []
+    
+    # 释放仍在队列中的帧
+    while True:
+      try:
+        self._release(self.frames.get_nowait())
+      except queue.Empty:
+        break
+  
+  def is_running(self):
+    """
+    流水线是否在运行
+    
+    Returns:
+      布尔值
+    """
+    return any(thread.is_alive() for thread in self._threads)
+  
+  def _capture_loop(self):
+    """截图阶段：按目标帧率截取棋盘图像"""
+    interval = 1.0 / self.target_fps if self.target_fps else 0.0
+    next_tick = time.perf_counter()
+    
+    while not self._stop.is_set():
+      captured_at = time.perf_counter()
+      try:
+        board_image = self.capture()
+      except Exception as e:
+        print(f"截图失败: {e}")
+        self.errors += 1
+        board_image = None
+      self.capture_stats.record(time.perf_counter() - captured_at)
+      
+      if board_image is not None:
+        self.captured += 1
+        frame = {
+          'index': self.captured,
+          'captured_at': captured_at,
+          'image': board_image,
+          'source': self._hold(board_image)
+        }
+        self.dropped += put_latest(self.frames, frame, self._release)
+      
+      next_tick = max(next_tick + interval, time.perf_counter())
+      self._stop.wait(next_tick - time.perf_counter())
+  
+  def _hold(self, image):
+    """
+    持有截图所在的帧缓冲区，直到识别阶段用完
+    
+    Returns:
+      持有缓冲区的截图来源，截图不属于任何来源的缓冲区时返回None
+    """
+    source = self.image_processor.capture_source
+    if source is not None and source.hold(image):
+      return source
+    return None
+  
+  def _release(self, frame):
+    """释放帧所在的缓冲区"""
+    if frame['source'] is not None:
+      frame['source'].release(frame['image'])
+  
+  def _analyze_loop(self):
+    """识别阶段：只识别变化的格子，棋盘未变化时不进入求解阶段"""
+    while not self._stop.is_set():
+      try:
+        frame = self.frames.get(timeout=0.1)
+      except queue.Empty:
+        continue
+      
+      self.analyze_stats.start()
+      try:
+        board = self.board_analyzer.analyze(frame['image'])
+      except Exception as e:
+        print(f"识别失败: {e}")
+        self.errors += 1
+        board = None
+      finally:
+        self._release(frame)
+      self.analyze_stats.stop()
+      
+      if board is None:
+        continue
+      if not self.board_analyzer.changed:
+        # 画面未变化，沿用上次的提示
+        self.unchanged += 1
+        self.latency_stats.record(time.perf_counter() - frame['captured_at'])
+        continue
+      
+      self.dropped += put_latest(self.boards, {
+        'index': frame['index'],
+        'captured_at': frame['captured_at'],
+        'board': board.copy(),
+        'info': self.board_analyzer.get_board_info()
+      })
+  
+  def _solve_loop(self):
+    """求解阶段：求解并发布提示"""
+    while not self._stop.is_set():
+      try:
+        item = self.boards.get(timeout=0.1)
+      except queue.Empty:
+        continue
+      
+      self.snapshot.board = item['board']
+      self.snapshot.info = item['info']
+      self.solve_stats.start()
+      try:
+        safe_cells, mine_cells = self.solver.solve()
+      except Exception as e:
+        print(f"求解失败: {e}")
+        self.errors += 1
+        self.solve_stats.stop()
+        continue
+      self.solve_stats.stop()
+      
+      latency = time.perf_counter() - item['captured_at']
+      self.latency_stats.record(latency)
+      self.processed += 1
+      
+      result = {
+        'index': item['index'],
+        'board': item['board'],
+        'safe_cells': list(safe_cells),
+        'mine_cells': list(mine_cells),
+        'reasons': self.solver.get_reasons(),
+        'latency_ms': latency * 1000
+      }
+      self.latest = result
+      self._publish(result)
+  
+  def _publish(self, result):
+    """通知所有订阅者"""
+    with self._lock:
+      subscribers = list(self.subscribers)
+    for callback in subscribers:
+      try:
+        callback(result)
+      except Exception as e:
+        print(f"提示订阅者出错: {e}")
+  
+  def get_stats(self):
+    """
+    获取流水线统计
+    
+    Returns:
+      dict包含各阶段计数、实际帧率、各阶段耗时和端到端延迟摘要
+    """
+    elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+    return {
+      'captured': self.captured,
+      'dropped': self.dropped,
+      'processed': self.processed,
+      'unchanged': self.unchanged,
+      'errors': self.errors,
+      'capture_fps': self.captured / elapsed if elapsed > 0 else 0.0,
+      'capture': self.capture_stats.summary(),
+      'analyze': self.analyze_stats.summary(),
+      'solve': self.solve_stats.summary(),
+      'latency': self.latency_stats.summary()
+    }
@@ -21,7 +21,8 @@ class Cell:
 class MinesweeperGame:
   """扫雷游戏类"""
   
-  def __init__(self, rows: int = 9, cols: int = 9, mines: int = 10):
+  def __init__(self, rows: int = 9, cols: int = 9, mines: int = 10,
+               no_guess: bool = False):
     """
     初始化游戏
     
@@ -29,10 +30,12 @@ class MinesweeperGame:
       rows: 行数
       cols: 列数
       mines: 地雷数量
+      no_guess: 是否生成无需猜测即可完成的棋盘
     """
     self.rows = rows
     self.cols = cols
     self.total_mines = mines
+    self.no_guess = no_guess
     self.board: List[List[Cell]] = []
     self.game_over = False
     self.game_won = False
@@ -66,9 +69,34 @@ class MinesweeperGame:
       return
     
     self.first_click = False
-    self._place_mines(first_row, first_col)
+    if not (self.no_guess and self._place_no_guess_mines(first_row, first_col)):
+      self._place_mines(first_row, first_col)
     self._calculate_adjacent_mines()
   
+  def _place_no_guess_mines(self, first_row: int, first_col: int) -> bool:
+    """
+    放置无猜地雷布局
+    
+    Args:
+      first_row: 第一次点击的行
+      first_col: 第一次点击的列
+      
+    Returns:
+      True表示成功，False表示生成失败（回退到随机布雷）
+    """
+    from core.no_guess_generator import generate_no_guess_layout
+    
+    layout = generate_no_guess_layout(
+      self.rows, self.cols, self.total_mines, first_row, first_col
+    )
+    if layout is None:
+      return False
+    
+    for i in range(self.rows):
+      for j in range(self.cols):
+        self.board[i][j].is_mine = bool(layout[i, j])
+    return True
+  
   def _place_mines(self, safe_row: int, safe_col: int):
     """
     放置地雷（确保第一次点击的位置及其周围是安全的）
@@ -251,6 +279,36 @@ class MinesweeperGame:
     
     return state
   
+  def get_mine_layout(self):
+    """
+    获取地雷布局
+    
+    Returns:
+      布尔数组，True表示地雷
+    """
+    import numpy as np
+    return np.array(
+      [[cell.is_mine for cell in row] for row in self.board],
+      dtype=bool
+    )
+  
+  def load_mine_layout(self, layout):
+    """
+    载入指定的地雷布局（代替首次点击时的随机布雷）
+    
+    Args:
+      layout: 布尔数组，形状为 (rows, cols)，True表示地雷
+    """
+    self.reset()
+    self.first_click = False
+    self.total_mines = 0
+    for i in range(self.rows):
+      for j in range(self.cols):
+        if layout[i][j]:
+          self.board[i][j].is_mine = True
+          self.total_mines += 1
+    self._calculate_adjacent_mines()
+  
   def reset(self):
     """重置游戏"""
     self.game_over = False
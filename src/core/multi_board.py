@@ -0,0 +1,225 @@
+"""
+多棋盘分析
+同一张截图中并排的多个游戏窗口各自维护棋盘区域、网格几何和识别状态，
+识别和求解在线程池中对所有棋盘并行执行
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core.board_analyzer import BoardAnalyzer
+from core.image_processor import ImageProcessor
+from core.solver import MinesweeperSolver
+from utils.constants import ClassifierConfig, ImageConfig, MultiBoardConfig, TrackerConfig
+from utils.image_utils import border_signature, detect_board_regions
+
+
+def region_iou(a, b):
+  """
+  计算两个矩形的交并比
+  
+  Args:
+    a: (x, y, w, h)
+    b: (x, y, w, h)
+    
+  Returns:
+    0到1之间的浮点数
+  """
+  w = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+  h = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+  if w <= 0 or h <= 0:
+    return 0.0
+  inter = w * h
+  return inter / (a[2] * a[3] + b[2] * b[3] - inter)
+
+
+class BoardSession:
+  """单个棋盘的分析状态"""
+  
+  def __init__(self, region, theme=ClassifierConfig.DEFAULT_THEME):
+    """
+    初始化棋盘状态
+    
+    Args:
+      region: 棋盘在截图中的区域 (x, y, w, h)
+      theme: 游戏主题名
+    """
+    self.image_processor = ImageProcessor(theme)
+    self.board_analyzer = BoardAnalyzer(self.image_processor)
+    self.solver = MinesweeperSolver(self.board_analyzer)
+    self.signature = None
+    self.set_region(region)
+  
+  def set_region(self, region):
+    """更新棋盘区域（网格检测按区域缓存）"""
+    self.region = tuple(region)
+    self.image_processor.board_region = self.region
+  
+  def crop(self, screenshot):
+    """
+    从截图中截取棋盘图像
+    
+    Returns:
+      棋盘图像，区域超出截图时返回None
+    """
+    x, y, w, h = self.region
+    board_image = screenshot[y:y + h, x:x + w]
+    if board_image.shape[:2] != (h, w):
+      return None
+    return board_image
+  
+  def matches(self, screenshot):
+    """
+    用外圈签名校验棋盘是否仍在原区域
+    
+    Returns:
+      是否匹配
+    """
+    board_image = self.crop(screenshot)
+    if board_image is None or self.signature is None:
+      return False
+    signature = border_signature(
+      board_image, TrackerConfig.BORDER_WIDTH, TrackerConfig.SIGNATURE_LENGTH
+    )
+    return np.abs(signature - self.signature).mean() <= TrackerConfig.SIGNATURE_THRESHOLD
+  
+  def analyze(self, screenshot):
+    """
+    识别并求解棋盘
+    
+    Returns:
+      结果dict，包含region、board、safe_cells、mine_cells、changed；区域无效时返回None
+    """
+    board_image = self.crop(screenshot)
+    if board_image is None:
+      return None
+    
+    self.signature = border_signature(
+      board_image, TrackerConfig.BORDER_WIDTH, TrackerConfig.SIGNATURE_LENGTH
+    )
+    board = self.board_analyzer.analyze(board_image)
+    if board is None:
+      return None
+    
+    safe_cells, mine_cells = self.solver.solve()
+    return {
+      'region': self.region,
+      'board': board,
+      'safe_cells': safe_cells,
+      'mine_cells': mine_cells,
+      'changed': self.board_analyzer.changed,
+      'board_info': self.board_analyzer.get_board_info()
+    }
+
+
+class MultiBoardAnalyzer:
+  """多棋盘分析器类"""
+  
+  def __init__(self, image_processor=None, theme=ClassifierConfig.DEFAULT_THEME,
+               max_boards=MultiBoardConfig.MAX_BOARDS, workers=None,
+               redetect_interval=MultiBoardConfig.REDETECT_INTERVAL):
+    """
+    初始化多棋盘分析器
+    
+    Args:
+      image_processor: 用于截图的ImageProcessor实例（传入截图时可为None）
+      theme: 游戏主题名
+      max_boards: 每张截图最多分析的棋盘数
+      workers: 线程池大小（None表示min(max_boards, CPU核数)）
+      redetect_interval: 已知棋盘都匹配时每隔多少帧仍重新检测一次，0表示不定期检测
+    """
+    self.image_processor = image_processor
+    self.theme = theme
+    self.max_boards = max_boards
+    self.redetect_interval = redetect_interval
+    self.sessions = []
+    self.detections = 0
+    self.frames_since_detect = 0
+    self.executor = ThreadPoolExecutor(
+      max_workers=workers or min(max_boards, os.cpu_count() or 1),
+      thread_name_prefix='board'
+    )
+  
+  def detect(self, screenshot):
+    """
+    检测截图中的所有棋盘，与已有棋盘按区域重叠匹配，匹配上的沿用其识别状态
+    
+    Args:
+      screenshot: 截图（BGR格式）
+      
+    Returns:
+      棋盘区域列表
+    """
+    self.detections += 1
+    self.frames_since_detect = 0
+    regions = detect_board_regions(screenshot, ImageConfig.MIN_BOARD_SIZE, self.max_boards)
+    
+    remaining = list(self.sessions)
+    sessions = []
+    for region in regions:
+      best = max(remaining, key=lambda s: region_iou(s.region, region), default=None)
+      if best is not None and region_iou(best.region, region) >= MultiBoardConfig.MATCH_IOU:
+        remaining.remove(best)
+        best.set_region(region)
+        sessions.append(best)
+      else:
+        sessions.append(BoardSession(region, self.theme))
+    
+    self.sessions = sessions
+    return regions
+  
+  def analyze(self, screenshot=None):
+    """
+    分析截图中的所有棋盘
+    
+    所有已知棋盘的外圈签名都匹配时沿用缓存区域，否则重新检测；
+    签名一直匹配时也每隔redetect_interval帧重新检测一次，以发现新打开的棋盘；
+    各棋盘的识别和求解在线程池中并行执行
+    
+    Args:
+      screenshot: 可选的截图，为None时用image_processor截取全屏
+      
+    Returns:
+      每个棋盘的结果dict列表（按从左到右排序）
+    """
+    if screenshot is None:
+      screenshot = self.image_processor.capture_screenshot()
+      if screenshot is None:
+        return []
+    
+    self.frames_since_detect += 1
+    due = self.redetect_interval and self.frames_since_detect >= self.redetect_interval
+    if due or not self.sessions or not all(session.matches(screenshot) for session in self.sessions):
+      self.detect(screenshot)
+    
+    futures = [self.executor.submit(session.analyze, screenshot) for session in self.sessions]
+    results = []
+    for future in futures:
+      try:
+        result = future.result()
+      except Exception as e:
+        print(f"棋盘分析失败: {e}")
+        continue
+      if result is not None:
+        results.append(result)
+    return results
+  
+  def reset(self):
+    """清除所有棋盘状态，下一帧重新检测"""
+    self.sessions = []
+    self.frames_since_detect = 0
+  
+  def close(self):
+    """关闭线程池"""
+    self.executor.shutdown(wait=True)
+  
+  def get_stats(self):
+    """
+    获取统计信息
+    
+    Returns:
+      dict包含boards、detections
+    """
+    return {'boards': len(self.sessions), 'detections': self.detections}
@@ -0,0 +1,101 @@
+"""
+无猜棋盘生成器
+随机布雷后用逻辑推理从首次点击开始求解；卡住时把前沿附近的一个雷挪到远离已翻开区域的位置，
+并在当前局面上继续推理（复用已有的翻开/标记状态），全部翻开后再从头校验一次
+"""
+
+import numpy as np
+
+from core.batch_solver import spread
+from core.board_metrics import (
+  prepare_layout, random_layouts, reveal_cells, solve_without_guessing, sweep
+)
+from utils.constants import GeneratorConfig
+from utils.perf import LatencyStats
+
+
+# 无猜布局生成耗时统计
+generation_stats = LatencyStats('no_guess_generation')
+
+
+def _repair(layout, revealed, flagged, protected, rng):
+  """
+  把一个未标记的前沿雷挪到远离已翻开区域的位置
+  
+  Returns:
+    是否成功挪动
+  """
+  near = spread(revealed[None])[0] & ~revealed
+  sources = np.flatnonzero((near & layout & ~flagged).ravel())
+  targets = np.flatnonzero((~layout & ~revealed & ~near & ~protected).ravel())
+  if len(sources) == 0 or len(targets) == 0:
+    return False
+  
+  layout.flat[rng.choice(sources)] = False
+  layout.flat[rng.choice(targets)] = True
+  return True
+
+
+def _try_layout(layout, first_row, first_col, protected, rng):
+  """
+  对一个随机布局反复修复直到可无猜完成
+  
+  Returns:
+    是否成功（layout被原地修改）
+  """
+  rows, cols = layout.shape
+  counts, zero, labels = prepare_layout(layout)
+  revealed = np.zeros((rows, cols), dtype=bool)
+  flagged = np.zeros((rows, cols), dtype=bool)
+  revealed[first_row, first_col] = True
+  reveal_cells(revealed.copy(), revealed, zero, labels)
+  
+  for _ in range(GeneratorConfig.MAX_REPAIRS):
+    sweep(counts, zero, labels, revealed, flagged)
+    
+    if (revealed | layout).all():
+      # 修复过程中早先的推理可能已失效，从头校验；失败时从校验卡住的局面继续修复
+      solved, revealed = solve_without_guessing(layout, first_row, first_col)
+      if solved:
+        return True
+      flagged = np.zeros((rows, cols), dtype=bool)
+      sweep(counts, zero, labels, revealed, flagged)
+    
+    if not _repair(layout, revealed, flagged, protected, rng):
+      return False
+    
+    # 挪走雷后已翻开的格子可能变成空白格子，需要连锁翻开
+    counts, zero, labels = prepare_layout(layout)
+    reveal_cells(revealed.copy(), revealed, zero, labels)
+  
+  return False
+
+
+def generate_no_guess_layout(rows, cols, mines, first_row, first_col, rng=None):
+  """
+  生成从首次点击开始无需猜测即可完成的地雷布局
+  
+  Args:
+    rows: 行数
+    cols: 列数
+    mines: 地雷数量
+    first_row: 首次点击的行
+    first_col: 首次点击的列
+    rng: 可选的numpy随机数生成器
+    
+  Returns:
+    布尔数组，形状为 (rows, cols)；多次尝试仍失败时返回None
+  """
+  rng = rng or np.random.default_rng()
+  protected = np.zeros((rows, cols), dtype=bool)
+  protected[max(first_row - 1, 0):first_row + 2, max(first_col - 1, 0):first_col + 2] = True
+  
+  generation_stats.start()
+  for _ in range(GeneratorConfig.MAX_RESTARTS):
+    layout = random_layouts(1, rows, cols, mines, first_row, first_col, rng)[0]
+    if _try_layout(layout, first_row, first_col, protected, rng):
+      generation_stats.stop()
+      return layout
+  
+  generation_stats.stop()
+  return None
@@ -0,0 +1,282 @@
+"""
+离线批量分析
+把截图目录或录像逐帧送入棋盘检测、识别和求解，在进程池中并行处理，
+棋盘上没有格子变化的帧直接跳过，结果按帧顺序写成JSONL
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from core.board_analyzer import BoardAnalyzer
+from core.frame_diff import FrameDiffer
+from core.grid_detector import GridDetector
+from core.image_processor import ImageProcessor
+from core.solver import MinesweeperSolver
+from utils.constants import ImageConfig, OfflineConfig, TrackerConfig
+from utils.image_utils import (
+  border_signature, detect_board_region, detect_board_region_scaled, normalize_board
+)
+
+
+def iter_frames(source, step=1):
+  """
+  逐帧读取截图目录或录像
+  
+  Args:
+    source: 图片目录或视频文件路径
+    step: 每隔step帧取一帧
+    
+  Yields:
+    (index, timestamp, frame) 帧序号、时间戳（秒；图片目录为序号）和BGR图像
+  """
+  source = Path(source)
+  if source.is_dir():
+    paths = sorted(
+      path for path in source.iterdir() if path.suffix.lower() in OfflineConfig.IMAGE_SUFFIXES
+    )
+    for index, path in enumerate(paths[::step]):
+      frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+      if frame is not None:
+        yield index * step, float(index * step), frame
+    return
+  
+  capture = cv2.VideoCapture(str(source))
+  if not capture.isOpened():
+    raise ValueError(f"无法打开视频: {source}")
+  try:
+    index = 0
+    while True:
+      if index % step == 0:
+        ok, frame = capture.read()
+        if not ok:
+          break
+        yield index, capture.get(cv2.CAP_PROP_POS_MSEC) / 1000, frame
+      elif not capture.grab():
+        break
+      index += 1
+  finally:
+    capture.release()
+
+
+class BoardLocator:
+  """定位帧中的棋盘，外圈签名不变时沿用上次的区域"""
+  
+  def __init__(self):
+    self.region = None
+    self.signature = None
+  
+  def locate(self, frame):
+    """
+    定位棋盘，外圈签名与上次一致时沿用缓存的区域
+    
+    Returns:
+      (x, y, w, h) 棋盘区域，未检测到时返回None
+    """
+    if self.region is not None:
+      x, y, w, h = self.region
+      board_image = frame[y:y + h, x:x + w]
+      if board_image.shape[:2] == (h, w):
+        signature = border_signature(
+          board_image, TrackerConfig.BORDER_WIDTH, TrackerConfig.SIGNATURE_LENGTH
+        )
+        if np.abs(signature - self.signature).mean() <= TrackerConfig.SIGNATURE_THRESHOLD:
+          return self.region
+    
+    # 缩小图上的粗定位对压缩噪声较敏感，失败时按原分辨率再检测一次
+    self.region = detect_board_region_scaled(
+      frame, ImageConfig.MIN_BOARD_SIZE, TrackerConfig.DETECT_SCALE, TrackerConfig.REFINE_PADDING
+    ) or detect_board_region(frame, ImageConfig.MIN_BOARD_SIZE)
+    if self.region is not None:
+      x, y, w, h = self.region
+      self.signature = border_signature(
+        frame[y:y + h, x:x + w], TrackerConfig.BORDER_WIDTH, TrackerConfig.SIGNATURE_LENGTH
+      )
+    return self.region
+
+
+class ChangeDetector:
+  """
+  判断帧中的棋盘是否有格子变化
+  
+  与BoardAnalyzer相同，把网格区域缩放为每格CANONICAL_CELL_SIZE像素后逐格比较，
+  单个格子的变化（新标记、翻开的空白格）不会被整帧缩略图平均掉
+  """
+  
+  def __init__(self):
+    self.locator = BoardLocator()
+    self.grid_detector = GridDetector()
+    self.frame_differ = FrameDiffer()
+    self.region = None
+  
+  def changed(self, frame):
+    """
+    与上一个有变化的帧比较
+    
+    Returns:
+      有格子变化、首次出现棋盘或无法定位棋盘和网格时返回True
+    """
+    region = self.locator.locate(frame)
+    if region != self.region:
+      self.frame_differ.reset()
+      self.region = region
+    if region is None:
+      return True
+    
+    x, y, w, h = region
+    board_image = frame[y:y + h, x:x + w]
+    geometry = self.grid_detector.detect(board_image, key=region)
+    if geometry is None:
+      self.frame_differ.reset()
+      return True
+    
+    size = ImageConfig.CANONICAL_CELL_SIZE
+    board_image = normalize_board(
+      board_image, geometry.rows, geometry.cols, size, geometry.grid_rect()
+    )
+    return bool(self.frame_differ.update(board_image, geometry.rows, geometry.cols, size).any())
+
+
+def iter_changed_frames(frames, stats):
+  """
+  跳过棋盘上没有格子变化的帧
+  
+  Args:
+    frames: iter_frames产生的帧
+    stats: 统计dict（原地累加read和skipped）
+    
+  Yields:
+    棋盘发生变化的帧
+  """
+  detector = ChangeDetector()
+  for item in frames:
+    stats['read'] += 1
+    if not detector.changed(item[2]):
+      stats['skipped'] += 1
+      continue
+    yield item
+
+
+class FrameWorker:
+  """单个工作进程内的分析状态（缓存棋盘区域、网格几何和识别结果）"""
+  
+  def __init__(self):
+    self.image_processor = ImageProcessor()
+    self.board_analyzer = BoardAnalyzer(self.image_processor)
+    self.solver = MinesweeperSolver(self.board_analyzer)
+    self.locator = BoardLocator()
+  
+  def analyze(self, index, timestamp, frame):
+    """
+    检测、识别并求解一帧
+    
+    Returns:
+      结果dict，未检测到棋盘时返回None
+    """
+    region = self.locator.locate(frame)
+    if region is None:
+      return None
+    
+    # 网格检测按棋盘区域缓存
+    self.image_processor.board_region = region
+    x, y, w, h = region
+    board = self.board_analyzer.analyze(frame[y:y + h, x:x + w])
+    if board is None:
+      return None
+    
+    safe_cells, mine_cells = self.solver.solve()
+    return {
+      'frame': index,
+      'timestamp': timestamp,
+      'region': list(region),
+      'rows': int(board.shape[0]),
+      'cols': int(board.shape[1]),
+      'board': board.tolist(),
+      'safe_cells': [list(cell) for cell in safe_cells],
+      'mine_cells': [list(cell) for cell in mine_cells]
+    }
+
+
+_worker = None
+
+
+def _init_worker():
+  """进程池初始化：每个工作进程创建一个FrameWorker"""
+  global _worker
+  _worker = FrameWorker()
+
+
+def _analyze_frame(index, timestamp, frame):
+  """在工作进程中分析一帧"""
+  return _worker.analyze(index, timestamp, frame)
+
+
+def analyze_source(source, output, workers=None, step=1):
+  """
+  离线分析截图目录或录像，结果写入JSONL
+  
+  连续多帧识别出相同棋盘时只写第一帧
+  
+  Args:
+    source: 图片目录或视频文件路径
+    output: JSONL输出路径
+    workers: 进程池大小（None表示CPU核数）
+    step: 每隔step帧取一帧
+    
+  Returns:
+    统计dict，包含read、skipped、analyzed、undetected、written、frames_per_sec、elapsed
+  """
+  workers = workers or os.cpu_count() or 1
+  stats = {'read': 0, 'skipped': 0, 'analyzed': 0, 'undetected': 0, 'written': 0}
+  start = time.perf_counter()
+  
+  frames = iter_changed_frames(iter_frames(source, step), stats)
+  max_in_flight = workers * OfflineConfig.IN_FLIGHT_PER_WORKER
+  finished = {}
+  next_order = 0
+  last_board = None
+  
+  with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool, \
+      open(output, 'w', encoding='utf-8') as f:
+    in_flight = {}
+    order = 0
+    exhausted = False
+    
+    while in_flight or not exhausted:
+      while not exhausted and len(in_flight) < max_in_flight:
+        item = next(frames, None)
+        if item is None:
+          exhausted = True
+          break
+        in_flight[pool.submit(_analyze_frame, *item)] = order
+        order += 1
+      if not in_flight:
+        break
+      
+      done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+      for future in done:
+        finished[in_flight.pop(future)] = future.result()
+      
+      # 按帧顺序写出，跳过与上一条相同的棋盘
+      while next_order in finished:
+        result = finished.pop(next_order)
+        next_order += 1
+        stats['analyzed'] += 1
+        if result is None:
+          stats['undetected'] += 1
+          continue
+        if result['board'] == last_board:
+          continue
+        last_board = result['board']
+        f.write(json.dumps(result, ensure_ascii=False) + '\n')
+        stats['written'] += 1
+  
+  elapsed = time.perf_counter() - start
+  stats['elapsed'] = elapsed
+  stats['frames_per_sec'] = stats['read'] / elapsed if elapsed > 0 else 0.0
+  return stats
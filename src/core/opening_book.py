@@ -0,0 +1,171 @@
+"""
+开局库
+离线用游戏引擎模拟首次点击，按 (rows, cols, mines) 保存最佳开局位置和开局概率表
+"""
+
+import json
+from pathlib import Path
+
+from core.minesweeper_game import MinesweeperGame
+from utils.constants import OpeningBookConfig
+
+
+# 默认开局库目录（项目根目录下）
+DEFAULT_BOOK_DIR = Path(__file__).resolve().parents[2] / OpeningBookConfig.DIRECTORY
+
+
+def book_filename(rows, cols, mines):
+  """
+  获取指定配置的开局库文件名
+  
+  Returns:
+    文件名字符串
+  """
+  return f'opening_{rows}x{cols}_{mines}.json'
+
+
+def _simulate_first_click(rows, cols, mines, row, col, samples, revealed_counts=None):
+  """
+  模拟在(row, col)首次点击的若干局
+  
+  Args:
+    revealed_counts: 可选的二维列表，累加每个格子被翻开的次数
+    
+  Returns:
+    平均翻开格子数
+  """
+  revealed = 0
+  for _ in range(samples):
+    game = MinesweeperGame(rows, cols, mines)
+    game.reveal(row, col)
+    revealed += game.revealed_count
+    if revealed_counts is not None:
+      for r in range(rows):
+        for c in range(cols):
+          if game.board[r][c].is_revealed:
+            revealed_counts[r][c] += 1
+  return revealed / samples
+
+
+def build_opening_entry(rows, cols, mines, samples=OpeningBookConfig.SAMPLES_PER_CELL):
+  """
+  用游戏引擎模拟首次点击，统计每个位置的开局效果
+  
+  游戏保证首次点击及其周围8格无雷，因此以平均翻开格子数衡量开局好坏；
+  棋盘关于水平、垂直方向对称，只模拟左上四分之一后镜像得到整张表
+  
+  Args:
+    rows: 行数
+    cols: 列数
+    mines: 地雷数量
+    samples: 每个位置的模拟局数
+    
+  Returns:
+    开局库条目dict
+  """
+  mean_revealed = [[0.0] * cols for _ in range(rows)]
+  
+  for row in range((rows + 1) // 2):
+    for col in range((cols + 1) // 2):
+      value = _simulate_first_click(rows, cols, mines, row, col, samples)
+      for r in {row, rows - 1 - row}:
+        for c in {col, cols - 1 - col}:
+          mean_revealed[r][c] = value
+  
+  ranked = sorted(
+    ((r, c) for r in range(rows) for c in range(cols)),
+    key=lambda pos: mean_revealed[pos[0]][pos[1]],
+    reverse=True
+  )
+  first_clicks = [
+    {'row': r, 'col': c, 'mean_revealed': mean_revealed[r][c]}
+    for r, c in ranked[:OpeningBookConfig.TOP_CLICKS]
+  ]
+  
+  # 最佳首次点击后每个格子已被翻开的概率
+  best_row, best_col = ranked[0]
+  revealed_counts = [[0] * cols for _ in range(rows)]
+  _simulate_first_click(rows, cols, mines, best_row, best_col, samples, revealed_counts)
+  reveal_probability = [[count / samples for count in line] for line in revealed_counts]
+  
+  return {
+    'rows': rows,
+    'cols': cols,
+    'mines': mines,
+    'samples': samples,
+    'first_clicks': first_clicks,
+    'mean_revealed': mean_revealed,
+    'reveal_probability': reveal_probability
+  }
+
+
+def save_opening_entry(entry, directory=DEFAULT_BOOK_DIR):
+  """
+  保存开局库条目到磁盘
+  
+  Args:
+    entry: build_opening_entry返回的条目
+    directory: 开局库目录
+    
+  Returns:
+    保存的文件路径
+  """
+  directory = Path(directory)
+  directory.mkdir(parents=True, exist_ok=True)
+  path = directory / book_filename(entry['rows'], entry['cols'], entry['mines'])
+  with open(path, 'w', encoding='utf-8') as f:
+    json.dump(entry, f, ensure_ascii=False)
+  return path
+
+
+class OpeningBook:
+  """开局库类（按需从磁盘加载）"""
+  
+  def __init__(self, directory=DEFAULT_BOOK_DIR):
+    """
+    初始化开局库
+    
+    Args:
+      directory: 开局库目录
+    """
+    self.directory = Path(directory)
+    self._entries = {}
+  
+  def get_entry(self, rows, cols, mines):
+    """
+    获取指定配置的开局库条目，首次访问时从磁盘加载
+    
+    Returns:
+      开局库条目dict，不存在时返回None
+    """
+    key = (rows, cols, mines)
+    if key not in self._entries:
+      path = self.directory / book_filename(rows, cols, mines)
+      try:
+        with open(path, encoding='utf-8') as f:
+          self._entries[key] = json.load(f)
+      except (OSError, ValueError):
+        self._entries[key] = None
+    return self._entries[key]
+  
+  def get_best_first_click(self, rows, cols, mines):
+    """
+    获取最佳首次点击位置
+    
+    Returns:
+      dict包含row、col、mean_revealed，不存在时返回None
+    """
+    entry = self.get_entry(rows, cols, mines)
+    if not entry or not entry['first_clicks']:
+      return None
+    return entry['first_clicks'][0]
+  
+  def get_reveal_probability(self, rows, cols, mines):
+    """
+    获取最佳首次点击后每个格子已被翻开的概率表
+    
+    Returns:
+      二维列表，不存在时返回None
+    """
+    entry = self.get_entry(rows, cols, mines)
+    return entry['reveal_probability'] if entry else None
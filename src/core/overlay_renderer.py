@@ -0,0 +1,153 @@
+"""
+提示覆盖层渲染
+缓存转换后的底图和每种格子大小的标记贴图，只在提示格子的矩形内原地混合，
+重复渲染同一帧时先从底图恢复上次改动的矩形，耗时只与提示数量有关
+"""
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
+
+from utils.constants import Colors
+
+
+def _draw_safe_mark(draw, x, y, cell_size):
+  """绘制安全格子标记（绿色边框和勾号）"""
+  draw.rectangle([x, y, x + cell_size, y + cell_size], outline=Colors.SAFE_COLOR, width=4)
+  center_x = x + cell_size // 2
+  center_y = y + cell_size // 2
+  size = cell_size // 4
+  draw.line([(center_x - size, center_y), (center_x, center_y + size)],
+            fill=Colors.SAFE_COLOR, width=3)
+  draw.line([(center_x, center_y + size), (center_x + size, center_y - size)],
+            fill=Colors.SAFE_COLOR, width=3)
+
+
+def _draw_mine_mark(draw, x, y, cell_size):
+  """绘制地雷格子标记（红色边框和X号）"""
+  draw.rectangle([x, y, x + cell_size, y + cell_size], outline=Colors.MINE_COLOR, width=4)
+  center_x = x + cell_size // 2
+  center_y = y + cell_size // 2
+  size = cell_size // 4
+  draw.line([(center_x - size, center_y - size), (center_x + size, center_y + size)],
+            fill=Colors.MINE_COLOR, width=3)
+  draw.line([(center_x - size, center_y + size), (center_x + size, center_y - size)],
+            fill=Colors.MINE_COLOR, width=3)
+
+
+def make_sprite(draw_mark, cell_size):
+  """
+  预先绘制一个格子的标记贴图
+  
+  Args:
+    draw_mark: 绘制函数
+    cell_size: 格子大小
+    
+  Returns:
+    (colors, alpha) colors为float32 RGBA颜色，alpha为float32透明度（0-1），
+    形状均为 (cell_size+1, cell_size+1[, 4])（边框包含右下边界像素）
+  """
+  size = cell_size + 1
+  sprite = Image.new('RGBA', (size, size), (255, 255, 255, 0))
+  draw_mark(ImageDraw.Draw(sprite), 0, 0, cell_size)
+  colors = np.asarray(sprite, dtype=np.float32)
+  return colors, colors[:, :, 3:] / 255
+
+
+class HintOverlayRenderer:
+  """提示覆盖层渲染器类"""
+  
+  def __init__(self):
+    """初始化渲染器"""
+    self._frame_id = None  # 当前底图对应的帧序号
+    self._base = None      # 转换后的RGBA底图
+    self._canvas = None    # 渲染结果（在底图副本上原地修改）
+    self._drawn = []       # 上次渲染改动过的矩形 (y0, y1, x0, x1)
+    self._sprites = {}
+  
+  def get_sprites(self, cell_size):
+    """
+    获取指定格子大小的安全/地雷标记贴图（按格子大小缓存）
+    
+    Returns:
+      dict，键为'safe'和'mine'
+    """
+    if cell_size not in self._sprites:
+      self._sprites[cell_size] = {
+        'safe': make_sprite(_draw_safe_mark, cell_size),
+        'mine': make_sprite(_draw_mine_mark, cell_size)
+      }
+    return self._sprites[cell_size]
+  
+  def set_base(self, image, frame_id=None):
+    """
+    设置底图（BGR），同一帧序号重复设置时不再转换
+    
+    截图来源会把新帧写入同一个缓冲区，因此按帧序号而不是数组对象判断是否为同一帧
+    
+    Args:
+      image: 原始图像（numpy数组，BGR格式）
+      frame_id: 可选的帧序号，为None时总是重新转换
+    """
+    same_frame = (
+      frame_id is not None and frame_id == self._frame_id
+      and self._base is not None and self._base.shape[:2] == image.shape[:2]
+    )
+    if same_frame:
+      return
+    self._frame_id = frame_id
+    self._base = cv2.cvtColor(image, cv2.COLOR_BGR2RGBA)
+    self._canvas = self._base.copy()
+    self._drawn = []
+  
+  def render(self, image, safe_cells, mine_cells, board_region, cell_size, frame_id=None):
+    """
+    渲染带提示的图像
+    
+    Args:
+      image: 原始图像（numpy数组，BGR格式）
+      safe_cells: 安全格子列表 [(row, col), ...]
+      mine_cells: 地雷格子列表 [(row, col), ...]
+      board_region: 棋盘区域 (x, y, w, h)，为None时不绘制提示
+      cell_size: 格子大小
+      frame_id: 可选的帧序号，与上次相同时复用已转换的底图
+      
+    Returns:
+      RGBA numpy数组（渲染器内部缓冲区，下次渲染时会被修改）
+    """
+    self.set_base(image, frame_id)
+    
+    # 恢复上次绘制过的矩形
+    for y0, y1, x0, x1 in self._drawn:
+      self._canvas[y0:y1, x0:x1] = self._base[y0:y1, x0:x1]
+    self._drawn = []
+    
+    if not board_region:
+      return self._canvas
+    
+    sprites = self.get_sprites(cell_size)
+    x_offset, y_offset = board_region[0], board_region[1]
+    for kind, cells in (('safe', safe_cells), ('mine', mine_cells)):
+      for row, col in cells:
+        self._blend(sprites[kind], x_offset + col * cell_size, y_offset + row * cell_size)
+    
+    return self._canvas
+  
+  def _blend(self, sprite, x, y):
+    """在(x, y)处原地混合一个贴图（超出图像的部分被裁掉）"""
+    colors, alpha = sprite
+    height, width = self._canvas.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1 = min(x + colors.shape[1], width)
+    y1 = min(y + colors.shape[0], height)
+    if x0 >= x1 or y0 >= y1:
+      return
+    
+    region = self._canvas[y0:y1, x0:x1]
+    sx, sy = x0 - x, y0 - y
+    a = alpha[sy:sy + y1 - y0, sx:sx + x1 - x0]
+    c = colors[sy:sy + y1 - y0, sx:sx + x1 - x0]
+    blended = region * (1 - a) + c * a
+    blended[:, :, 3] = 255
+    region[:] = np.rint(blended)
+    self._drawn.append((y0, y1, x0, x1))
@@ -0,0 +1,141 @@
+"""
+格子识别缓存
+以格子像素（与识别所用的像素一致）的快速哈希为键，直接映射到识别结果；连续截图中未变化的格子无需重新识别
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.constants import CacheConfig
+
+
+class CellRecognitionCache:
+  """格子识别LRU缓存类"""
+  
+  def __init__(self, max_size=CacheConfig.CELL_CACHE_SIZE):
+    """
+    初始化缓存
+    
+    Args:
+      max_size: 最大条目数
+    """
+    self.max_size = max_size
+    self.context = None   # (主题, 格子大小, 校准摘要)，变化时清空缓存
+    self.hits = 0
+    self.misses = 0
+    self._entries = OrderedDict()
+    self._weights = None
+  
+  def set_context(self, context):
+    """
+    设置识别上下文，格子大小或主题校准变化时缓存失效
+    
+    Args:
+      context: 可比较的上下文元组
+    """
+    if context != self.context:
+      self._entries.clear()
+      self.context = context
+  
+  def hash_cells(self, cells):
+    """
+    向量化计算每个格子的64位哈希（随机奇数权重的线性哈希，按2^64取模）
+    
+    每个格子的像素按8字节一组看作uint64再加权求和，原分辨率格子也只需少量乘法
+    
+    Args:
+      cells: uint8数组，形状为 (rows, cols, ...)，原分辨率或缩小后的格子
+      
+    Returns:
+      uint64数组，形状为 (rows, cols)
+    """
+    rows, cols = cells.shape[:2]
+    flat = np.ascontiguousarray(cells).reshape(rows, cols, -1)
+    padding = -flat.shape[-1] % 8
+    if padding:
+      flat = np.concatenate([flat, np.zeros((rows, cols, padding), dtype=flat.dtype)], axis=-1)
+    words = flat.view(np.uint64)
+    if self._weights is None or len(self._weights) != words.shape[-1]:
+      rng = np.random.default_rng(0)
+      self._weights = rng.integers(1, 2 ** 63, words.shape[-1], dtype=np.uint64) | np.uint64(1)
+    return (words * self._weights).sum(axis=-1, dtype=np.uint64)
+  
+  def lookup(self, keys, labels, confidence=None, mask=None):
+    """
+    查询缓存，命中的格子直接写入labels/confidence
+    
+    Args:
+      keys: 格子哈希数组
+      labels: 识别结果数组（原地写入）
+      confidence: 可选的置信度数组（原地写入）
+      mask: 可选的掩码，只查询为True的格子
+      
+    Returns:
+      未命中的格子掩码（不在mask内的格子为False）
+    """
+    if mask is None:
+      mask = np.ones(keys.shape, dtype=bool)
+    pending = mask.copy()
+    indices = np.flatnonzero(mask)
+    for idx, key in zip(indices.tolist(), keys.ravel()[indices].tolist()):
+      entry = self._entries.get(key)
+      if entry is None:
+        continue
+      self._entries.move_to_end(key)
+      labels.flat[idx] = entry[0]
+      if confidence is not None:
+        confidence.flat[idx] = entry[1]
+      pending.flat[idx] = False
+    
+    missed = int(pending.sum())
+    self.misses += missed
+    self.hits += int(mask.sum()) - missed
+    return pending
+  
+  def store(self, keys, labels, confidence=None):
+    """
+    写入识别结果，超出容量时淘汰最久未使用的条目
+    
+    Args:
+      keys: 格子哈希数组
+      labels: 识别结果数组
+      confidence: 可选的置信度数组
+    """
+    if confidence is None:
+      confidence = np.ones(len(keys), dtype=np.float32)
+    for key, label, score in zip(keys.tolist(), labels.tolist(), confidence.tolist()):
+      self._entries[key] = (label, score)
+      self._entries.move_to_end(key)
+    while len(self._entries) > self.max_size:
+      self._entries.popitem(last=False)
+  
+  def hit_rate(self):
+    """
+    获取命中率
+    
+    Returns:
+      0-1之间的命中率
+    """
+    total = self.hits + self.misses
+    return self.hits / total if total else 0.0
+  
+  def get_stats(self):
+    """
+    获取缓存统计
+    
+    Returns:
+      dict包含size、hits、misses、hit_rate
+    """
+    return {
+      'size': len(self._entries),
+      'hits': self.hits,
+      'misses': self.misses,
+      'hit_rate': self.hit_rate()
+    }
+  
+  def clear(self):
+    """清空缓存和统计"""
+    self._entries.clear()
+    self.hits = 0
+    self.misses = 0
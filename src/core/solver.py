@@ -3,29 +3,52 @@
 实现扫雷游戏的逻辑推理
 """
 
-from utils.constants import CellState
+import numpy as np
+
+from core.batch_solver import spread
+from core.bitboard_solver import solve_bitboard
+from utils.constants import CellState, ReasonTemplates, SolverConfig, STANDARD_MINES
 
 
 class MinesweeperSolver:
   """扫雷求解器类"""
   
-  def __init__(self, board_analyzer):
+  BACKENDS = ('reference', 'bitboard')
+  
+  def __init__(self, board_analyzer, backend=SolverConfig.DEFAULT_BACKEND,
+               opening_book=None):
     """
     初始化求解器
     
     Args:
       board_analyzer: BoardAnalyzer实例
+      backend: 求解后端，'reference'为逐格推理，'bitboard'为位棋盘推理
+        （超过SolverConfig.BITBOARD_MAX_CELLS的棋盘自动回退到reference）
+      opening_book: 可选的OpeningBook实例，棋盘尚无信息时从中查询首次点击位置
     """
+    if backend not in self.BACKENDS:
+      raise ValueError(f"未知的求解后端: {backend}")
+    
     self.board_analyzer = board_analyzer
+    self.backend = backend
+    self.opening_book = opening_book
+    self.used_opening_book = False  # 本次结果是否来自开局库
     self.safe_cells = []
     self.mine_cells = []
     self.safe_reasons = {}  # 安全格子的推理依据
     self.mine_reasons = {}  # 地雷格子的推理依据
+    self.last_board = None  # 上次求解的棋盘状态
+    self.cell_results = None  # 逐格推理时每个数字格子的结论 {(row, col): result}，用于增量求解
   
   def solve(self):
     """
     求解当前棋盘
     
+    棋盘与上次求解时相同（例如帧差检测未发现变化）时直接复用上次的提示；
+    逐格推理后端只重新分析状态发生变化的格子及其8邻域内的数字格子
+    （每个数字格子的结论只取决于它的3x3邻域），其余格子沿用上次的结论，
+    结果与整盘重新求解一致。位棋盘后端和开局库查询仍整盘求解
+    
     Returns:
       (safe_cells, mine_cells) 安全格子和地雷格子的列表
     """
@@ -34,33 +57,95 @@ class MinesweeperSolver:
     if board is None:
       return [], []
     
+    previous = self.last_board
+    if previous is not None and np.array_equal(board, previous):
+      return self.safe_cells, self.mine_cells
+    self.last_board = np.array(board, copy=True)
+    cell_results = self.cell_results
+    self.cell_results = None
+    
     self.safe_cells = []
     self.mine_cells = []
     self.safe_reasons = {}
     self.mine_reasons = {}
+    self.used_opening_book = False
     
     rows, cols = board.shape
     
-    # 遍历所有数字格子
-    for i in range(rows):
-      for j in range(cols):
-        if board[i, j] > 0:  # 如果是数字格子
-          result = self._analyze_cell(i, j, board)
-          
-          # 记录安全格子及其原因
-          for cell in result['safe']:
-            if cell not in self.safe_reasons:
-              self.safe_cells.append(cell)
-              self.safe_reasons[cell] = result['reason']
-          
-          # 记录地雷格子及其原因
-          for cell in result['mines']:
-            if cell not in self.mine_reasons:
-              self.mine_cells.append(cell)
-              self.mine_reasons[cell] = result['reason']
+    # 棋盘尚无信息时查询开局库
+    if self.opening_book is not None and not (board >= 0).any():
+      self._solve_opening(rows, cols)
+      return self.safe_cells, self.mine_cells
+    
+    if self.backend == 'bitboard' and rows * cols <= SolverConfig.BITBOARD_MAX_CELLS:
+      (self.safe_cells, self.mine_cells,
+       self.safe_reasons, self.mine_reasons) = solve_bitboard(board)
+      return self.safe_cells, self.mine_cells
+    
+    if cell_results is None or previous is None or previous.shape != board.shape:
+      # 整盘分析所有数字格子
+      cell_results = {}
+      affected = np.ones(board.shape, dtype=bool)
+    else:
+      # 只重新分析变化格子邻域内的数字格子
+      changed = board != previous
+      affected = changed | spread(changed[None])[0]
+    
+    for i, j in np.argwhere(affected & (board > 0)).tolist():
+      result = self._analyze_cell(i, j, board)
+      if result['safe'] or result['mines']:
+        cell_results[(i, j)] = result
+      else:
+        cell_results.pop((i, j), None)
+    for cell in np.argwhere(affected & (board <= 0)).tolist():
+      cell_results.pop(tuple(cell), None)
+    self.cell_results = cell_results
+    
+    # 按行优先顺序汇总（与逐格扫描整盘时先到先得的推理依据一致）
+    for cell in sorted(cell_results):
+      result = cell_results[cell]
+      
+      # 记录安全格子及其原因
+      for target in result['safe']:
+        if target not in self.safe_reasons:
+          self.safe_cells.append(target)
+          self.safe_reasons[target] = result['reason']
+      
+      # 记录地雷格子及其原因
+      for target in result['mines']:
+        if target not in self.mine_reasons:
+          self.mine_cells.append(target)
+          self.mine_reasons[target] = result['reason']
     
     return self.safe_cells, self.mine_cells
   
+  def _solve_opening(self, rows, cols):
+    """
+    从开局库获取最佳首次点击位置
+    
+    Args:
+      rows: 行数
+      cols: 列数
+    """
+    info = {}
+    if hasattr(self.board_analyzer, 'get_board_info'):
+      info = self.board_analyzer.get_board_info()
+    mines = info.get('mines') or STANDARD_MINES.get((rows, cols))
+    if mines is None:
+      return
+    
+    click = self.opening_book.get_best_first_click(rows, cols, mines)
+    if click is None:
+      return
+    
+    cell = (click['row'], click['col'])
+    self.used_opening_book = True
+    self.safe_cells.append(cell)
+    self.safe_reasons[cell] = ReasonTemplates.OPENING.format(
+      row=cell[0] + 1, col=cell[1] + 1,
+      revealed=click['mean_revealed']
+    )
+  
   def _analyze_cell(self, row, col, board):
     """
     分析单个数字格子周围的情况
@@ -91,20 +176,17 @@ class MinesweeperSolver:
     remaining_mines = number - len(flagged)
     if len(unknown) == remaining_mines and remaining_mines > 0:
       result['mines'] = unknown
-      result['reason'] = (
-        f"位置({row+1},{col+1})数字{number}，"
-        f"周围已标记{len(flagged)}个雷，"
-        f"剩余{len(unknown)}个未知格子=剩余{remaining_mines}个雷，"
-        f"因此这些格子必定是雷"
+      result['reason'] = ReasonTemplates.MINE.format(
+        row=row + 1, col=col + 1, number=number,
+        flagged=len(flagged), unknown=len(unknown), remaining=remaining_mines
       )
     
     # 规则2: 如果已标记雷数 = 数字，所有未知格子都安全
     if len(flagged) == number and len(unknown) > 0:
       result['safe'] = unknown
-      result['reason'] = (
-        f"位置({row+1},{col+1})数字{number}，"
-        f"周围已标记{len(flagged)}个雷（等于数字），"
-        f"因此剩余{len(unknown)}个格子必定安全"
+      result['reason'] = ReasonTemplates.SAFE.format(
+        row=row + 1, col=col + 1, number=number,
+        flagged=len(flagged), unknown=len(unknown)
       )
     
     return result
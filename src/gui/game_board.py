@@ -159,6 +159,7 @@ class GameBoard(QWidget):
   # 自定义信号
   cell_revealed = Signal()       # 格子被翻开
   game_over_signal = Signal(bool)  # 游戏结束（True=胜利，False=失败）
+  move_made = Signal()           # 玩家操作了棋盘（翻开、标记或双击）
   
   def __init__(self, parent=None):
     super().__init__(parent)
@@ -169,7 +170,7 @@ class GameBoard(QWidget):
     self.layout.setContentsMargins(0, 0, 0, 0)
     self.setLayout(self.layout)
   
-  def init_game(self, rows: int, cols: int, mines: int):
+  def init_game(self, rows: int, cols: int, mines: int, no_guess: bool = False):
     """
     初始化游戏
     
@@ -177,12 +178,13 @@ class GameBoard(QWidget):
       rows: 行数
       cols: 列数
       mines: 地雷数量
+      no_guess: 是否生成无需猜测即可完成的棋盘
     """
     # 清除旧的按钮
     self._clear_board()
     
     # 创建新游戏
-    self.game = MinesweeperGame(rows, cols, mines)
+    self.game = MinesweeperGame(rows, cols, mines, no_guess)
     
     # 创建格子按钮
     self.buttons = []
@@ -215,6 +217,7 @@ class GameBoard(QWidget):
     
     success = self.game.reveal(row, col)
     self._update_board()
+    self.move_made.emit()
     
     if not success:
       # 踩雷了
@@ -232,6 +235,7 @@ class GameBoard(QWidget):
     
     self.game.toggle_flag(row, col)
     self._update_board()
+    self.move_made.emit()
   
   def _on_cell_double_click(self, row: int, col: int):
     """双击格子（和弦操作：自动挖开周围未标记的格子）"""
@@ -240,6 +244,7 @@ class GameBoard(QWidget):
     
     success = self.game.chord_reveal(row, col)
     self._update_board()
+    self.move_made.emit()
     
     if not success and self.game.game_over:
       # 踩雷了
@@ -270,6 +275,6 @@ class GameBoard(QWidget):
       return
     
     rows, cols, mines = self.game.rows, self.game.cols, self.game.total_mines
-    self.init_game(rows, cols, mines)
+    self.init_game(rows, cols, mines, self.game.no_guess)
 
 
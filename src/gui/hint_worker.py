@@ -0,0 +1,110 @@
+"""
+后台提示任务
+求解和AI请求在QThreadPool中执行，结果通过信号送回界面线程；
+每次提示有一个代号，界面据此丢弃过期的结果
+"""
+
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.solver import MinesweeperSolver
+
+
+class BoardSnapshot:
+  """棋盘状态快照（工作线程中的求解器只读取快照，不访问游戏对象）"""
+  
+  def __init__(self, board_info: dict):
+    self.board_info = board_info
+  
+  def get_board_state(self):
+    """获取棋盘状态"""
+    return self.board_info['board']
+  
+  def get_board_info(self):
+    """获取棋盘信息"""
+    return self.board_info
+
+
+class HintSignals(QObject):
+  """提示任务的信号（在界面线程创建，跨线程发射时自动排队）"""
+  solved = Signal(int, object)               # 代号, 求解器
+  explanation = Signal(int, object, str)     # 代号, (row, col)（从1开始）, 解释
+  explanations_done = Signal(int)            # 代号
+  probability = Signal(int, object)          # 代号, 概率分析结果dict
+
+
+class HintTask(QRunnable):
+  """提示任务基类"""
+  
+  def __init__(self, generation: int, signals: HintSignals, cancel: threading.Event, work):
+    """
+    初始化任务
+    
+    Args:
+      generation: 提示代号
+      signals: 结果信号
+      cancel: 取消标志，被设置后任务尽快结束且不再发射信号
+      work: 在工作线程中执行的无参函数
+    """
+    super().__init__()
+    self.generation = generation
+    self.signals = signals
+    self.cancel = cancel
+    self.work = work
+  
+  def run(self):
+    if self.cancel.is_set():
+      return
+    try:
+      self.work()
+    except Exception as e:
+      print(f"提示任务失败: {e}")
+
+
+class SolveTask(HintTask):
+  """本地求解"""
+  
+  def __init__(self, generation, signals, cancel, snapshot: BoardSnapshot, opening_book=None):
+    super().__init__(generation, signals, cancel, self.solve)
+    self.snapshot = snapshot
+    self.opening_book = opening_book
+  
+  def solve(self):
+    solver = MinesweeperSolver(self.snapshot, opening_book=self.opening_book)
+    solver.solve()
+    if not self.cancel.is_set():
+      self.signals.solved.emit(self.generation, solver)
+
+
+class ExplanationTask(HintTask):
+  """批量请求AI解释，按完成顺序逐个发回"""
+  
+  def __init__(self, generation, signals, cancel, ai_service, cells_info: list):
+    super().__init__(generation, signals, cancel, self.explain)
+    self.ai_service = ai_service
+    self.cells_info = cells_info
+  
+  def explain(self):
+    explanations = self.ai_service.iter_explanations(self.cells_info, cancel=self.cancel)
+    for cell, explanation in explanations:
+      if self.cancel.is_set():
+        explanations.close()
+        return
+      self.signals.explanation.emit(self.generation, cell, explanation)
+    if not self.cancel.is_set():
+      self.signals.explanations_done.emit(self.generation)
+
+
+class ProbabilityTask(HintTask):
+  """AI概率分析（单个请求无法中途取消，过期结果由界面丢弃）"""
+  
+  def __init__(self, generation, signals, cancel, ai_service, board_state: dict):
+    super().__init__(generation, signals, cancel, self.analyze)
+    self.ai_service = ai_service
+    self.board_state = board_state
+  
+  def analyze(self):
+    result = self.ai_service.analyze_probability(self.board_state)
+    if not self.cancel.is_set():
+      self.signals.probability.emit(self.generation, result)
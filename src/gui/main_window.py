@@ -4,16 +4,18 @@
 
 from PySide6.QtWidgets import (
   QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-  QGroupBox, QMessageBox, QPushButton, QComboBox, QApplication
+  QGroupBox, QMessageBox, QPushButton, QComboBox, QCheckBox
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QThreadPool
 from PySide6.QtGui import QFont
+import threading
 import time
 
 from core.minesweeper_game import MinesweeperGame
-from core.solver import MinesweeperSolver
 from core.board_analyzer import BoardAnalyzer
+from core.opening_book import OpeningBook
 from gui.game_board import GameBoard
+from gui.hint_worker import BoardSnapshot, HintSignals, SolveTask, ExplanationTask, ProbabilityTask
 from utils.constants import GUIConfig, BOARD_SIZES
 from utils.ai_service import AIService
 
@@ -33,6 +35,7 @@ class SimpleBoardAnalyzer:
     return {
       'rows': self.game.rows,
       'cols': self.game.cols,
+      'mines': self.game.total_mines,
       'board': self.get_board_state()
     }
 
@@ -55,6 +58,21 @@ class MainWindow(QMainWindow):
     # AI服务
     self.ai_service = AIService("sk-c3104a3b952149aab0957280dd255eba")
     
+    # 开局库（按需加载）
+    self.opening_book = OpeningBook()
+    
+    # 后台提示任务（求解和AI请求不占用界面线程）
+    self.hint_pool = QThreadPool(self)
+    self.hint_pool.setMaxThreadCount(GUIConfig.HINT_WORKERS)
+    self.hint_signals = HintSignals()
+    self.hint_signals.solved.connect(self._on_hint_solved)
+    self.hint_signals.explanation.connect(self._on_hint_explanation)
+    self.hint_signals.explanations_done.connect(self._on_hint_explanations_done)
+    self.hint_signals.probability.connect(self._on_hint_probability)
+    self.hint_generation = 0                # 当前提示的代号，旧代号的结果被丢弃
+    self.hint_cancel = threading.Event()    # 当前提示任务的取消标志
+    self.hint_state = None                  # 当前显示的提示内容
+    
     # 难度配置
     self.difficulties = {
       '初级 (9x9)': {'rows': 9, 'cols': 9, 'mines': 10},
@@ -93,6 +111,12 @@ class MainWindow(QMainWindow):
     self.difficulty_combo.setCurrentText('初级 (9x9)')
     control_layout.addWidget(self.difficulty_combo)
     
+    # 无猜模式
+    self.no_guess_check = QCheckBox("🧠 无猜模式")
+    self.no_guess_check.setFont(QFont('Arial', 10))
+    self.no_guess_check.setToolTip("生成的棋盘从第一次点击起无需猜测即可完成")
+    control_layout.addWidget(self.no_guess_check)
+    
     control_layout.addSpacing(20)
     
     # 新游戏按钮
@@ -192,6 +216,7 @@ class MainWindow(QMainWindow):
     self.game_board = GameBoard()
     self.game_board.cell_revealed.connect(self.on_cell_revealed)
     self.game_board.game_over_signal.connect(self.on_game_over)
+    self.game_board.move_made.connect(self.cancel_hint)
     board_container_layout.addWidget(self.game_board)
     
     left_layout.addWidget(board_container)
@@ -245,7 +270,8 @@ class MainWindow(QMainWindow):
     self.game_board.init_game(
       config['rows'],
       config['cols'],
-      config['mines']
+      config['mines'],
+      self.no_guess_check.isChecked()
     )
     
     # 重置计时器
@@ -305,9 +331,12 @@ class MainWindow(QMainWindow):
       )
   
   def show_hint(self):
-    """显示AI提示"""
+    """显示AI提示（求解在后台线程进行，结果就绪后再更新界面）"""
     game = self.game_board.get_game()
-    if not game or game.game_over or game.first_click:
+    no_opening = game and game.first_click and self.opening_book.get_best_first_click(
+      game.rows, game.cols, game.total_mines
+    ) is None
+    if not game or game.game_over or no_opening:
       QMessageBox.warning(
         self,
         "提示",
@@ -315,12 +344,44 @@ class MainWindow(QMainWindow):
       )
       return
     
-    # 创建分析器和求解器
-    analyzer = SimpleBoardAnalyzer(game)
-    self.solver = MinesweeperSolver(analyzer)
+    # 取消上一次提示中尚未完成的任务
+    self.cancel_hint()
+    self.hint_text.setText("🔍 正在求解...")
     
-    # 求解
-    safe_cells, mine_cells = self.solver.solve()
+    # 求解器只读取当前局面的快照
+    snapshot = BoardSnapshot(SimpleBoardAnalyzer(game).get_board_info())
+    self.hint_pool.start(SolveTask(
+      self.hint_generation, self.hint_signals, self.hint_cancel,
+      snapshot, self.opening_book
+    ))
+  
+  def cancel_hint(self):
+    """
+    取消进行中的提示任务（新的一步操作、新提示或新游戏时调用）
+    
+    排队中的AI请求被取消，进行中的请求结果到达后被丢弃；
+    已显示的提示保留，尚未返回的解释显示原始推理依据
+    """
+    self.hint_cancel.set()
+    self.hint_cancel = threading.Event()
+    self.hint_generation += 1
+    
+    state = self.hint_state
+    if state is None:
+      return
+    if state['waiting']:
+      state['waiting'] = False
+      self._render_hint_info()
+    elif state['probability_pending']:
+      state['probability_pending'] = False
+      self._show_probability_result(None)
+  
+  def _on_hint_solved(self, generation, solver):
+    """后台求解完成"""
+    if generation != self.hint_generation:
+      return
+    self.solver = solver
+    safe_cells, mine_cells = solver.safe_cells, solver.mine_cells
     
     # 显示提示信息
     self.display_hint_info(safe_cells, mine_cells)
@@ -329,11 +390,73 @@ class MainWindow(QMainWindow):
     self.highlight_hints(safe_cells, mine_cells)
   
   def display_hint_info(self, safe_cells, mine_cells):
-    """显示提示信息"""
+    """
+    显示提示信息
+    
+    先显示求解结果和原始推理依据，AI解释在后台生成并逐条替换；
+    没有确定结论时在后台进行AI概率分析
+    """
     # 获取推理依据
     reasons = self.solver.get_reasons()
-    safe_reasons = reasons['safe_reasons']
-    mine_reasons = reasons['mine_reasons']
+    state = {
+      'safe_cells': safe_cells,
+      'mine_cells': mine_cells,
+      'safe_reasons': reasons['safe_reasons'],
+      'mine_reasons': reasons['mine_reasons'],
+      'explanations': {},
+      'waiting': False,
+      'probability_pending': False
+    }
+    self.hint_state = state
+    
+    if not safe_cells and not mine_cells:
+      board_state = self._collect_board_state()
+      if board_state is None:
+        self._show_probability_result(None)
+        return
+      
+      info = "━━━━━━━━━━━━━━━\n"
+      info += "  AI 提示信息\n"
+      info += "━━━━━━━━━━━━━━━\n\n"
+      info += "⚠️ 未找到明确的提示\n\n"
+      info += "🤖 正在进行AI概率分析...\n"
+      self.hint_text.setText(info)
+      
+      state['probability_pending'] = True
+      self.hint_pool.start(ProbabilityTask(
+        self.hint_generation, self.hint_signals, self.hint_cancel,
+        self.ai_service, board_state
+      ))
+      return
+    
+    # 要显示的格子的AI解释（开局库的依据无需再请求AI）
+    cells_info = []
+    if not self.solver.used_opening_book:
+      cells_info += [
+        {'row': row + 1, 'col': col + 1, 'reason': state['safe_reasons'][(row, col)]}
+        for row, col in safe_cells[:5] if (row, col) in state['safe_reasons']
+      ]
+    cells_info += [
+      {'row': row + 1, 'col': col + 1, 'reason': state['mine_reasons'][(row, col)]}
+      for row, col in mine_cells[:5] if (row, col) in state['mine_reasons']
+    ]
+    
+    state['waiting'] = bool(cells_info)
+    self._render_hint_info()
+    if cells_info:
+      self.hint_pool.start(ExplanationTask(
+        self.hint_generation, self.hint_signals, self.hint_cancel,
+        self.ai_service, cells_info
+      ))
+  
+  def _render_hint_info(self):
+    """按当前提示状态刷新提示文本"""
+    state = self.hint_state
+    safe_cells = state['safe_cells']
+    mine_cells = state['mine_cells']
+    safe_reasons = state['safe_reasons']
+    mine_reasons = state['mine_reasons']
+    explanations = state['explanations']
     
     info = "━━━━━━━━━━━━━━━\n"
     info += "  AI 提示信息\n"
@@ -347,14 +470,8 @@ class MainWindow(QMainWindow):
       info += "🟢 安全格子（建议点击）:\n"
       for i, (row, col) in enumerate(safe_cells[:5], 1):
         info += f"  {i}. 行{row+1}列{col+1}\n"
-        # 获取AI解释
         if (row, col) in safe_reasons:
-          cell_info = {
-            'row': row + 1,
-            'col': col + 1,
-            'reason': safe_reasons[(row, col)]
-          }
-          explanation = self.ai_service.generate_explanation(cell_info)
+          explanation = explanations.get((row + 1, col + 1), safe_reasons[(row, col)])
           info += f"     💡 {explanation}\n"
         info += "\n"
       if len(safe_cells) > 5:
@@ -364,73 +481,86 @@ class MainWindow(QMainWindow):
       info += "🔴 地雷格子（建议标记）:\n"
       for i, (row, col) in enumerate(mine_cells[:5], 1):
         info += f"  {i}. 行{row+1}列{col+1}\n"
-        # 获取AI解释
         if (row, col) in mine_reasons:
-          cell_info = {
-            'row': row + 1,
-            'col': col + 1,
-            'reason': mine_reasons[(row, col)]
-          }
-          explanation = self.ai_service.generate_explanation(cell_info)
+          explanation = explanations.get((row + 1, col + 1), mine_reasons[(row, col)])
           info += f"     💣 {explanation}\n"
         info += "\n"
       if len(mine_cells) > 5:
         info += f"  ... 还有 {len(mine_cells)-5} 个\n\n"
     
-    if not safe_cells and not mine_cells:
-      info += "⚠️ 未找到明确的提示\n\n"
-      info += "🤖 正在进行AI概率分析...\n"
-      self.hint_text.setText(info)
-      QApplication.processEvents()  # 立即更新UI
+    if state['waiting']:
+      info += "🤖 AI解释生成中...\n"
+    
+    self.hint_text.setText(info)
+  
+  def _on_hint_explanation(self, generation, cell, explanation):
+    """收到一条AI解释"""
+    if generation != self.hint_generation:
+      return
+    self.hint_state['explanations'][cell] = explanation
+    self._render_hint_info()
+  
+  def _on_hint_explanations_done(self, generation):
+    """本次提示的AI解释全部返回"""
+    if generation != self.hint_generation:
+      return
+    self.hint_state['waiting'] = False
+    self._render_hint_info()
+  
+  def _on_hint_probability(self, generation, result):
+    """AI概率分析完成"""
+    if generation != self.hint_generation:
+      return
+    self.hint_state['probability_pending'] = False
+    self._show_probability_result(result)
+  
+  def _show_probability_result(self, result):
+    """显示AI概率分析结果，result为None时显示通用建议"""
+    if result and result.get('suggestions'):
+      info = "━━━━━━━━━━━━━━━\n"
+      info += "  AI 概率分析\n"
+      info += "━━━━━━━━━━━━━━━\n\n"
       
-      # 调用AI概率分析
-      probability_result = self._analyze_probability()
+      info += f"📊 局面分析:\n"
+      info += f"   {result.get('analysis', '当前需要概率判断')}\n\n"
       
-      if probability_result and probability_result.get('suggestions'):
-        info = "━━━━━━━━━━━━━━━\n"
-        info += "  AI 概率分析\n"
-        info += "━━━━━━━━━━━━━━━\n\n"
-        
-        info += f"📊 局面分析:\n"
-        info += f"   {probability_result.get('analysis', '当前需要概率判断')}\n\n"
-        
-        info += "🎯 建议尝试格子（按安全概率排序）:\n\n"
+      info += "🎯 建议尝试格子（按安全概率排序）:\n\n"
+      
+      for i, suggestion in enumerate(result['suggestions'][:5], 1):
+        row = suggestion['row']
+        col = suggestion['col']
+        prob = suggestion['probability']
+        reason = suggestion['reason']
         
-        for i, suggestion in enumerate(probability_result['suggestions'][:5], 1):
-          row = suggestion['row']
-          col = suggestion['col']
-          prob = suggestion['probability']
-          reason = suggestion['reason']
-          
-          # 概率颜色标识
-          if prob >= 70:
-            prob_icon = "🟢 高"
-          elif prob >= 50:
-            prob_icon = "🟡 中"
-          else:
-            prob_icon = "🟠 低"
-          
-          info += f"  {i}. 行{row+1}列{col+1}\n"
-          info += f"     安全概率: {prob}% {prob_icon}\n"
-          info += f"     理由: {reason}\n\n"
+        # 概率颜色标识
+        if prob >= 70:
+          prob_icon = "🟢 高"
+        elif prob >= 50:
+          prob_icon = "🟡 中"
+        else:
+          prob_icon = "🟠 低"
         
-        info += "⚠️ 注意：\n"
-        info += "  这是概率建议，仍有踩雷风险！\n"
-        info += "  建议优先尝试概率高的格子。\n"
-      else:
-        info = "━━━━━━━━━━━━━━━\n"
-        info += "  提示信息\n"
-        info += "━━━━━━━━━━━━━━━\n\n"
-        info += "⚠️ 未找到明确的提示\n\n"
-        info += "建议:\n"
-        info += "  • 翻开更多格子\n"
-        info += "  • 尝试边缘或角落位置\n"
-        info += "  • 需要一定的运气！\n"
+        info += f"  {i}. 行{row+1}列{col+1}\n"
+        info += f"     安全概率: {prob}% {prob_icon}\n"
+        info += f"     理由: {reason}\n\n"
+      
+      info += "⚠️ 注意：\n"
+      info += "  这是概率建议，仍有踩雷风险！\n"
+      info += "  建议优先尝试概率高的格子。\n"
+    else:
+      info = "━━━━━━━━━━━━━━━\n"
+      info += "  提示信息\n"
+      info += "━━━━━━━━━━━━━━━\n\n"
+      info += "⚠️ 未找到明确的提示\n\n"
+      info += "建议:\n"
+      info += "  • 翻开更多格子\n"
+      info += "  • 尝试边缘或角落位置\n"
+      info += "  • 需要一定的运气！\n"
     
     self.hint_text.setText(info)
   
-  def _analyze_probability(self):
-    """使用AI进行概率分析"""
+  def _collect_board_state(self):
+    """收集AI概率分析所需的棋盘状态"""
     game = self.game_board.get_game()
     if not game:
       return None
@@ -457,13 +587,7 @@ class MainWindow(QMainWindow):
         else:
           board_state['unknown_cells'].append((row, col))
     
-    # 调用AI服务
-    try:
-      result = self.ai_service.analyze_probability(board_state)
-      return result
-    except Exception as e:
-      print(f"AI概率分析失败: {e}")
-      return None
+    return board_state
   
   def highlight_hints(self, safe_cells, mine_cells):
     """在棋盘上高亮显示提示"""
@@ -502,6 +626,8 @@ class MainWindow(QMainWindow):
   
   def clear_hint(self):
     """清除提示"""
+    self.cancel_hint()
+    self.hint_state = None
     self.hint_text.setText(
       "点击 '💡 AI提示' 按钮\n"
       "获取AI分析结果\n\n"
@@ -524,4 +650,9 @@ class MainWindow(QMainWindow):
       for j in range(game.cols):
         cell = game.get_cell(i, j)
         self.game_board.buttons[i][j].update_display(cell, game.game_over)
-
+  
+  def closeEvent(self, event):
+    """关闭窗口时取消后台提示任务并释放AI服务"""
+    self.cancel_hint()
+    self.ai_service.close()
+    super().closeEvent(event)
@@ -2,6 +2,7 @@
 自定义GUI组件
 """
 
+import numpy as np
 from PySide6.QtWidgets import (
   QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton,
   QComboBox, QLineEdit, QTextEdit, QFrame
@@ -158,23 +159,32 @@ class ImageCanvas(QLabel):
     self.setAlignment(Qt.AlignmentFlag.AlignCenter)
     self.setScaledContents(False)
   
-  def display_image(self, pil_image, fit_to_canvas=True):
+  def display_image(self, image, fit_to_canvas=True, rgb=False):
     """
-    显示PIL图像
+    显示图像
+    
+    numpy数组直接包装为QImage并用OpenCV缩放一次；PIL图像走原有的转换路径
     
     Args:
-      pil_image: PIL Image对象
+      image: numpy数组（BGR格式）或PIL Image对象
       fit_to_canvas: 是否调整大小适应画布
+      rgb: numpy数组的通道顺序是否为RGB/RGBA
     """
-    from utils.image_utils import resize_to_fit, pil_to_qpixmap
+    from utils.image_utils import numpy_to_qpixmap, resize_to_fit, pil_to_qpixmap
+    
+    canvas_width = self.width()
+    canvas_height = self.height()
+    fit = fit_to_canvas and canvas_width > 0 and canvas_height > 0
+    
+    if isinstance(image, np.ndarray):
+      size = (canvas_width, canvas_height) if fit else (None, None)
+      self.setPixmap(numpy_to_qpixmap(image, *size, rgb=rgb))
+      return
     
-    if fit_to_canvas:
-      canvas_width = self.width()
-      canvas_height = self.height()
-      if canvas_width > 0 and canvas_height > 0:
-        pil_image = resize_to_fit(pil_image, canvas_width, canvas_height)
+    if fit:
+      image = resize_to_fit(image, canvas_width, canvas_height)
     
-    pixmap = pil_to_qpixmap(pil_image)
+    pixmap = pil_to_qpixmap(image)
     self.setPixmap(pixmap)
 
 
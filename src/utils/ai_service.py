@@ -3,30 +3,114 @@ AI服务模块
 用于生成自然语言解释
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+from utils.constants import AIConfig
+from utils.explanation_cache import DEFAULT_CACHE_PATH, ExplanationCache
 
 
 class AIService:
   """AI服务类"""
   
-  def __init__(self, api_key: str):
+  def __init__(self, api_key: str, max_concurrency: int = AIConfig.MAX_CONCURRENCY,
+               cache_path=DEFAULT_CACHE_PATH):
     """
     初始化AI服务
     
+    所有请求共用一个保持连接的会话，批量解释在线程池中并发请求；
+    生成的解释按推理模板缓存到磁盘，重复的推理直接返回缓存结果
+    
     Args:
       api_key: API密钥
+      max_concurrency: 同时进行的请求数
+      cache_path: 解释缓存数据库路径，None表示不缓存
     """
     self.api_key = api_key
     self.api_url = "https://api.siliconflow.cn/v1/chat/completions"
     self.model = "deepseek-ai/DeepSeek-V3"
+    self.max_concurrency = max_concurrency
+    
+    self.session = requests.Session()
+    self.session.headers.update({
+      "Authorization": f"Bearer {self.api_key}",
+      "Content-Type": "application/json"
+    })
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+    self.session.mount('https://', adapter)
+    self.session.mount('http://', adapter)
+    self._executor = None
+    
+    self.cache = None
+    if cache_path is not None:
+      try:
+        self.cache = ExplanationCache(cache_path)
+      except Exception as e:
+        print(f"解释缓存打开失败: {e}")
+  
+  def _chat(self, prompt: str, temperature: float, max_tokens: int, timeout: float):
+    """
+    发送一次对话请求
+    
+    Returns:
+      回复文本，HTTP状态码不是200时返回None
+    """
+    data = {
+      "model": self.model,
+      "messages": [
+        {
+          "role": "user",
+          "content": prompt
+        }
+      ],
+      "temperature": temperature,
+      "max_tokens": max_tokens
+    }
+    
+    response = self.session.post(self.api_url, json=data, timeout=timeout)
+    if response.status_code != 200:
+      return None
+    result = response.json()
+    return result['choices'][0]['message']['content'].strip()
+  
+  def get_cached_explanation(self, cell_info: dict):
+    """
+    从缓存查找格子的解释
+    
+    Returns:
+      解释文本，未命中或未启用缓存时返回None
+    """
+    if self.cache is None:
+      return None
+    return self.cache.get(self.model, cell_info['reason'], (cell_info['row'], cell_info['col']))
+  
+  def generate_explanation(self, cell_info: dict, timeout: float = AIConfig.REQUEST_TIMEOUT) -> str:
+    """
+    生成格子的自然语言解释（优先使用缓存）
+    
+    Args:
+      cell_info: 格子信息，包含position, reason等
+      timeout: 请求超时（秒）
+      
+    Returns:
+      自然语言解释
+    """
+    cached = self.get_cached_explanation(cell_info)
+    if cached is not None:
+      return cached
+    return self._request_explanation(cell_info, timeout)
   
-  def generate_explanation(self, cell_info: dict) -> str:
+  def _request_explanation(self, cell_info: dict, timeout: float) -> str:
     """
-    生成格子的自然语言解释
+    请求AI生成格子的解释，成功时写入缓存
     
     Args:
       cell_info: 格子信息，包含position, reason等
+      timeout: 请求超时（秒）
       
     Returns:
       自然语言解释
@@ -48,61 +132,97 @@ class AIService:
 "数字3周围有3个未知格子且需要3个雷，所以这些格子必定是雷。"
 """
       
-      headers = {
-        "Authorization": f"Bearer {self.api_key}",
-        "Content-Type": "application/json"
-      }
-      
-      data = {
-        "model": self.model,
-        "messages": [
-          {
-            "role": "user",
-            "content": prompt
-          }
-        ],
-        "temperature": 0.3,
-        "max_tokens": 100
-      }
-      
-      response = requests.post(
-        self.api_url,
-        headers=headers,
-        json=data,
-        timeout=10
-      )
-      
-      if response.status_code == 200:
-        result = response.json()
-        explanation = result['choices'][0]['message']['content'].strip()
-        return explanation
-      else:
+      explanation = self._chat(prompt, 0.3, 100, timeout)
+      if explanation is None:
         # API调用失败，返回原始推理依据
         return cell_info['reason']
+      if self.cache is not None:
+        self.cache.put(self.model, cell_info['reason'], explanation,
+                       (cell_info['row'], cell_info['col']))
+      return explanation
     
     except Exception as e:
       # 发生异常，返回原始推理依据
       print(f"AI解释生成失败: {e}")
       return cell_info['reason']
   
-  def batch_generate_explanations(self, cells_info: list) -> dict:
+  def iter_explanations(self, cells_info: list, deadline: float = AIConfig.BATCH_DEADLINE,
+                        cancel=None):
     """
-    批量生成解释
+    并发生成一批解释，按完成顺序逐个产出
+    
+    缓存命中的格子立即产出；其余同时最多max_concurrency个请求，
+    超过总时限仍未完成的格子不再等待，直接产出原始推理依据
     
     Args:
       cells_info: 格子信息列表
+      deadline: 整批的总时限（秒）
+      cancel: 可选的threading.Event，被设置后停止等待并不再产出
       
-    Returns:
-      {(row, col): explanation} 字典
+    Yields:
+      ((row, col), explanation) 元组
     """
-    explanations = {}
-    
+    missing = []
     for cell_info in cells_info:
-      row, col = cell_info['row'], cell_info['col']
-      explanation = self.generate_explanation(cell_info)
-      explanations[(row, col)] = explanation
+      cached = self.get_cached_explanation(cell_info)
+      if cached is None:
+        missing.append(cell_info)
+      else:
+        yield (cell_info['row'], cell_info['col']), cached
+    
+    if not missing:
+      return
+    if self._executor is None:
+      self._executor = ThreadPoolExecutor(
+        max_workers=self.max_concurrency, thread_name_prefix='ai'
+      )
+    
+    end = time.monotonic() + deadline
+    
+    def explain(cell_info):
+      timeout = min(AIConfig.REQUEST_TIMEOUT, end - time.monotonic())
+      if timeout <= 0:
+        return cell_info['reason']
+      return self._request_explanation(cell_info, timeout)
+    
+    pending = {
+      self._executor.submit(explain, cell_info): cell_info
+      for cell_info in missing
+    }
+    try:
+      while pending:
+        if cancel is not None and cancel.is_set():
+          return
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+          break
+        if cancel is not None:
+          remaining = min(remaining, AIConfig.CANCEL_POLL_INTERVAL)
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+          cell_info = pending.pop(future)
+          yield (cell_info['row'], cell_info['col']), future.result()
+    finally:
+      # 超时或调用方提前停止：取消排队中的请求，进行中的请求由各自的超时结束
+      for future in pending:
+        future.cancel()
     
-    return explanations
+    for cell_info in pending.values():
+      yield (cell_info['row'], cell_info['col']), cell_info['reason']
+  
+  def batch_generate_explanations(self, cells_info: list,
+                                  deadline: float = AIConfig.BATCH_DEADLINE) -> dict:
+    """
+    批量生成解释（并发请求，受总时限约束）
+    
+    Args:
+      cells_info: 格子信息列表
+      deadline: 整批的总时限（秒）
+      
+    Returns:
+      {(row, col): explanation} 字典
+    """
+    return dict(self.iter_explanations(cells_info, deadline))
   
   def analyze_probability(self, board_state: dict) -> dict:
     """
@@ -155,34 +275,9 @@ class AIService:
 - 必须返回有效的JSON格式
 """
       
-      headers = {
-        "Authorization": f"Bearer {self.api_key}",
-        "Content-Type": "application/json"
-      }
+      content = self._chat(prompt, 0.5, 500, AIConfig.ANALYSIS_TIMEOUT)
       
-      data = {
-        "model": self.model,
-        "messages": [
-          {
-            "role": "user",
-            "content": prompt
-          }
-        ],
-        "temperature": 0.5,
-        "max_tokens": 500
-      }
-      
-      response = requests.post(
-        self.api_url,
-        headers=headers,
-        json=data,
-        timeout=15
-      )
-      
-      if response.status_code == 200:
-        result = response.json()
-        content = result['choices'][0]['message']['content'].strip()
-        
+      if content is not None:
         # 尝试解析JSON响应
         try:
           # 移除可能的markdown代码块标记
@@ -203,6 +298,30 @@ class AIService:
       print(f"AI概率分析失败: {e}")
       return self._get_fallback_suggestion(board_state)
   
+  def get_cache_stats(self) -> dict:
+    """
+    获取解释缓存统计
+    
+    Returns:
+      ExplanationCache.get_stats()的结果，未启用缓存时返回空dict
+    """
+    return self.cache.get_stats() if self.cache is not None else {}
+  
+  def close(self, wait: bool = False):
+    """
+    关闭线程池、连接和缓存
+    
+    Args:
+      wait: 是否等待进行中的请求结束
+    """
+    if self._executor is not None:
+      self._executor.shutdown(wait=wait, cancel_futures=True)
+      self._executor = None
+    self.session.close()
+    if self.cache is not None:
+      self.cache.close()
+      self.cache = None
+  
   def _build_board_description(self, board_state: dict) -> str:
     """构建棋盘描述文本"""
     desc = []
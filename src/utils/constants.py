@@ -9,6 +9,13 @@ BOARD_SIZES = {
   'EXPERT': (16, 30),
 }
 
+# 标准难度的地雷数
+STANDARD_MINES = {
+  (9, 9): 10,
+  (16, 16): 40,
+  (16, 30): 99,
+}
+
 # 棋盘大小选项（用于GUI下拉框）
 SIZE_OPTIONS = ['9x9', '16x16', '16x30', '自定义']
 
@@ -26,6 +33,7 @@ class GUIConfig:
   WINDOW_TITLE = '扫雷辅助工具'
   WINDOW_SIZE = '1000x700'
   CAPTURE_DELAY = 5  # 截图延迟秒数
+  HINT_WORKERS = 4   # 后台求解和AI请求的线程数
   
   # 按钮颜色
   BTN_CAPTURE_BG = '#4CAF50'
@@ -43,6 +51,7 @@ class GUIConfig:
 class ImageConfig:
   """图像处理配置"""
   MIN_BOARD_SIZE = 200  # 最小棋盘尺寸（像素）
+  CANONICAL_CELL_SIZE = 16  # 识别前每个格子统一缩放到的边长（与屏幕缩放比例无关）
   CANNY_LOW = 50
   CANNY_HIGH = 150
   
@@ -51,6 +60,161 @@ class ImageConfig:
   DARK_THRESHOLD = 100    # 空白格子的亮度阈值
   COLOR_SATURATION = 50   # 颜色饱和度阈值
 
+# 棋盘跟踪配置
+class TrackerConfig:
+  """棋盘区域跟踪配置"""
+  DETECT_SCALE = 0.25        # 重新检测时先在缩小的截图上粗定位
+  REFINE_PADDING = 8         # 粗定位结果在原图上精定位时的外扩像素
+  BORDER_WIDTH = 3           # 签名取棋盘外圈的宽度（像素）
+  SIGNATURE_LENGTH = 64      # 每条边签名的采样点数
+  SIGNATURE_THRESHOLD = 12   # 签名平均差值超过该值视为棋盘移动
+
+# 多棋盘配置
+class MultiBoardConfig:
+  """一张截图中多个棋盘的配置"""
+  MAX_BOARDS = 8             # 每张截图最多分析的棋盘数
+  MATCH_IOU = 0.5            # 新检测区域与已有棋盘的交并比超过该值时沿用其状态
+  REDETECT_INTERVAL = 30     # 已知棋盘都匹配时，每隔多少帧仍重新检测一次（发现新打开的棋盘）
+
+# 自动操作配置
+class ActionConfig:
+  """点击/标记操作执行配置"""
+  CLICK_DELAY = 0.005        # 相邻两次点击之间的最小间隔（秒）
+  VERIFY_TIMEOUT = 1.0       # 等待截图确认操作结果的最长时间（秒）
+  VERIFY_INTERVAL = 0.01     # 两次确认截图之间的最小间隔（秒）
+
+# 截图来源配置
+class CaptureConfig:
+  """截图来源配置"""
+  RING_SIZE = 4            # 预分配的帧缓冲区个数（被持有的帧不会被覆盖，全部被持有时自动追加）
+
+# 实时分析配置
+class PipelineConfig:
+  """实时分析流水线配置"""
+  TARGET_FPS = 10          # 目标截图帧率
+  QUEUE_SIZE = 1           # 各阶段之间队列的容量（满时丢弃最旧的帧）
+  STOP_TIMEOUT = 2.0       # 停止时等待线程退出的秒数
+  LATENCY_SAMPLES = 1000   # 耗时统计保留的最近样本数
+
+# 离线批量分析配置
+class OfflineConfig:
+  """录像和截图目录的离线分析配置"""
+  IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.bmp')
+  IN_FLIGHT_PER_WORKER = 4 # 每个工作进程同时排队的帧数
+
+# 网格检测配置
+class GridConfig:
+  """格子网格检测配置"""
+  MIN_PITCH = 8          # 最小格子间距（像素）
+  MAX_PITCH = 80         # 最大格子间距（像素）
+  PITCH_STEP = 0.01      # 亚像素间距搜索步长
+  SNAP_DRIFT = 1.0       # 间距取整后整张棋盘累计偏差不超过该值（像素）时取整
+  MIN_STRENGTH = 0.2     # 周期性强度低于该值视为未检测到网格
+  CACHE_SIZE = 16        # 网格检测结果缓存的最大棋盘数（超出时淘汰最久未使用的）
+
+# 格子分类器配置
+class ClassifierConfig:
+  """格子原型分类器配置"""
+  CACHE_DIR = 'calibration'   # 校准原型缓存目录（相对项目根目录）
+  DEFAULT_THEME = 'classic'   # 默认主题名
+  FEATURE_SIZE = 8            # 格子缩小后的边长（特征维度为 8*8*3）
+
+# 合成截图配置
+class RenderConfig:
+  """合成截图渲染配置"""
+  DEFAULT_THEME = 'contrast'  # 默认主题
+  BATCH_SIZE = 256            # 批量渲染时每批的帧数
+  
+  # 各主题的颜色（BGR）
+  THEMES = {
+    # 高对比度：未翻开格子明亮、已翻开格子较暗（与颜色规则的亮度阈值一致）
+    'contrast': {
+      'unknown': (230, 230, 230),
+      'unknown_light': (250, 250, 250),
+      'unknown_dark': (200, 200, 200),
+      'revealed': (60, 60, 60),
+      'grid': (40, 40, 40)
+    },
+    # Windows经典扫雷的灰色凸起风格
+    'classic': {
+      'unknown': (192, 192, 192),
+      'unknown_light': (255, 255, 255),
+      'unknown_dark': (128, 128, 128),
+      'revealed': (189, 189, 189),
+      'grid': (123, 123, 123)
+    }
+  }
+  
+  # 数字1-8的颜色（BGR）
+  DIGIT_COLORS = {
+    1: (255, 0, 0),
+    2: (0, 128, 0),
+    3: (0, 0, 255),
+    4: (128, 0, 0),
+    5: (0, 0, 128),
+    6: (128, 128, 0),
+    7: (0, 0, 0),
+    8: (128, 128, 128)
+  }
+
+# 识别缓存配置
+class CacheConfig:
+  """识别缓存配置"""
+  CELL_CACHE_SIZE = 4096  # 格子识别缓存的最大条目数
+  DIFF_THRESHOLD = 16     # 格子内像素最大差值超过该值视为变化（容忍压缩噪声）
+
+# 求解器配置
+class SolverConfig:
+  """求解器配置"""
+  DEFAULT_BACKEND = 'reference'  # 默认求解后端
+  BITBOARD_MAX_CELLS = 480       # 位棋盘后端支持的最大格子数（高级 16x30）
+
+# 开局库配置
+class OpeningBookConfig:
+  """开局库配置"""
+  DIRECTORY = 'opening_book'  # 开局库目录（相对项目根目录）
+  SAMPLES_PER_CELL = 200      # 每个首次点击位置的模拟局数
+  TOP_CLICKS = 5              # 保存的最佳首次点击位置数
+
+# 棋盘生成配置
+class GeneratorConfig:
+  """棋盘生成配置"""
+  CHUNK_SIZE = 256           # 每个生成任务的候选布局数
+  MAX_CANDIDATES = 1000000   # 单次生成最多尝试的候选布局数
+  MAX_REPAIRS = 300          # 无猜生成时单个布局最多修复次数
+  MAX_RESTARTS = 20          # 无猜生成时最多重新布雷次数
+
+# AI服务配置
+class AIConfig:
+  """AI解释服务配置"""
+  MAX_CONCURRENCY = 4          # 同时进行的请求数（也是连接池大小）
+  REQUEST_TIMEOUT = 10         # 单个解释请求的超时（秒）
+  BATCH_DEADLINE = 12.0        # 一批解释的总时限（秒），超时未完成的格子使用原始推理依据
+  ANALYSIS_TIMEOUT = 15        # 概率分析请求的超时（秒）
+  CANCEL_POLL_INTERVAL = 0.05  # 批量解释检查取消标志的间隔（秒）
+  CACHE_PATH = 'ai_cache/explanations.sqlite'  # 解释缓存数据库（相对项目根目录）
+  CACHE_SIZE = 2000            # 解释缓存的最大条目数（超出时淘汰最久未使用的）
+  CACHE_TTL = 7 * 24 * 3600    # 解释缓存条目的有效期（秒）
+
+# 推理依据模板
+class ReasonTemplates:
+  """求解器推理依据模板（行列从1开始）"""
+  MINE = (
+    '位置({row},{col})数字{number}，'
+    '周围已标记{flagged}个雷，'
+    '剩余{unknown}个未知格子=剩余{remaining}个雷，'
+    '因此这些格子必定是雷'
+  )
+  SAFE = (
+    '位置({row},{col})数字{number}，'
+    '周围已标记{flagged}个雷（等于数字），'
+    '因此剩余{unknown}个格子必定安全'
+  )
+  OPENING = (
+    '棋盘尚无信息，开局库建议首先点击位置({row},{col})，'
+    '首次点击必定安全，平均可翻开约{revealed:.0f}个格子'
+  )
+
 # 状态消息
 class Messages:
   """状态消息"""
@@ -79,6 +243,7 @@ class CellState:
   UNKNOWN = -1   # 未翻开
   EMPTY = 0      # 空白
   FLAGGED = -2   # 已标记为雷
+  MINE = -3      # 已翻开的地雷
   # 1-8 表示数字
 
 # 文件相关
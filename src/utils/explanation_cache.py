@@ -0,0 +1,279 @@
+"""
+AI解释缓存
+求解器的推理依据都由少数几个模板生成，只有位置和计数不同。
+按 (模型, 模板, 去掉位置后的数值参数, 目标格子相对推理格子的偏移)
+把AI解释缓存到SQLite，命中时把两处位置代回解释文本，支持LRU淘汰和有效期
+"""
+
+import json
+import re
+import sqlite3
+import string
+import threading
+import time
+from pathlib import Path
+
+from utils.constants import AIConfig, ReasonTemplates
+
+
+# 默认缓存数据库路径（项目根目录下）
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / AIConfig.CACHE_PATH
+
+# 参与匹配的推理依据模板
+TEMPLATE_IDS = ('MINE', 'SAFE', 'OPENING')
+
+# 解释文本中可能出现的位置写法（行列从1开始）
+POSITION_FORMATS = (
+  '({row},{col})',
+  '({row}, {col})',
+  '（{row}，{col}）',
+  '第{row}行第{col}列',
+  '第{row}行，第{col}列',
+  '行{row}，列{col}',
+  '行{row}列{col}',
+)
+
+# 占位符：\x00位置序号:写法序号\x00
+PLACEHOLDER = re.compile('\x00(\\d+):(\\d+)\x00')
+
+
+def _template_pattern(template):
+  """
+  把format模板转换为正则表达式，每个字段匹配一个数值
+  
+  Returns:
+    编译后的正则表达式
+  """
+  parts = []
+  for literal, field, _, _ in string.Formatter().parse(template):
+    parts.append(re.escape(literal))
+    if field is not None:
+      parts.append(rf'(?P<{field}>-?\d+(?:\.\d+)?)')
+  return re.compile(''.join(parts) + '$')
+
+
+TEMPLATE_PATTERNS = {
+  template_id: _template_pattern(getattr(ReasonTemplates, template_id))
+  for template_id in TEMPLATE_IDS
+}
+
+
+def parse_reason(reason):
+  """
+  识别推理依据对应的模板
+  
+  Args:
+    reason: 推理依据文本
+    
+  Returns:
+    (template_id, params) params为字段名到数值文本的dict，无法识别时返回None
+  """
+  for template_id, pattern in TEMPLATE_PATTERNS.items():
+    match = pattern.match(reason)
+    if match:
+      return template_id, match.groupdict()
+  return None
+
+
+def _position_pattern(fmt, row, col):
+  """位置写法对应的正则（前后不能紧跟数字，避免行1匹配到行12）"""
+  literal = re.escape(fmt.format(row=row, col=col))
+  return re.compile(rf'(?<!\d){literal}(?!\d)')
+
+
+def strip_positions(text, positions):
+  """
+  把解释文本中的位置替换为占位符
+  
+  Args:
+    text: 解释文本
+    positions: [(row, col), ...] 按顺序编号的位置
+    
+  Returns:
+    带占位符的文本
+  """
+  for slot, (row, col) in enumerate(positions):
+    for i, fmt in enumerate(POSITION_FORMATS):
+      text = _position_pattern(fmt, row, col).sub(f'\x00{slot}:{i}\x00', text)
+  return text
+
+
+def restore_positions(text, positions):
+  """
+  把占位符替换回对应位置
+  
+  Args:
+    text: 带占位符的文本
+    positions: [(row, col), ...] 与strip_positions相同顺序的位置
+    
+  Returns:
+    解释文本
+  """
+  def restore(match):
+    row, col = positions[int(match.group(1))]
+    return POSITION_FORMATS[int(match.group(2))].format(row=row, col=col)
+  return PLACEHOLDER.sub(restore, text)
+
+
+class ExplanationCache:
+  """SQLite解释缓存（线程安全）"""
+  
+  def __init__(self, path=DEFAULT_CACHE_PATH, max_size=AIConfig.CACHE_SIZE,
+               ttl=AIConfig.CACHE_TTL):
+    """
+    初始化缓存
+    
+    Args:
+      path: 数据库文件路径（':memory:'表示只在内存中）
+      max_size: 最大条目数，超出时淘汰最久未使用的条目
+      ttl: 条目有效期（秒），None表示永不过期
+    """
+    self.path = path
+    self.max_size = max_size
+    self.ttl = ttl
+    self._lock = threading.Lock()
+    
+    if path != ':memory:':
+      Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+    self._conn.execute('PRAGMA journal_mode=WAL')
+    self._conn.execute('PRAGMA synchronous=NORMAL')
+    self._conn.execute(
+      'CREATE TABLE IF NOT EXISTS explanations ('
+      'key TEXT PRIMARY KEY, explanation TEXT NOT NULL, '
+      'created REAL NOT NULL, accessed REAL NOT NULL)'
+    )
+    self._conn.execute(
+      'CREATE INDEX IF NOT EXISTS explanations_accessed ON explanations (accessed)'
+    )
+    
+    self.stats = {
+      'hits': 0,
+      'misses': 0,
+      'expired': 0,
+      'evictions': 0,
+      'uncacheable': 0
+    }
+  
+  def make_key(self, model, reason, target=None):
+    """
+    计算推理依据的缓存键
+    
+    目标格子只以相对推理格子的偏移进入键，解释中的方位描述因此保持正确
+    
+    Args:
+      model: 模型名
+      reason: 推理依据文本
+      target: 被解释格子的 (row, col)（从1开始），None表示只有推理格子
+      
+    Returns:
+      (key, positions)，positions为需要去掉的位置列表；
+      推理依据不属于已知模板时返回None
+    """
+    parsed = parse_reason(reason)
+    if parsed is None:
+      return None
+    template_id, params = parsed
+    positions = [(int(params.pop('row')), int(params.pop('col')))]
+    offset = None
+    if target is not None:
+      offset = (target[0] - positions[0][0], target[1] - positions[0][1])
+      positions.append(tuple(target))
+    key = json.dumps([model, template_id, sorted(params.items()), offset], ensure_ascii=False)
+    return key, positions
+  
+  def get(self, model, reason, target=None):
+    """
+    查找推理依据对应的解释
+    
+    Args:
+      model: 模型名
+      reason: 推理依据文本
+      target: 被解释格子的 (row, col)（从1开始）
+      
+    Returns:
+      代回位置后的解释文本，未命中时返回None
+    """
+    keyed = self.make_key(model, reason, target)
+    if keyed is None:
+      with self._lock:
+        self.stats['uncacheable'] += 1
+      return None
+    key, positions = keyed
+    now = time.time()
+    
+    with self._lock:
+      found = self._conn.execute(
+        'SELECT explanation, created FROM explanations WHERE key = ?', (key,)
+      ).fetchone()
+      if found is not None and self.ttl is not None and now - found[1] > self.ttl:
+        self._conn.execute('DELETE FROM explanations WHERE key = ?', (key,))
+        self.stats['expired'] += 1
+        found = None
+      if found is None:
+        self.stats['misses'] += 1
+        return None
+      self._conn.execute('UPDATE explanations SET accessed = ? WHERE key = ?', (now, key))
+      self.stats['hits'] += 1
+    
+    return restore_positions(found[0], positions)
+  
+  def put(self, model, reason, explanation, target=None):
+    """
+    保存推理依据对应的解释
+    
+    Args:
+      model: 模型名
+      reason: 推理依据文本
+      explanation: AI生成的解释
+      target: 被解释格子的 (row, col)（从1开始）
+    """
+    keyed = self.make_key(model, reason, target)
+    if keyed is None:
+      return
+    key, positions = keyed
+    now = time.time()
+    
+    with self._lock:
+      self._conn.execute(
+        'INSERT OR REPLACE INTO explanations VALUES (?, ?, ?, ?)',
+        (key, strip_positions(explanation, positions), now, now)
+      )
+      overflow = self._size() - self.max_size
+      if overflow > 0:
+        self._conn.execute(
+          'DELETE FROM explanations WHERE key IN '
+          '(SELECT key FROM explanations ORDER BY accessed LIMIT ?)', (overflow,)
+        )
+        self.stats['evictions'] += overflow
+  
+  def _size(self):
+    """当前条目数"""
+    return self._conn.execute('SELECT COUNT(*) FROM explanations').fetchone()[0]
+  
+  def clear(self):
+    """清空缓存"""
+    with self._lock:
+      self._conn.execute('DELETE FROM explanations')
+  
+  def close(self):
+    """关闭数据库连接"""
+    with self._lock:
+      self._conn.close()
+  
+  def get_stats(self):
+    """
+    获取缓存统计
+    
+    Returns:
+      dict包含hits、misses、expired、evictions、uncacheable、hit_rate、size
+    """
+    with self._lock:
+      size = self._size()
+      stats = dict(self.stats)
+    lookups = stats['hits'] + stats['misses']
+    return {
+      **stats,
+      'hit_rate': stats['hits'] / lookups if lookups else 0.0,
+      'size': size
+    }
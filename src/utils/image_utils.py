@@ -35,7 +35,24 @@ def resize_to_fit(image, canvas_width, canvas_height):
   Returns:
     调整后的PIL Image对象
   """
-  img_ratio = image.width / image.height
+  new_width, new_height = fit_size(image.width, image.height, canvas_width, canvas_height)
+  return image.resize((new_width, new_height), Image.LANCZOS)
+
+
+def fit_size(width, height, canvas_width, canvas_height):
+  """
+  计算保持宽高比适应画布的尺寸
+  
+  Args:
+    width: 图像宽度
+    height: 图像高度
+    canvas_width: 画布宽度
+    canvas_height: 画布高度
+    
+  Returns:
+    (new_width, new_height)
+  """
+  img_ratio = width / height
   canvas_ratio = canvas_width / canvas_height
   
   if img_ratio > canvas_ratio:
@@ -45,7 +62,7 @@ def resize_to_fit(image, canvas_width, canvas_height):
     new_height = canvas_height
     new_width = int(canvas_height * img_ratio)
   
-  return image.resize((new_width, new_height), Image.LANCZOS)
+  return max(new_width, 1), max(new_height, 1)
 
 
 def pil_to_qpixmap(pil_image):
@@ -78,6 +95,85 @@ def pil_to_qpixmap(pil_image):
   return QPixmap.fromImage(qimage)
 
 
+# numpy数组通道数和通道顺序对应的QImage格式
+_QIMAGE_FORMATS = {
+  (1, False): QImage.Format.Format_Grayscale8,
+  (1, True): QImage.Format.Format_Grayscale8,
+  (3, False): QImage.Format.Format_BGR888,
+  (3, True): QImage.Format.Format_RGB888,
+  (4, False): QImage.Format.Format_ARGB32,    # 小端内存顺序为BGRA
+  (4, True): QImage.Format.Format_RGBA8888
+}
+
+
+def numpy_to_qimage(image, rgb=False):
+  """
+  将numpy数组直接包装为QImage（不复制像素数据）
+  
+  QImage引用数组的内存，调用方需在QImage使用期间保持数组存活；
+  非连续数组会先复制为连续数组
+  
+  Args:
+    image: uint8数组，形状为 (h, w)、(h, w, 3) 或 (h, w, 4)
+    rgb: 通道顺序是否为RGB/RGBA（默认为OpenCV的BGR/BGRA）
+    
+  Returns:
+    (qimage, buffer) QImage和其引用的数组
+  """
+  buffer = np.ascontiguousarray(image, dtype=np.uint8)
+  channels = 1 if buffer.ndim == 2 else buffer.shape[2]
+  height, width = buffer.shape[:2]
+  qimage = QImage(buffer.data, width, height, buffer.strides[0],
+                  _QIMAGE_FORMATS[(channels, rgb)])
+  return qimage, buffer
+
+
+def numpy_to_qpixmap(image, canvas_width=None, canvas_height=None, rgb=False):
+  """
+  将numpy数组转换为QPixmap，需要时先用OpenCV缩放一次以适应画布
+  
+  Args:
+    image: uint8数组（BGR格式，rgb为True时为RGB）
+    canvas_width: 可选的画布宽度
+    canvas_height: 可选的画布高度
+    rgb: 通道顺序是否为RGB/RGBA
+    
+  Returns:
+    QPixmap对象
+  """
+  if canvas_width and canvas_height:
+    height, width = image.shape[:2]
+    size = fit_size(width, height, canvas_width, canvas_height)
+    if size != (width, height):
+      interpolation = cv2.INTER_AREA if size[0] < width else cv2.INTER_LINEAR
+      image = cv2.resize(image, size, interpolation=interpolation)
+  
+  qimage, buffer = numpy_to_qimage(image, rgb)
+  # fromImage复制像素到QPixmap，之后buffer即可释放
+  return QPixmap.fromImage(qimage)
+
+
+def qimage_to_numpy(qimage):
+  """
+  把QImage的像素包装为numpy数组（不复制像素数据）
+  
+  非32位格式会先转换为Format_RGB32；返回的数组引用QImage的内存，
+  调用方需在数组使用期间保持QImage存活
+  
+  Args:
+    qimage: QImage对象
+    
+  Returns:
+    (image, qimage) 形状为 (h, w, 4) 的BGRA数组和其引用的QImage
+  """
+  if qimage.format() not in (QImage.Format.Format_RGB32, QImage.Format.Format_ARGB32):
+    qimage = qimage.convertToFormat(QImage.Format.Format_RGB32)
+  height, width = qimage.height(), qimage.width()
+  buffer = np.frombuffer(qimage.constBits(), dtype=np.uint8, count=qimage.sizeInBytes())
+  image = buffer.reshape(height, qimage.bytesPerLine() // 4, 4)[:, :width]
+  return image, qimage
+
+
 def detect_board_region(image, min_size=200):
   """
   检测图像中的棋盘区域
@@ -90,21 +186,116 @@ def detect_board_region(image, min_size=200):
     (x, y, w, h) 棋盘区域，如果未检测到返回None
   """
   gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+  return _detect_board_in_gray(gray, min_size)
+
+
+def detect_board_regions(image, min_size=200, max_boards=None):
+  """
+  检测图像中的所有棋盘区域（多个游戏窗口并排时）
+  
+  Args:
+    image: numpy数组图像（BGR格式）
+    min_size: 最小棋盘尺寸
+    max_boards: 最多返回的棋盘数（按面积从大到小保留）
+    
+  Returns:
+    [(x, y, w, h), ...] 按从左到右、从上到下排序
+  """
+  gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+  rects = sorted(_board_rects_in_gray(gray, min_size), key=lambda r: r[2] * r[3], reverse=True)
+  
+  # 去掉落在更大矩形内部的轮廓（同一棋盘被边缘断开的碎片）
+  boards = []
+  for x, y, w, h in rects:
+    inside = any(
+      x >= bx and y >= by and x + w <= bx + bw and y + h <= by + bh
+      for bx, by, bw, bh in boards
+    )
+    if not inside:
+      boards.append((x, y, w, h))
+  
+  boards = boards[:max_boards]
+  return sorted(boards)
+
+
+def _board_rects_in_gray(gray, min_size):
+  """在灰度图中查找所有宽高都超过min_size的外轮廓矩形"""
   edges = cv2.Canny(gray, 50, 150)
   
   contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
   
-  max_area = 0
-  board_rect = None
-  
+  rects = []
   for contour in contours:
     x, y, w, h = cv2.boundingRect(contour)
-    area = w * h
-    if area > max_area and w > min_size and h > min_size:
-      max_area = area
-      board_rect = (x, y, w, h)
+    if w > min_size and h > min_size:
+      rects.append((x, y, w, h))
   
-  return board_rect
+  return rects
+
+
+def _detect_board_in_gray(gray, min_size):
+  """在灰度图中查找面积最大的外轮廓矩形"""
+  rects = _board_rects_in_gray(gray, min_size)
+  if not rects:
+    return None
+  return max(rects, key=lambda r: r[2] * r[3])
+
+
+def detect_board_region_scaled(image, min_size=200, scale=0.25, padding=8):
+  """
+  先在缩小的灰度图上粗定位棋盘，再只在粗定位区域附近按原分辨率精定位
+  
+  Args:
+    image: numpy数组图像（BGR格式）
+    min_size: 最小棋盘尺寸（原图像素）
+    scale: 粗定位时的缩放比例
+    padding: 精定位时粗定位区域的外扩像素
+    
+  Returns:
+    (x, y, w, h) 棋盘区域，如果未检测到返回None
+  """
+  gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+  small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+  coarse = _detect_board_in_gray(small, int(min_size * scale))
+  if coarse is None:
+    return None
+  
+  h, w = gray.shape
+  pad = padding + int(np.ceil(1 / scale))
+  x0 = max(int(coarse[0] / scale) - pad, 0)
+  y0 = max(int(coarse[1] / scale) - pad, 0)
+  x1 = min(int((coarse[0] + coarse[2]) / scale) + pad, w)
+  y1 = min(int((coarse[1] + coarse[3]) / scale) + pad, h)
+  
+  fine = _detect_board_in_gray(gray[y0:y1, x0:x1], min_size)
+  if fine is None:
+    return None
+  return (fine[0] + x0, fine[1] + y0, fine[2], fine[3])
+
+
+def border_signature(image, width=3, length=64):
+  """
+  计算图像外圈的签名（四条边各自缩放到固定长度的灰度值）
+  
+  Args:
+    image: numpy数组图像（BGR格式）
+    width: 外圈宽度
+    length: 每条边的采样点数
+    
+  Returns:
+    float32数组，形状为 (4, length)
+  """
+  # 只转换四条边的像素，不转换整张图
+  strips = (image[:width], image[-width:], image[:, :width], image[:, -width:])
+  edges = [
+    cv2.cvtColor(np.ascontiguousarray(strip), cv2.COLOR_BGR2GRAY) for strip in strips
+  ]
+  edges[2] = edges[2].T
+  edges[3] = edges[3].T
+  return np.stack([
+    cv2.resize(np.ascontiguousarray(edge), (length, 1), interpolation=cv2.INTER_AREA)[0]
+    for edge in edges
+  ]).astype(np.float32)
 
 
 def extract_board_region(image, region):
@@ -141,3 +332,95 @@ def get_cell_image(board_image, row, col, cell_size):
   y_start = row * cell_size
   return board_image[y_start:y_start+cell_size, x_start:x_start+cell_size]
 
+
+def normalize_board(image, rows, cols, size, rect=None):
+  """
+  把棋盘的网格区域整体缩放为每格 size x size（与截图分辨率无关）
+  
+  Args:
+    image: 棋盘图像
+    rows: 行数
+    cols: 列数
+    size: 缩放后的格子边长
+    rect: 可选的网格区域 (x, y, w, h)，可为小数，默认整张图像
+    
+  Returns:
+    形状为 (rows*size, cols*size[, c]) 的图像
+  """
+  if rect is not None:
+    h, w = image.shape[:2]
+    x0 = min(max(int(round(rect[0])), 0), w - 1)
+    y0 = min(max(int(round(rect[1])), 0), h - 1)
+    x1 = min(max(int(round(rect[0] + rect[2])), x0 + 1), w)
+    y1 = min(max(int(round(rect[1] + rect[3])), y0 + 1), h)
+    image = image[y0:y1, x0:x1]
+  
+  # 分辨率金字塔：OpenCV区域插值在对半缩小时有快速路径，每格不小于4*size时先逐级对半缩小，
+  # 再线性缩放到每格2*size（比例小于2，不会跳过像素），最后对半区域插值得到每格size
+  h, w = image.shape[:2]
+  while min(w / cols, h / rows) >= 4 * size:
+    h, w = h // 2, w // 2
+    image = cv2.resize(image[:2 * h, :2 * w], (w, h), interpolation=cv2.INTER_AREA)
+  image = cv2.resize(image, (cols * size * 2, rows * size * 2), interpolation=cv2.INTER_LINEAR)
+  return cv2.resize(image, (cols * size, rows * size), interpolation=cv2.INTER_AREA)
+
+
+def split_cells(image, rows, cols, cell_size):
+  """
+  将棋盘图像切分为格子视图（不复制数据）
+  
+  Args:
+    image: 棋盘图像，形状为 (h, w) 或 (h, w, c)
+    rows: 行数
+    cols: 列数
+    cell_size: 格子大小
+    
+  Returns:
+    形状为 (rows, cols, cell_size, cell_size[, c]) 的只读视图
+  """
+  strides = image.strides
+  return np.lib.stride_tricks.as_strided(
+    image,
+    shape=(rows, cols, cell_size, cell_size) + image.shape[2:],
+    strides=(strides[0] * cell_size, strides[1] * cell_size) + strides,
+    writeable=False
+  )
+
+
+def downsample_cells(image, rows, cols, cell_size, size):
+  """
+  将整张棋盘一次性按区域插值缩小，使每个格子变为 size x size
+  
+  Args:
+    image: 棋盘图像
+    rows: 行数
+    cols: 列数
+    cell_size: 格子大小
+    size: 缩小后的格子边长
+    
+  Returns:
+    形状为 (rows, cols, size, size[, c]) 的视图
+  """
+  image = image[:rows * cell_size, :cols * cell_size]
+  small = cv2.resize(image, (cols * size, rows * size), interpolation=cv2.INTER_AREA)
+  return split_cells(small, rows, cols, size)
+
+
+def cell_differences(previous, current, rows, cols, cell_size):
+  """
+  一次性计算两帧棋盘图像每个格子内像素的最大差值
+  
+  Args:
+    previous: 上一帧棋盘图像
+    current: 当前棋盘图像（与previous形状相同）
+    rows: 行数
+    cols: 列数
+    cell_size: 格子大小
+    
+  Returns:
+    uint8数组，形状为 (rows, cols)
+  """
+  h, w = rows * cell_size, cols * cell_size
+  diff = cv2.absdiff(previous[:h, :w], current[:h, :w])
+  cells = split_cells(diff, rows, cols, cell_size)
+  return cells.max(axis=tuple(range(2, cells.ndim)))
@@ -0,0 +1,97 @@
+"""
+性能统计工具
+用于记录耗时分布与吞吐量
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+
+class LatencyStats:
+  """耗时统计类"""
+  
+  def __init__(self, name='', max_samples=None):
+    """
+    初始化统计
+    
+    Args:
+      name: 统计项名称
+      max_samples: 可选的样本数上限，超出时只保留最近的样本（长时间运行时使用）
+    """
+    self.name = name
+    self.max_samples = max_samples
+    self.samples = deque(maxlen=max_samples)
+    self.started = None
+  
+  def start(self):
+    """开始计时"""
+    self.started = time.perf_counter()
+  
+  def stop(self):
+    """
+    结束计时并记录一次样本
+    
+    Returns:
+      本次耗时（秒）
+    """
+    elapsed = time.perf_counter() - self.started
+    self.samples.append(elapsed)
+    self.started = None
+    return elapsed
+  
+  def record(self, seconds):
+    """
+    记录一次耗时
+    
+    Args:
+      seconds: 耗时（秒）
+    """
+    self.samples.append(seconds)
+  
+  def percentile(self, q):
+    """
+    获取耗时百分位数
+    
+    Args:
+      q: 百分位（0-100）
+      
+    Returns:
+      耗时（毫秒），没有样本时返回0
+    """
+    if not self.samples:
+      return 0.0
+    return float(np.percentile(self.samples, q)) * 1000
+  
+  def rate(self):
+    """
+    获取吞吐量
+    
+    Returns:
+      每秒处理次数
+    """
+    total = sum(self.samples)
+    return len(self.samples) / total if total > 0 else 0.0
+  
+  def summary(self):
+    """
+    获取统计摘要
+    
+    Returns:
+      dict包含count、mean_ms、p50_ms、p95_ms、p99_ms、per_sec
+    """
+    count = len(self.samples)
+    return {
+      'count': count,
+      'mean_ms': sum(self.samples) / count * 1000 if count else 0.0,
+      'p50_ms': self.percentile(50),
+      'p95_ms': self.percentile(95),
+      'p99_ms': self.percentile(99),
+      'per_sec': self.rate()
+    }
+  
+  def reset(self):
+    """清空样本"""
+    self.samples = deque(maxlen=self.max_samples)
+    self.started = None